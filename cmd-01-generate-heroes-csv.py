@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-import csv
+import argparse
+import sys
+import time
 from pathlib import Path
-from typing import List, Optional
-from urllib.parse import urljoin
+from typing import Optional, Sequence
 
 import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
 
-BASE_URL = "https://overwatch.fandom.com"
-HEROES_URL = f"{BASE_URL}/wiki/Heroes"
+from herokit.metrics import Metrics, add_metrics_argument, metrics_from_args
+from herokit.roster import (
+    HEROES_PATH,
+    ROSTER_CHANGES_DEFAULT,
+    WIKI_BASE_URL,
+    diff_rosters,
+    extract_heroes,
+    read_heroes,
+    write_heroes,
+    write_roster_diff,
+)
+
 REQUEST_TIMEOUT = 30
 USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
@@ -19,67 +28,75 @@ USER_AGENT = (
 OUTPUT_PATH = Path("data-heroes.hidden.csv")
 
 
-def fetch_html(url: str) -> str:
+def fetch_html(url: str, metrics: Optional[Metrics] = None) -> str:
+    start = time.perf_counter()
     response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT)
+    if metrics:
+        metrics.record_fetch(url, time.perf_counter() - start, len(response.content), response.status_code)
     response.raise_for_status()
     return response.text
 
 
-def extract_heroes(html: str) -> List[dict[str, str]]:
-    soup = BeautifulSoup(html, "html.parser")
-    navbox = soup.select_one("table.navbox")
-    if navbox is None:
-        raise RuntimeError("Could not find the hero navbox on the Heroes page.")
-
-    heroes: List[dict[str, str]] = []
-    current_role: Optional[str] = None
-
-    for row in navbox.select("tr"):
-        header = row.find("th", class_="navbox-group")
-        if header:
-            current_role = header.get_text(strip=True)
-
-        if not current_role:
-            continue
-
-        for cell in row.find_all("td"):
-            link = _first_named_link(cell)
-            if not link:
-                continue
-
-            name = link.get_text(strip=True)
-            href = urljoin(BASE_URL, link["href"])
-            heroes.append({"role": current_role, "name": name, "url": href})
-
-    if not heroes:
-        raise RuntimeError("No hero entries were parsed from the navbox.")
-
-    return heroes
-
-
-def _first_named_link(cell: Tag) -> Optional[Tag]:
-    for link in cell.select("a[href]"):
-        text = link.get_text(strip=True)
-        href = link.get("href", "")
-        if not text or not href.startswith("/wiki/"):
-            continue
-        if text in {"Tank", "Damage", "Support"}:
-            continue
-        return link
-    return None
-
-
-def main() -> None:
-    html = fetch_html(HEROES_URL)
-    heroes = extract_heroes(html)
-
-    with OUTPUT_PATH.open("w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=["role", "name", "url"])
-        writer.writeheader()
-        writer.writerows(heroes)
-
-    for hero in heroes:
-        print(f"{hero['name']} ({hero['role']}): {hero['url']}")
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write the hero roster CSV from the navbox on the wiki's Heroes page.")
+    parser.add_argument(
+        "--base-url",
+        default=WIKI_BASE_URL,
+        help=f"Wiki to read, e.g. a cmd-stub-wiki.py server (default: {WIKI_BASE_URL})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_PATH,
+        help=f"Destination CSV (default: {OUTPUT_PATH})",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=(
+            "Compare the new roster with the existing --output and write the added, removed, "
+            "renamed and role-changed heroes to --changes-output, for cmd-extract-all --changes."
+        ),
+    )
+    parser.add_argument(
+        "--changes-output",
+        type=Path,
+        default=ROSTER_CHANGES_DEFAULT,
+        help=f"Where --sync writes the roster changes (default: {ROSTER_CHANGES_DEFAULT})",
+    )
+    add_metrics_argument(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    metrics = metrics_from_args(args, Path(__file__).stem)
+    heroes_url = args.base_url + HEROES_PATH
+    html = fetch_html(heroes_url, metrics)
+    start = time.perf_counter()
+    heroes = extract_heroes(html, args.base_url)
+    if metrics:
+        metrics.record_page(heroes_url, time.perf_counter() - start, {})
+
+    if args.sync:
+        previous = read_heroes(args.output) if args.output.exists() else []
+        diff = diff_rosters(previous, heroes)
+        write_roster_diff(diff, args.changes_output)
+        for line in diff.describe():
+            print(line)
+        print(
+            f"Roster: {len(diff.added)} added, {len(diff.removed)} removed, {len(diff.renamed)} renamed, "
+            f"{len(diff.role_changed)} role changes; changes written to {args.changes_output}",
+            file=sys.stderr,
+        )
+        if heroes != previous:
+            write_heroes(heroes, args.output)
+    else:
+        write_heroes(heroes, args.output)
+        for hero in heroes:
+            print(f"{hero.name} ({hero.role}): {hero.url}")
+    if metrics:
+        metrics.finish(args.metrics_out)
 
 
 if __name__ == "__main__":
@@ -2,29 +2,18 @@ from __future__ import annotations
 
 import argparse
 import csv
-import re
 import sys
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Sequence
 
-import requests
-from bs4 import BeautifulSoup
-
-CSV_DEFAULT_PATH = Path("data-heroes.hidden.csv")
-REQUEST_TIMEOUT = 30
-USER_AGENT = (
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 CodexBot/1.0"
-)
-NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
-
-
-@dataclass
-class Hero:
-    role: str
-    name: str
-    url: str
+from herokit.cache import add_cache_arguments, cache_from_args, fetch_page
+from herokit.engine import extract_page
+from herokit.extractors import EXTRACTORS, add_parser_argument
+from herokit.fetch import PageFetcher, add_fetch_arguments
+from herokit.herodb import add_db_argument, store_from_args
+from herokit.metrics import add_metrics_argument, metrics_from_args
+from herokit.outputs import HEALTH_FIELDS, health_row
+from herokit.roster import ROSTER_CSV_DEFAULT, read_heroes
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -34,102 +23,62 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         "--input",
         type=Path,
-        default=CSV_DEFAULT_PATH,
-        help=f"CSV file with hero role, name, and url (default: {CSV_DEFAULT_PATH})",
+        default=ROSTER_CSV_DEFAULT,
+        help=f"CSV file with hero role, name, and url (default: {ROSTER_CSV_DEFAULT})",
     )
+    add_cache_arguments(parser)
+    add_fetch_arguments(parser)
+    add_parser_argument(parser)
+    add_db_argument(parser)
+    add_metrics_argument(parser)
     return parser.parse_args(argv)
 
 
-def read_heroes(csv_path: Path) -> list[Hero]:
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Could not find hero CSV at {csv_path}")
-
-    heroes: list[Hero] = []
-    with csv_path.open("r", encoding="utf-8", newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            role = (row.get("role") or "").strip()
-            name = (row.get("name") or "").strip()
-            url = (row.get("url") or "").strip()
-            if not (role and name and url):
-                continue
-            heroes.append(Hero(role=role, name=name, url=url))
-    return heroes
-
-
-def fetch_html(url: str) -> str:
-    response = requests.get(
-        url,
-        headers={"User-Agent": USER_AGENT},
-        timeout=REQUEST_TIMEOUT,
-    )
-    response.raise_for_status()
-    return response.text
-
-
-def extract_stats(html: str) -> dict[str, Optional[float | int]]:
-    soup = BeautifulSoup(html, "html.parser")
-    health = _extract_stat(soup, data_source="health", label_prefix="health")
-    armor = _extract_stat(soup, data_source="armor", label_prefix="armor")
-
-    if health is None:
-        raise RuntimeError("Could not locate a numeric health value on the page.")
-
-    return {"health": health, "armor": armor}
-
-
-def _extract_stat(
-    soup: BeautifulSoup, *, data_source: str, label_prefix: str
-) -> Optional[float | int]:
-    section = soup.find(attrs={"data-source": data_source})
-    if section is not None:
-        value = _first_number(section.get_text(" ", strip=True))
-        if value is not None:
-            return value
-
-    for label in soup.select(".pi-data-label"):
-        if label.get_text(strip=True).lower().startswith(label_prefix.lower()):
-            value_container = label.find_next(class_="pi-data-value")
-            if value_container:
-                value = _first_number(value_container.get_text(" ", strip=True))
-                if value is not None:
-                    return value
-
-    return None
-
-
-def _first_number(text: str) -> Optional[float | int]:
-    match = NUMBER_PATTERN.search(text)
-    if not match:
-        return None
-    number = float(match.group(0))
-    return int(number) if number.is_integer() else number
-
-
 def main(argv: Optional[Sequence[str]] = None) -> None:
     args = parse_args(argv)
     heroes = read_heroes(args.input)
+    cache = cache_from_args(args)
+    store = store_from_args(args)
+    metrics = metrics_from_args(args, Path(__file__).stem)
 
     writer = csv.writer(sys.stdout)
-    writer.writerow(["role", "name", "health", "armor"])
-
-    for hero in heroes:
-        try:
-            html = fetch_html(hero.url)
-            stats = extract_stats(html)
-            writer.writerow(
-                [
-                    hero.role,
-                    hero.name,
-                    stats["health"],
-                    stats["armor"] if stats["armor"] is not None else "",
-                ]
-            )
-        except Exception as exc:
-            print(
-                f"Failed to extract health for {hero.name} ({hero.url}): {exc}",
-                file=sys.stderr,
-            )
+    writer.writerow(HEALTH_FIELDS)
+    failed: list[str] = []
+
+    with PageFetcher(concurrency=args.concurrency, rate_limit=args.rate_limit, metrics=metrics) as fetcher:
+        for page in fetcher.map(lambda hero: fetch_page(hero.url, fetcher, cache), heroes):
+            hero = page.item
+            try:
+                if page.error is not None:
+                    raise page.error
+                extraction = extract_page(page.value, [EXTRACTORS["health"]], parser=args.parser)
+                if metrics:
+                    metrics.record_page(hero.url, extraction.parse_seconds, extraction.extractor_seconds)
+                if "health" in extraction.errors:
+                    raise extraction.errors["health"]
+                stats = extraction.values["health"]
+                writer.writerow(health_row(hero, stats))
+                if store:
+                    store.save_health(hero.role, hero.name, hero.url, health=stats["health"], armor=stats["armor"])
+            except Exception as exc:
+                failed.append(hero.name)
+                print(
+                    f"Failed to extract health for {hero.name} ({hero.url}): {exc}",
+                    file=sys.stderr,
+                )
+
+    if cache:
+        print(cache.stats.summary(), file=sys.stderr)
+        cache.close()
+    if store:
+        store.close()
+    if metrics:
+        if cache:
+            metrics.add_counters("cache", cache.stats)
+        metrics.finish(args.metrics_out)
+
+    if failed:
+        raise SystemExit(f"Failed to extract health for {len(failed)} of {len(heroes)} heroes: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
@@ -1,119 +1,94 @@
 from __future__ import annotations
 
-import csv
+import argparse
+import contextlib
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, List
-from urllib.parse import quote
-
-from bs4 import BeautifulSoup
-
+from typing import List, Optional, Sequence
+
+from herokit.cache import add_cache_arguments, cache_from_args
+from herokit.engine import add_jobs_argument, add_stream_argument, extract_pages, jobs_from_args
+from herokit.extractors import EXTRACTORS, add_parser_argument
+from herokit.fetch import Outcome
+from herokit.herodb import add_db_argument, store_from_args
+from herokit.metrics import add_metrics_argument, metrics_from_args
+from herokit.models import AbilityEffect
+from herokit.outputs import AbilityCsvWriter, ability_rows, write_ability_csv
+from herokit.results import add_result_cache_arguments, result_cache_from_args
+from herokit.roster import ROSTER_CSV_DEFAULT, read_heroes
 
 ROOT = Path(__file__).parent
-HERO_SOURCE = ROOT / "data-heroes.hidden.csv"
 CACHE_DIR = ROOT / ".cache" / "hero-pages"
+RESULTS_DIR = ROOT / ".cache" / "extract-results"
 OUTPUT = ROOT / "hero-ability-damage.csv"
 
-TARGET_LABELS = {
-    "dmg. amplification": "damage_amplification",
-    "dmg. reduction": "damage_reduction",
-    "duration": "duration",
-}
-
-
-def iter_heroes() -> Iterable[Dict[str, str]]:
-    with HERO_SOURCE.open(encoding="utf-8", newline="") as handle:
-        yield from csv.DictReader(handle)
-
-
-def hero_page_path(url: str) -> Path:
-    return CACHE_DIR / f"{quote(url, safe='')}.html"
-
-
-def section_title(node) -> str:
-    current = node
-    while current:
-        current = current.previous_sibling
-        if current is None:
-            break
-        name = getattr(current, "name", None)
-        if name and name.lower().startswith("h"):
-            return current.get_text(strip=True)
-    return ""
-
-
-def read_ability_rows(soup: BeautifulSoup) -> Iterable[Dict[str, str]]:
-    for ability in soup.select(".ability-details"):
-        header = ability.select_one(".ability-box .header")
-        if not header:
-            continue
-        if section_title(ability).strip().lower() != "abilities":
-            continue
-        name = header.find(string=True, recursive=False)
-        if name:
-            ability_name = name.strip()
-        else:
-            ability_name = header.get_text(" ", strip=True)
-        ability_name = " ".join(ability_name.split())
-        if not ability_name:
-            continue
-
-        stats: Dict[str, str] = {}
-        for row in ability.select(".data-row"):
-            label_el = row.select_one(".data-row-header")
-            value_el = row.select_one(".data-row-value")
-            if not label_el or not value_el:
-                continue
-            label = " ".join(label_el.get_text(" ", strip=True).split())
-            label = label.rstrip(":").strip().lower()
-            key = TARGET_LABELS.get(label)
-            if not key:
-                continue
-            value = " ".join(value_el.get_text(" ", strip=True).split())
-            stats[key] = value
-
-        has_amp = bool(stats.get("damage_amplification"))
-        has_red = bool(stats.get("damage_reduction"))
-        if not (has_amp or has_red):
-            continue
-
-        if stats:
-            yield {
-                "ability_name": ability_name,
-                **stats,
-            }
-
-
-def main() -> None:
-    rows: List[Dict[str, str]] = []
-    for hero in iter_heroes():
-        page_path = hero_page_path(hero["url"])
-        if not page_path.exists():
-            continue
-        soup = BeautifulSoup(page_path.read_text(encoding="utf-8"), "html.parser")
-        for ability in read_ability_rows(soup):
-            rows.append(
-                {
-                    "hero_name": hero["name"],
-                    "ability_name": ability["ability_name"],
-                    "damage_amplification": ability.get("damage_amplification", ""),
-                    "damage_reduction": ability.get("damage_reduction", ""),
-                    "duration": ability.get("duration", ""),
-                }
-            )
 
-    with OUTPUT.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=[
-                "hero_name",
-                "ability_name",
-                "damage_amplification",
-                "damage_reduction",
-                "duration",
-            ],
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract damage amplification and reduction abilities from cached hero pages."
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=f"CSV file with hero role, name, and url (default: {ROSTER_CSV_DEFAULT})",
+    )
+    add_stream_argument(parser)
+    add_cache_arguments(parser, default_dir=CACHE_DIR, network=False)
+    add_parser_argument(parser)
+    add_jobs_argument(parser)
+    add_result_cache_arguments(parser, default_dir=RESULTS_DIR)
+    add_db_argument(parser)
+    add_metrics_argument(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    cache = cache_from_args(args)
+    result_cache = result_cache_from_args(args)
+    store = store_from_args(args)
+    metrics = metrics_from_args(args, Path(__file__).stem)
+    rows: List[AbilityEffect] = []
+    pages = (
+        Outcome(item=hero, value=html)
+        for hero in read_heroes(args.input)
+        if (html := cache.read(hero.url)) is not None
+    )
+    extractors = [EXTRACTORS["ability_effects"]]
+    with AbilityCsvWriter(OUTPUT) if args.stream else contextlib.nullcontext() as stream:
+        extracted = extract_pages(
+            pages, extractors, parser=args.parser, jobs=jobs_from_args(args), results=result_cache
         )
-        writer.writeheader()
-        writer.writerows(rows)
+        for page in extracted:
+            if page.error is not None:
+                raise page.error
+            hero = page.item
+            if metrics:
+                metrics.record_page(hero.url, page.value.parse_seconds, page.value.extractor_seconds)
+            if "ability_effects" in page.value.errors:
+                raise page.value.errors["ability_effects"]
+            effects = ability_rows(hero.name, page.value.values["ability_effects"])
+            if stream:
+                stream.write(effects)
+            else:
+                rows.extend(effects)
+            if store:
+                store.save_ability_effects(hero.role, hero.name, hero.url, effects)
+    print(cache.stats.summary(), file=sys.stderr)
+    cache.close()
+    if result_cache:
+        print(result_cache.stats.summary(), file=sys.stderr)
+    if store:
+        store.close()
+    if metrics:
+        metrics.add_counters("cache", cache.stats)
+        if result_cache:
+            metrics.add_counters("results", result_cache.stats)
+        metrics.finish(args.metrics_out)
+
+    if not args.stream:
+        write_ability_csv(rows, OUTPUT)
 
 
 if __name__ == "__main__":
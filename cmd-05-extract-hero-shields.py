@@ -1,79 +1,85 @@
 from __future__ import annotations
 
-import csv
-import re
+import argparse
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, Optional
-from urllib.parse import quote
-
-from bs4 import BeautifulSoup
-
+from typing import Optional, Sequence
+
+from herokit.cache import add_cache_arguments, cache_from_args
+from herokit.engine import add_jobs_argument, extract_pages, jobs_from_args
+from herokit.extractors import EXTRACTORS, add_parser_argument
+from herokit.fetch import Outcome
+from herokit.herodb import add_db_argument, store_from_args
+from herokit.metrics import add_metrics_argument, metrics_from_args
+from herokit.outputs import shield_row, write_shields_csv
+from herokit.results import add_result_cache_arguments, result_cache_from_args
+from herokit.roster import ROSTER_CSV_DEFAULT, read_heroes
 
 ROOT = Path(__file__).parent
-HERO_SOURCE = ROOT / "data-heroes.hidden.csv"
 CACHE_DIR = ROOT / ".cache" / "hero-pages"
+RESULTS_DIR = ROOT / ".cache" / "extract-results"
 OUTPUT = ROOT / "hero-shields.csv"
 
-NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
-
-
-def read_heroes() -> Iterable[Dict[str, str]]:
-    with HERO_SOURCE.open(encoding="utf-8", newline="") as handle:
-        yield from csv.DictReader(handle)
-
-
-def page_path(url: str) -> Path:
-    return CACHE_DIR / f"{quote(url, safe='')}.html"
-
 
-def extract_shields(soup: BeautifulSoup) -> Optional[float | int]:
-    for key in ("shield", "shields"):
-        section = soup.find(attrs={"data-source": key})
-        if section:
-            value = _first_number(section.get_text(" ", strip=True))
-            if value is not None:
-                return value
-
-    for label in soup.select(".pi-data-label"):
-        text = label.get_text(" ", strip=True).lower()
-        if not text.startswith("shield"):
-            continue
-        value_container = label.find_next(class_="pi-data-value")
-        if value_container:
-            value = _first_number(value_container.get_text(" ", strip=True))
-            if value is not None:
-                return value
-    return None
-
-
-def _first_number(text: str) -> Optional[float | int]:
-    match = NUMBER_PATTERN.search(text)
-    if not match:
-        return None
-    value = float(match.group(0))
-    return int(value) if value.is_integer() else value
-
-
-def main() -> None:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract shield values from cached hero pages."
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=f"CSV file with hero role, name, and url (default: {ROSTER_CSV_DEFAULT})",
+    )
+    add_cache_arguments(parser, default_dir=CACHE_DIR, network=False)
+    add_parser_argument(parser)
+    add_jobs_argument(parser)
+    add_result_cache_arguments(parser, default_dir=RESULTS_DIR)
+    add_db_argument(parser)
+    add_metrics_argument(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    cache = cache_from_args(args)
+    result_cache = result_cache_from_args(args)
+    store = store_from_args(args)
+    metrics = metrics_from_args(args, Path(__file__).stem)
     rows = []
-    for hero in read_heroes():
-        file_path = page_path(hero["url"])
-        if not file_path.exists():
-            continue
-        soup = BeautifulSoup(file_path.read_text(encoding="utf-8"), "html.parser")
-        shields = extract_shields(soup)
-        rows.append(
-            {
-                "role": hero["role"],
-                "name": hero["name"],
-                "shields": shields if shields is not None else "",
-            }
-        )
-
-    with OUTPUT.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=["role", "name", "shields"])
-        writer.writeheader()
-        writer.writerows(rows)
+    pages = (
+        Outcome(item=hero, value=html)
+        for hero in read_heroes(args.input)
+        if (html := cache.read(hero.url)) is not None
+    )
+    extractors = [EXTRACTORS["shields"]]
+    extracted = extract_pages(
+        pages, extractors, parser=args.parser, jobs=jobs_from_args(args), results=result_cache
+    )
+    for page in extracted:
+        if page.error is not None:
+            raise page.error
+        hero = page.item
+        if metrics:
+            metrics.record_page(hero.url, page.value.parse_seconds, page.value.extractor_seconds)
+        if "shields" in page.value.errors:
+            raise page.value.errors["shields"]
+        rows.append(shield_row(hero.role, hero.name, page.value.values["shields"]))
+        if store:
+            store.save_shields(hero.role, hero.name, hero.url, page.value.values["shields"])
+    print(cache.stats.summary(), file=sys.stderr)
+    cache.close()
+    if result_cache:
+        print(result_cache.stats.summary(), file=sys.stderr)
+    if store:
+        store.close()
+    if metrics:
+        metrics.add_counters("cache", cache.stats)
+        if result_cache:
+            metrics.add_counters("results", result_cache.stats)
+        metrics.finish(args.metrics_out)
+
+    write_shields_csv(rows, OUTPUT)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.metrics import add_metrics_argument, metrics_from_args, timed_phase
+from herokit.models import load_hero_stats
+from herokit.roster import ROSTER_CSV_DEFAULT
+from herokit.snapshot import SNAPSHOT_PATH_DEFAULT, source_digest, write_snapshot
+
+HEALTH_CSV = Path("hero-health.csv")
+SHIELDS_CSV = Path("hero-shields.csv")
+WEAPONS_JSON = Path("hero-weapons.json")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compile the roster, hero health, shields and primary weapon stats into the binary "
+            "snapshot fight.py loads at startup."
+        )
+    )
+    parser.add_argument(
+        "--roster",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=f"Hero CSV (default: {ROSTER_CSV_DEFAULT})",
+    )
+    parser.add_argument(
+        "--health",
+        type=Path,
+        default=HEALTH_CSV,
+        help=f"Health CSV written by cmd-02 (default: {HEALTH_CSV})",
+    )
+    parser.add_argument(
+        "--shields",
+        type=Path,
+        default=SHIELDS_CSV,
+        help=f"Shields CSV written by cmd-05 (default: {SHIELDS_CSV})",
+    )
+    parser.add_argument(
+        "--weapons",
+        type=Path,
+        default=WEAPONS_JSON,
+        help=f"Weapons JSON written by cmd-03 (default: {WEAPONS_JSON})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=SNAPSHOT_PATH_DEFAULT,
+        help=f"Destination snapshot (default: {SNAPSHOT_PATH_DEFAULT})",
+    )
+    add_metrics_argument(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    metrics = metrics_from_args(args, Path(__file__).stem)
+    with timed_phase(metrics, "load"):
+        heroes = load_hero_stats(args.health, args.weapons, shields_csv=args.shields, roster_csv=args.roster)
+    if not heroes:
+        raise SystemExit("No hero data found; cannot write snapshot.")
+    with timed_phase(metrics, "write"):
+        write_snapshot(args.output, heroes, source_digest((args.roster, args.health, args.shields, args.weapons)))
+    print(f"Wrote {len(heroes)} heroes to {args.output}", file=sys.stderr)
+    if metrics:
+        metrics.finish(args.metrics_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.cache import CACHE_DIR_DEFAULT, RAW_URL_PREFIX, PageCache
+from herokit.pagestore import STORE_BACKENDS, PackStore, content_hash, open_store
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Copy the hero page cache into another backend, optionally trimming pages."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR_DEFAULT,
+        help=f"Cache to read (default: {CACHE_DIR_DEFAULT})",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=sorted(STORE_BACKENDS),
+        default="dir",
+        help="Backend of the cache being read (default: dir)",
+    )
+    parser.add_argument(
+        "--dest",
+        type=Path,
+        default=None,
+        help="Directory for the converted cache (default: same as --cache-dir)",
+    )
+    parser.add_argument(
+        "--to",
+        choices=sorted(STORE_BACKENDS),
+        default="pack",
+        help="Backend to write (default: pack)",
+    )
+    parser.add_argument(
+        "--trim",
+        action="store_true",
+        help="Cut each page down to its article body while copying.",
+    )
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="With --trim, also copy the untrimmed page.",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Only rebuild the pack index in --cache-dir by scanning the pack file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.rebuild_index:
+        with PackStore(args.cache_dir) as pack:
+            pack.rebuild_index()
+            print(f"Indexed {len(pack.urls())} pages in {pack.pack_path}", file=sys.stderr)
+        return
+
+    dest_dir = args.dest or args.cache_dir
+    if dest_dir == args.cache_dir and args.to == args.cache_backend:
+        raise SystemExit("Source and destination are the same cache; pass --dest or --to.")
+
+    with (
+        open_store(args.cache_dir, args.cache_backend) as source,
+        PageCache(dest_dir, backend=args.to, trim=args.trim, keep_raw=args.keep_raw) as dest,
+    ):
+        copied = 0
+        raw_bytes = 0
+        for url in source.urls():
+            if url.startswith(RAW_URL_PREFIX):
+                continue
+            html = source.read(url)
+            entry = source.entry(url)
+            if html is None or entry is None:
+                continue
+            raw = source.read(RAW_URL_PREFIX + url) if entry.trim_version is not None else None
+            if raw is not None:
+                # Already trimmed: start again from the original the source kept.
+                html = raw
+                entry.trim_version = None
+            if not entry.sha256:
+                entry.sha256 = content_hash(html)
+            dest.put(entry, html)
+            copied += 1
+            raw_bytes += len(html.encode("utf-8"))
+
+        print(f"Copied {copied} pages ({raw_bytes:,} bytes of HTML) to {dest_dir}", file=sys.stderr)
+        if isinstance(dest.backend, PackStore):
+            print(f"Pack size: {dest.backend.pack_path.stat().st_size:,} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.checkpoint import ordered_records, read_ndjson
+from herokit.outputs import write_weapons_json
+from herokit.roster import ROSTER_CSV_DEFAULT, read_heroes
+
+INPUT_DEFAULT_PATH = Path("hero-weapons.ndjson")
+OUTPUT_DEFAULT_PATH = Path("hero-weapons.json")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert streamed weapon records (cmd-03 --ndjson) into the hero-weapons.json array."
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=INPUT_DEFAULT_PATH,
+        help=f"NDJSON file written by cmd-03 --ndjson (default: {INPUT_DEFAULT_PATH})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DEFAULT_PATH,
+        help=f"Destination JSON file (default: {OUTPUT_DEFAULT_PATH})",
+    )
+    parser.add_argument(
+        "--roster",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=(
+            "Hero CSV whose order the records are sorted into, since resumed runs append "
+            f"heroes out of order; ignored if missing (default: {ROSTER_CSV_DEFAULT})"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    order = [hero.url for hero in read_heroes(args.roster)] if args.roster.exists() else None
+    records = ordered_records(read_ndjson(args.input), order)
+    write_weapons_json(records, args.output)
+    print(f"Wrote {len(records)} heroes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
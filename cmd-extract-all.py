@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from herokit.cache import PageCache, add_cache_arguments, cache_from_args, fetch_page
+from herokit.engine import add_jobs_argument, extract_pages, jobs_from_args, select_extractors
+from herokit.extractors import EXTRACTORS, add_parser_argument
+from herokit.fetch import PageFetcher, add_fetch_arguments
+from herokit.herodb import add_db_argument, store_from_args
+from herokit.metrics import add_metrics_argument, metrics_from_args
+from herokit.outputs import (
+    ability_rows,
+    health_row,
+    read_ability_effects,
+    read_health_rows,
+    read_shield_rows,
+    read_weapon_records,
+    shield_row,
+    weapon_record,
+    write_ability_csv,
+    write_health_csv,
+    write_shields_csv,
+    write_weapons_json,
+)
+from herokit.results import add_result_cache_arguments, result_cache_from_args
+from herokit.roster import ROSTER_CSV_DEFAULT, Hero, RosterDiff, read_heroes, read_roster_diff
+
+OUTPUT_DEFAULTS = {
+    "health": Path("hero-health.csv"),
+    "weapons": Path("hero-weapons.json"),
+    "ability_effects": Path("hero-ability-damage.csv"),
+    "shields": Path("hero-shields.csv"),
+}
+PREVIOUS_READERS: dict[str, Callable[[Path], dict[str, Any]]] = {
+    "health": read_health_rows,
+    "weapons": read_weapon_records,
+    "ability_effects": read_ability_effects,
+    "shields": read_shield_rows,
+}
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Parse each hero page once and write health, weapons, ability effects "
+            "and shields in a single pass."
+        )
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=f"CSV file with hero role, name, and url (default: {ROSTER_CSV_DEFAULT})",
+    )
+    parser.add_argument(
+        "--extractors",
+        default=",".join(EXTRACTORS),
+        help=f"Comma-separated extractors to run (default: {','.join(EXTRACTORS)})",
+    )
+    for name, default in OUTPUT_DEFAULTS.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}-output",
+            type=Path,
+            default=default,
+            help=f"Destination for {name.replace('_', ' ')} (default: {default})",
+        )
+    parser.add_argument(
+        "--changes",
+        type=Path,
+        default=None,
+        help=(
+            "Roster changes written by cmd-01 --sync. Only new and renamed heroes, heroes whose "
+            "cached page is stale and heroes missing from the outputs are extracted; the other "
+            "rows are kept from the existing output files."
+        ),
+    )
+    add_cache_arguments(parser)
+    add_fetch_arguments(parser)
+    add_parser_argument(parser)
+    add_jobs_argument(parser)
+    add_result_cache_arguments(parser)
+    add_db_argument(parser)
+    add_metrics_argument(parser)
+    return parser.parse_args(argv)
+
+
+def output_path(args: argparse.Namespace, name: str) -> Path:
+    return getattr(args, f"{name}_output")
+
+
+def read_previous_outputs(args: argparse.Namespace, names: Sequence[str]) -> dict[str, dict[str, list[Any]]]:
+    """Existing output rows of each extractor in ``names``, as lists keyed by hero name."""
+    previous = {}
+    for name in names:
+        rows = PREVIOUS_READERS[name](output_path(args, name))
+        # Ability effects already come as a list per hero; the other outputs have one row each.
+        previous[name] = {hero: value if name == "ability_effects" else [value] for hero, value in rows.items()}
+    return previous
+
+
+def heroes_to_refresh(
+    heroes: Sequence[Hero],
+    diff: RosterDiff,
+    previous: dict[str, dict[str, list[Any]]],
+    cache: Optional[PageCache],
+) -> list[Hero]:
+    rescrape = {hero.name for hero in diff.rescrape}
+    refresh = []
+    for hero in heroes:
+        if hero.name in rescrape or not any(hero.name in rows for rows in previous.values()):
+            refresh.append(hero)
+        elif cache is not None and ((entry := cache.entry(hero.url)) is None or not cache.is_fresh(entry)):
+            refresh.append(hero)
+    return refresh
+
+
+def with_role(name: str, row: Any, role: str) -> Any:
+    """A kept output row, relabelled after a role change."""
+    if name == "health":
+        return [role, *row[1:]]
+    if name in ("weapons", "shields"):
+        return {**row, "role": role}
+    return row
+
+
+def roster_rows(
+    name: str,
+    heroes: Sequence[Hero],
+    fresh: dict[str, list[Any]],
+    previous: dict[str, list[Any]],
+) -> list[Any]:
+    """Rows for ``name`` in roster order, preferring this run's rows over kept ones."""
+    rows = []
+    for hero in heroes:
+        if hero.name in fresh:
+            rows.extend(fresh[hero.name])
+        elif hero.name in previous:
+            rows.extend(with_role(name, row, hero.role) for row in previous[hero.name])
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    heroes = read_heroes(args.input)
+    cache = cache_from_args(args)
+    result_cache = result_cache_from_args(args)
+    store = store_from_args(args)
+    metrics = metrics_from_args(args, Path(__file__).stem)
+    extractors = select_extractors(name.strip() for name in args.extractors.split(",") if name.strip())
+
+    targets = heroes
+    previous: dict[str, dict[str, list[Any]]] = {}
+    if args.changes:
+        diff = read_roster_diff(args.changes)
+        previous = read_previous_outputs(args, [extractor.name for extractor in extractors])
+        targets = heroes_to_refresh(heroes, diff, previous, cache)
+        print(f"Sync: extracting {len(targets)} of {len(heroes)} heroes", file=sys.stderr)
+        if store:
+            names = {hero.name for hero in heroes}
+            for hero in diff.dropped:
+                if hero.name not in names:
+                    store.remove_hero(hero.name)
+            for _old, hero in diff.role_changed:
+                store.hero_id(hero.role, hero.name, hero.url)
+
+    outputs: dict[str, dict[str, list[Any]]] = {extractor.name: {} for extractor in extractors}
+    failed: list[str] = []
+    with PageFetcher(concurrency=args.concurrency, rate_limit=args.rate_limit, metrics=metrics) as fetcher:
+        pages = fetcher.map(lambda hero: fetch_page(hero.url, fetcher, cache), targets)
+        extracted = extract_pages(
+            pages, extractors, parser=args.parser, jobs=jobs_from_args(args), results=result_cache
+        )
+        for page in extracted:
+            hero = page.item
+            if page.error is not None:
+                failed.append(hero.name)
+                print(f"Failed to process {hero.name} ({hero.url}): {page.error}", file=sys.stderr)
+                continue
+
+            result = page.value
+            if metrics:
+                metrics.record_page(hero.url, result.parse_seconds, result.extractor_seconds)
+            if result.errors:
+                failed.append(hero.name)
+            for name, exc in result.errors.items():
+                print(
+                    f"Failed to extract {name.replace('_', ' ')} for {hero.name} ({hero.url}): {exc}",
+                    file=sys.stderr,
+                )
+            values = result.values
+            if "health" in values:
+                outputs["health"][hero.name] = [health_row(hero, values["health"])]
+            if "weapons" in values:
+                outputs["weapons"][hero.name] = [weapon_record(hero, values["weapons"])]
+            if "ability_effects" in values:
+                outputs["ability_effects"][hero.name] = ability_rows(hero.name, values["ability_effects"])
+            if "shields" in values:
+                outputs["shields"][hero.name] = [shield_row(hero.role, hero.name, values["shields"])]
+            if store:
+                store.save_extracted(hero.role, hero.name, hero.url, values)
+            print(f"Extracted {hero.name}", file=sys.stderr)
+
+    if cache:
+        print(cache.stats.summary(), file=sys.stderr)
+        cache.close()
+    if result_cache:
+        print(result_cache.stats.summary(), file=sys.stderr)
+    if store:
+        store.close()
+    if metrics:
+        if cache:
+            metrics.add_counters("cache", cache.stats)
+        if result_cache:
+            metrics.add_counters("results", result_cache.stats)
+        metrics.finish(args.metrics_out)
+
+    rows = {name: roster_rows(name, heroes, fresh, previous.get(name, {})) for name, fresh in outputs.items()}
+    if "health" in rows:
+        with args.health_output.open("w", encoding="utf-8", newline="") as handle:
+            write_health_csv(rows["health"], handle)
+    if "weapons" in rows:
+        write_weapons_json(rows["weapons"], args.weapons_output)
+    if "ability_effects" in rows:
+        write_ability_csv(rows["ability_effects"], args.ability_effects_output)
+    if "shields" in rows:
+        write_shields_csv(rows["shields"], args.shields_output)
+    if failed:
+        raise SystemExit(f"Failed to extract {len(failed)} of {len(targets)} heroes: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
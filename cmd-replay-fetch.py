@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.engine import add_jobs_argument, jobs_from_args, select_extractors
+from herokit.extractors import add_parser_argument
+from herokit.fetch import DEFAULT_CONCURRENCY
+from herokit.replay import PASS_KINDS, format_passes, replay_scrape
+from herokit.stubwiki import add_stub_arguments, stub_from_args
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure scrape throughput offline: start a local stub wiki over the cached "
+            "pages, then fetch the roster and every hero page through the real fetch and "
+            "cache layers, once per pass."
+        )
+    )
+    parser.add_argument(
+        "--passes",
+        default="cold,revalidate",
+        help=f"Comma-separated passes to run, from {', '.join(PASS_KINDS)} (default: cold,revalidate)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum number of pages fetched at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Maximum requests per second to the stub; 0 disables the limit (default: 0)",
+    )
+    parser.add_argument(
+        "--extractors",
+        default="",
+        help="Also parse the pages with these comma-separated extractors, e.g. weapons,health (default: none)",
+    )
+    add_parser_argument(parser)
+    add_jobs_argument(parser)
+    add_stub_arguments(parser)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Also write the per-pass results as JSON to this file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    passes = [name.strip() for name in args.passes.split(",") if name.strip()]
+    try:
+        extractors = select_extractors(name.strip() for name in args.extractors.split(",") if name.strip())
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
+
+    with stub_from_args(args) as wiki, tempfile.TemporaryDirectory(prefix="replay-cache-") as cache_dir:
+        try:
+            results = replay_scrape(
+                wiki,
+                Path(cache_dir),
+                passes=passes,
+                concurrency=args.concurrency,
+                rate_limit=args.rate_limit,
+                extractors=extractors,
+                parser=args.parser,
+                jobs=jobs_from_args(args),
+            )
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from None
+
+    behavior = wiki.behavior
+    print(
+        f"Stub: latency {behavior.latency:g}s ± {behavior.jitter:g}s, error rate {behavior.error_rate:g}, "
+        f"ETag {'on' if behavior.etag else 'off'}, concurrency {args.concurrency}",
+        file=sys.stderr,
+    )
+    print(format_passes(results))
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as handle:
+            json.dump([result.report() for result in results], handle, indent=2)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.bench import (
+    BASELINE_DEFAULT,
+    DEFAULT_THRESHOLD,
+    TARGETS,
+    compare_results,
+    format_results,
+    load_pages,
+    read_results,
+    run_benchmarks,
+    write_results,
+)
+from herokit.cache import CACHE_DIR_DEFAULT
+from herokit.extractors import add_parser_argument
+from herokit.pagestore import STORE_BACKENDS
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark page parsing and the extractors over the cached hero pages, "
+            "offline, and compare against a saved baseline."
+        )
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR_DEFAULT,
+        help=f"Directory of cached hero pages (default: {CACHE_DIR_DEFAULT})",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=sorted(STORE_BACKENDS),
+        default="dir",
+        help="Cache storage backend (default: dir)",
+    )
+    add_parser_argument(parser)
+    parser.add_argument(
+        "--targets",
+        default=",".join(TARGETS),
+        help=f"Comma-separated targets to measure (default: {','.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed passes over the pages; throughput uses the fastest (default: 3)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Only use the first N pages, for a quick run.",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="Skip the (slow) tracemalloc pass that measures peak memory.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_DEFAULT,
+        help=f"Saved results to compare against, if the file exists (default: {BASELINE_DEFAULT})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's results to --baseline instead of comparing against it.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "Fail if throughput drops, or median latency or peak memory grows, by more than "
+            f"this fraction of the baseline (default: {DEFAULT_THRESHOLD})"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Also write this run's results as JSON to this file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    pages = load_pages(args.cache_dir, args.cache_backend, args.limit)
+    if not pages:
+        raise SystemExit(f"No cached pages found in {args.cache_dir}")
+    targets = [name.strip() for name in args.targets.split(",") if name.strip()]
+    try:
+        results = run_benchmarks(pages, parser=args.parser, repeat=args.repeat, targets=targets, memory=args.memory)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
+    if args.output:
+        write_results(results, args.output)
+
+    if args.save_baseline:
+        write_results(results, args.baseline)
+        print(format_results(results))
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return
+
+    baseline = read_results(args.baseline) if args.baseline.exists() else None
+    print(format_results(results, baseline))
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.", file=sys.stderr)
+        return
+    if baseline.get("parser") != results["parser"] or baseline.get("pages") != results["pages"]:
+        print(
+            f"Warning: baseline was measured with parser {baseline.get('parser')} "
+            f"on {baseline.get('pages')} pages.",
+            file=sys.stderr,
+        )
+    regressions = compare_results(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from herokit.pipeline import STATE_PATH_DEFAULT, Pipeline, Stage, StageResult
+
+ROOT = Path(__file__).parent
+ROSTER = Path("data-heroes.hidden.csv")
+PAGE_CACHE = Path(".cache/hero-pages")
+HEROKIT = Path("herokit")
+HEALTH = Path("hero-health.csv")
+WEAPONS = Path("hero-weapons.json")
+ABILITY_EFFECTS = Path("hero-ability-damage.csv")
+SHIELDS = Path("hero-shields.csv")
+DETAILS = Path("data-hero-details.csv")
+SNAPSHOT = Path(".cache/hero-snapshot.bin")
+# The page cache's index and per-page sidecars; the extraction stages rewrite them on every run.
+PAGE_CACHE_METADATA = ("*.json",)
+# The roster is read straight from the wiki, so no file in the tree says when it changed.
+ROSTER_MAX_AGE = 24 * 60 * 60
+
+
+def _extraction_stage(name: str, script: str, output: Path, *, stdout: bool = False) -> Stage:
+    return Stage(
+        name=name,
+        command=(script,),
+        inputs=(Path(script), ROSTER, PAGE_CACHE, HEROKIT),
+        outputs=(output,),
+        stdout=output if stdout else None,
+        ignore=PAGE_CACHE_METADATA,
+    )
+
+
+STAGES = (
+    Stage(
+        name="roster",
+        command=("cmd-01-generate-heroes-csv.py",),
+        inputs=(Path("cmd-01-generate-heroes-csv.py"),),
+        outputs=(ROSTER,),
+        max_age=ROSTER_MAX_AGE,
+    ),
+    _extraction_stage("health", "cmd-02-extract-hero-health.py", HEALTH, stdout=True),
+    _extraction_stage("weapons", "cmd-03-extract-hero-weapons.py", WEAPONS),
+    _extraction_stage("ability_effects", "cmd-04-extract-hero-ability-effects.py", ABILITY_EFFECTS),
+    _extraction_stage("shields", "cmd-05-extract-hero-shields.py", SHIELDS),
+    Stage(
+        name="details",
+        command=("cmd-06-generate-hero-details.py",),
+        inputs=(Path("cmd-06-generate-hero-details.py"), HEALTH, SHIELDS, WEAPONS, HEROKIT),
+        outputs=(DETAILS,),
+    ),
+    Stage(
+        name="snapshot",
+        command=("cmd-07-build-hero-snapshot.py",),
+        inputs=(Path("cmd-07-build-hero-snapshot.py"), ROSTER, HEALTH, SHIELDS, WEAPONS, HEROKIT),
+        outputs=(SNAPSHOT,),
+    ),
+)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the cmd-01..07 scripts in dependency order, skipping stages whose "
+            "inputs and outputs are unchanged since their last successful run."
+        )
+    )
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        metavar="STAGE",
+        help=f"Stages to bring up to date, with their dependencies (default: all of {', '.join(names)})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum number of stages running at once (default: 4)",
+    )
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Run STAGE even if it is up to date; may be repeated.",
+    )
+    parser.add_argument(
+        "--assume-current",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Treat STAGE as up to date without checking it (e.g. roster when offline); may be repeated.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report which stages are out of date.",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=STATE_PATH_DEFAULT,
+        help=f"File recording the hashes of each stage's last run (default: {STATE_PATH_DEFAULT})",
+    )
+    return parser.parse_args(argv)
+
+
+def report(result: StageResult) -> None:
+    timing = f" in {result.seconds:.1f}s" if result.status in ("ran", "failed") else ""
+    detail = f" ({result.detail})" if result.detail else ""
+    print(f"{result.status:>7} {result.name}{timing}{detail}", file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    pipeline = Pipeline(STAGES, root=ROOT, state_path=args.state)
+    try:
+        results = pipeline.run(
+            args.stages or None,
+            jobs=args.jobs,
+            force=args.force,
+            assume_current=args.assume_current,
+            dry_run=args.dry_run,
+            report=report,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
+    if any(result.status in ("failed", "blocked") for result in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+from herokit.roster import HEROES_PATH
+from herokit.stubwiki import add_stub_arguments, stub_from_args
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve the cached hero pages and a generated Heroes navbox over local HTTP, "
+            "for running the fetch stages offline (e.g. cmd-01 --base-url)."
+        )
+    )
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    wiki = stub_from_args(args, port=args.port)
+    print(f"Serving {wiki.base_url}{HEROES_PATH}; Ctrl-C to stop", file=sys.stderr)
+    try:
+        wiki.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        wiki.close()
+        print(wiki.stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,54 @@
 from __future__ import annotations
 
 import argparse
-import csv
-import json
+import os
 import random
-import re
-from dataclasses import dataclass
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
+
+from herokit.duel import (
+    A_WINS,
+    ARMOR_DAMAGE_FACTOR,
+    B_WINS,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    DAMAGE_ROLE_FACTOR,
+    DRAW,
+    MAX_ROUNDS_DEFAULT,
+    OUTCOMES,
+    STALEMATE,
+    SUPPORT_REGEN,
+    TANK_DAMAGE_FACTOR,
+)
+from herokit.herodb import HeroStore, add_db_argument
+from herokit.models import HeroStats, load_hero_stats
+from herokit.snapshot import SNAPSHOT_PATH_DEFAULT, load_fresh_heroes
 
 DATA_DIR = Path(__file__).resolve().parent
 ROSTER_CSV = DATA_DIR / "data-heroes.hidden.csv"
 HEALTH_CSV = DATA_DIR / "hero-health.csv"
+SHIELDS_CSV = DATA_DIR / "hero-shields.csv"
 WEAPONS_JSON = DATA_DIR / "hero-weapons.json"
-
-NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+")
-
-
-def parse_number(value: Optional[str]) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    cleaned = str(value).replace(",", "")
-    match = NUMBER_PATTERN.search(cleaned)
-    if match:
-        return float(match.group())
-    return None
-
-
-def parse_all_numbers(value: Optional[str]) -> List[float]:
-    if value is None:
-        return []
-    cleaned = str(value).replace(",", "")
-    return [float(match) for match in NUMBER_PATTERN.findall(cleaned)]
-
-
-@dataclass
-class Weapon:
-    name: str
-    shots_per_second: float
-    damage_per_shot: float
-    dps_firing: float
-    clip_size: Optional[float]
-    reload_time: float
-    crit_chance: float
-    description: str
-
-
-@dataclass
-class HeroStats:
-    role: str
-    name: str
-    url: str
-    health: float
-    armor: float
-    weapon: Weapon
+SNAPSHOT_PATH = DATA_DIR / SNAPSHOT_PATH_DEFAULT
+SNAPSHOT_SOURCES = (ROSTER_CSV, HEALTH_CSV, SHIELDS_CSV, WEAPONS_JSON)
+MATRIX_CSV = DATA_DIR / "fight-matrix.csv"
+MATRIX_JSON = DATA_DIR / "fight-matrix.json"
 
 
 class FighterState:
+    __slots__ = (
+        "hero",
+        "health",
+        "armor",
+        "max_health",
+        "max_armor",
+        "weapon",
+        "ammo",
+        "reload_timer",
+        "took_damage_this_round",
+    )
+
     def __init__(self, hero: HeroStats) -> None:
         self.hero = hero
         self.health = float(hero.health)
@@ -66,7 +56,7 @@ class FighterState:
         self.max_health = float(hero.health)
         self.max_armor = float(hero.armor)
         self.weapon = hero.weapon
-        self.ammo: Optional[float] = None if hero.weapon.clip_size is None else float(hero.weapon.clip_size)
+        self.ammo: Optional[float] = None if hero.weapon.ammo is None else float(hero.weapon.ammo)
         self.reload_timer: float = 0.0
         self.took_damage_this_round = False
 
@@ -81,8 +71,8 @@ class FighterState:
 
         if self.reload_timer > 0:
             self.reload_timer = max(0.0, self.reload_timer - 1.0)
-            if self.reload_timer == 0 and self.weapon.clip_size is not None:
-                self.ammo = float(self.weapon.clip_size)
+            if self.reload_timer == 0 and self.weapon.ammo is not None:
+                self.ammo = float(self.weapon.ammo)
             return 0.0, "Reloading"
 
         shots_per_second = self.weapon.shots_per_second
@@ -90,34 +80,34 @@ class FighterState:
 
         # Base damage reference before crits
         damage = 0.0
-        if shots_per_second <= 0 and self.weapon.dps_firing > 0:
-            damage = self.weapon.dps_firing
+        if shots_per_second <= 0 and self.weapon.dps > 0:
+            damage = self.weapon.dps
             log.append("sustained DPS")
         else:
-            if self.weapon.clip_size is None:
+            if self.weapon.ammo is None:
                 shots_fired = shots_per_second
             else:
                 if self.ammo is None:
-                    self.ammo = float(self.weapon.clip_size)
+                    self.ammo = float(self.weapon.ammo)
                 available = min(self.ammo, shots_per_second)
                 shots_fired = available
                 self.ammo -= available
-                if self.ammo <= 0 and self.weapon.reload_time > 0:
-                    self.reload_timer = self.weapon.reload_time
+                if self.ammo <= 0 and (self.weapon.reload_seconds or 0.0) > 0:
+                    self.reload_timer = self.weapon.reload_seconds
                     self.ammo = 0.0
                     log.append("clip empty")
             damage = max(0.0, shots_fired) * self.weapon.damage_per_shot
-            if self.weapon.clip_size is not None:
+            if self.weapon.ammo is not None:
                 log.append(f"{shots_fired:.1f} shots")
 
         crit = False
-        if self.weapon.crit_chance > 0 and random.random() < self.weapon.crit_chance:
-            damage *= 2
+        if self.weapon.critical and random.random() < CRIT_CHANCE:
+            damage *= CRIT_MULTIPLIER
             crit = True
             log.append("CRIT")
 
         if self.hero.role.lower() == "damage":
-            damage *= 1.05
+            damage *= DAMAGE_ROLE_FACTOR
             log.append("+5% DPS passive")
 
         if crit:
@@ -137,7 +127,7 @@ class FighterState:
         effective_damage = incoming_damage
 
         if self.armor > 0:
-            effective_damage *= 0.70  # 30% mitigation while armor remains
+            effective_damage *= ARMOR_DAMAGE_FACTOR
             armor_absorb = min(self.armor, effective_damage)
             self.armor -= armor_absorb
             remaining = effective_damage - armor_absorb
@@ -145,7 +135,7 @@ class FighterState:
             total_taken = effective_damage
         else:
             if self.hero.role.lower() == "tank":
-                effective_damage *= 0.90  # tank passive mitigation once armor is gone
+                effective_damage *= TANK_DAMAGE_FACTOR
             self.health -= effective_damage
             total_taken = effective_damage
 
@@ -162,117 +152,22 @@ class FighterState:
         missing = self.max_health - self.health
         if missing <= 0:
             return None
-        heal = min(15.0, missing)
+        heal = min(SUPPORT_REGEN, missing)
         self.health += heal
         return heal
 
 
-def load_roster() -> Dict[str, Dict[str, str]]:
-    roster: Dict[str, Dict[str, str]] = {}
-    with ROSTER_CSV.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            roster[row["name"]] = {
-                "role": row["role"],
-                "url": row["url"],
-            }
-    return roster
-
-
-def load_health() -> Dict[str, Dict[str, float]]:
-    health_data: Dict[str, Dict[str, float]] = {}
-    with HEALTH_CSV.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            health = float(row["health"]) if row["health"] else 0.0
-            armor = float(row["armor"]) if row["armor"] else 0.0
-            health_data[row["name"]] = {
-                "health": health,
-                "armor": armor,
-            }
-    return health_data
-
-
-def parse_weapon_entry(entry: dict) -> Weapon:
-    rof_text = entry.get("rate_of_fire") or ""
-    rate_value = parse_number(rof_text) or 0.0
-    shots_per_volley = parse_number(entry.get("shots_per_volley")) or 1.0
-    descriptor = entry.get("effect_type") or ""
-    additional_details = entry.get("additional_details") or []
-    damage_values = parse_all_numbers((entry.get("damage") or {}).get("damage"))
-    dps_hint = None
-    for detail in additional_details:
-        if "damage per second" in detail.lower():
-            dps_hint = parse_number(detail)
-            break
-
-    rof_lower = rof_text.lower()
-    shots_per_second = rate_value
-    if "volley" in rof_lower or "burst" in rof_lower:
-        shots_per_second = rate_value * shots_per_volley
-
-    damage_per_shot = 0.0
-    if shots_per_second > 0 and dps_hint:
-        damage_per_shot = dps_hint / shots_per_second
-    elif damage_values:
-        damage_per_shot = max(damage_values)
-    else:
-        damage_per_shot = dps_hint or 0.0
-
-    if shots_per_second == 0 and damage_per_shot > 0:
-        shots_per_second = 1.0
-
-    dps_firing = dps_hint or (damage_per_shot * shots_per_second)
-    ammo_raw = entry.get("ammo")
-    clip_size = parse_number(ammo_raw)
-    reload_time = parse_number(entry.get("reload_time")) or 0.0
-    headshot = entry.get("headshot") or ""
-    keywords = entry.get("keywords") or []
-    crit_chance = 0.1 if ("✓" in headshot or "critical" in [k.lower() for k in keywords]) else 0.0
-    return Weapon(
-        name=entry.get("name", "Unknown Weapon"),
-        shots_per_second=shots_per_second,
-        damage_per_shot=damage_per_shot,
-        dps_firing=dps_firing,
-        clip_size=clip_size,
-        reload_time=reload_time,
-        crit_chance=crit_chance,
-        description=descriptor,
-    )
-
-
-def load_weapons() -> Dict[str, Weapon]:
-    with WEAPONS_JSON.open(encoding="utf-8") as handle:
-        records = json.load(handle)
-    hero_weapons: Dict[str, Weapon] = {}
-    for record in records:
-        weapons = record.get("weapons") or []
-        if not weapons:
-            continue
-        # Pick the first weapon as default; could be extended to smarter selection
-        weapon = parse_weapon_entry(weapons[0])
-        hero_weapons[record["name"]] = weapon
-    return hero_weapons
-
-
-def assemble_heroes() -> List[HeroStats]:
-    roster = load_roster()
-    health = load_health()
-    weapons = load_weapons()
-    heroes: List[HeroStats] = []
-    for name, info in roster.items():
-        if name not in health or name not in weapons:
-            continue
-        heroes.append(
-            HeroStats(
-                role=info["role"],
-                name=name,
-                url=info["url"],
-                health=health[name]["health"],
-                armor=health[name]["armor"],
-                weapon=weapons[name],
-            )
-        )
+def load_heroes(args: argparse.Namespace) -> List[HeroStats]:
+    heroes: Optional[List[HeroStats]] = None
+    if args.db is not None:
+        with HeroStore(args.db) as store:
+            heroes = store.heroes()
+    elif args.snapshot is not None:
+        heroes = load_fresh_heroes(args.snapshot, SNAPSHOT_SOURCES)
+        if heroes is None and args.snapshot.exists():
+            print(f"Hero snapshot {args.snapshot} is out of date; reading the text sources.", file=sys.stderr)
+    if heroes is None:
+        heroes = load_hero_stats(HEALTH_CSV, WEAPONS_JSON, shields_csv=SHIELDS_CSV, roster_csv=ROSTER_CSV)
     if len(heroes) < 2:
         raise RuntimeError("Insufficient hero data to run a fight.")
     return heroes
@@ -281,10 +176,36 @@ def assemble_heroes() -> List[HeroStats]:
 def describe_fighter(hero: HeroStats) -> str:
     return (
         f"{hero.name} ({hero.role}) — {hero.health:.0f} HP + {hero.armor:.0f} armor | "
-        f"{hero.weapon.name}: {hero.weapon.dps_firing:.1f} DPS"
+        f"{hero.weapon.name}: {hero.weapon.dps:.1f} DPS"
     )
 
 
+def duel_outcome(fighter_a: FighterState, fighter_b: FighterState) -> int:
+    if fighter_a.alive and not fighter_b.alive:
+        return A_WINS
+    if fighter_b.alive and not fighter_a.alive:
+        return B_WINS
+    if not fighter_a.alive and not fighter_b.alive:
+        return DRAW
+    return STALEMATE
+
+
+def run_duel(hero_a: HeroStats, hero_b: HeroStats, max_rounds: int) -> Tuple[int, int]:
+    """Fight one duel without printing; return the outcome code and the rounds played."""
+    fighter_a = FighterState(hero_a)
+    fighter_b = FighterState(hero_b)
+    rounds = 0
+    while fighter_a.alive and fighter_b.alive and rounds < max_rounds:
+        dmg_a, _ = fighter_a.attack()
+        dmg_b, _ = fighter_b.attack()
+        fighter_b.apply_damage(dmg_a)
+        fighter_a.apply_damage(dmg_b)
+        fighter_a.apply_support_regen()
+        fighter_b.apply_support_regen()
+        rounds += 1
+    return duel_outcome(fighter_a, fighter_b), rounds
+
+
 def simulate_fight(hero_a: HeroStats, hero_b: HeroStats, max_rounds: int) -> None:
     fighter_a = FighterState(hero_a)
     fighter_b = FighterState(hero_b)
@@ -328,20 +249,213 @@ def simulate_fight(hero_a: HeroStats, hero_b: HeroStats, max_rounds: int) -> Non
 
         round_number += 1
 
-    if fighter_a.alive and not fighter_b.alive:
+    outcome = duel_outcome(fighter_a, fighter_b)
+    if outcome == A_WINS:
         print(f"{hero_a.name} wins with {fighter_a.health:.1f} HP remaining!")
-    elif fighter_b.alive and not fighter_a.alive:
+    elif outcome == B_WINS:
         print(f"{hero_b.name} wins with {fighter_b.health:.1f} HP remaining!")
-    elif not fighter_a.alive and not fighter_b.alive:
+    elif outcome == DRAW:
         print("Both heroes fall simultaneously — it's a draw!")
     else:
         print("Stalemate reached — maximum rounds exceeded.")
 
 
+def simulate_events(hero_a: HeroStats, hero_b: HeroStats, max_seconds: int) -> None:
+    from herokit.events import simulate_event_duel
+
+    print("Selected heroes:")
+    print(f"  {describe_fighter(hero_a)}")
+    print(f"  {describe_fighter(hero_b)}")
+    print("=" * 60)
+
+    duel = simulate_event_duel(
+        hero_a,
+        hero_b,
+        max_seconds=max_seconds,
+        log=lambda seconds, text: print(f"{seconds:6.2f}s  {text}"),
+    )
+    print("-" * 60)
+    if duel.outcome == A_WINS:
+        print(f"{hero_a.name} wins after {duel.seconds:.2f}s!")
+    elif duel.outcome == B_WINS:
+        print(f"{hero_b.name} wins after {duel.seconds:.2f}s!")
+    elif duel.outcome == DRAW:
+        print(f"Both heroes fall simultaneously at {duel.seconds:.2f}s — it's a draw!")
+    else:
+        print("Stalemate reached — time limit exceeded.")
+
+
+def simulate_many(
+    heroes: List[HeroStats], hero_a: HeroStats, hero_b: HeroStats, duels: int, args: argparse.Namespace
+) -> None:
+    print("Selected heroes:")
+    print(f"  {describe_fighter(hero_a)}")
+    print(f"  {describe_fighter(hero_b)}")
+    print("=" * 60)
+    if args.engine == "events":
+        from herokit.events import simulate_event_duel
+
+        rng = random.Random(args.seed)
+        results = [simulate_event_duel(hero_a, hero_b, max_seconds=args.max_rounds, rng=rng) for _ in range(duels)]
+        counts = {name: 0 for name in OUTCOMES}
+        for result in results:
+            counts[OUTCOMES[result.outcome]] += 1
+        length = f"{sum(result.seconds for result in results) / duels:.2f}s"
+    else:
+        from herokit.montecarlo import require_numpy, simulate_pair
+
+        try:
+            require_numpy()
+        except RuntimeError as exc:
+            raise SystemExit(str(exc)) from None
+        import numpy as np
+
+        batch = simulate_pair(
+            heroes,
+            heroes.index(hero_a),
+            heroes.index(hero_b),
+            duels,
+            max_rounds=args.max_rounds,
+            rng=np.random.default_rng(args.seed),
+        )
+        counts = batch.counts()
+        length = f"{float(batch.rounds.mean()):.1f} rounds"
+    labels = {
+        "a_wins": f"{hero_a.name} wins",
+        "b_wins": f"{hero_b.name} wins",
+        "draw": "Draws",
+        "stalemate": "Stalemates",
+    }
+    print(f"{duels} duels, {length} on average")
+    for name in OUTCOMES:
+        print(f"  {labels[name]:<24} {counts[name]:>9}  {counts[name] / duels:6.1%}")
+
+
+def solve_exact(hero_a: HeroStats, hero_b: HeroStats, max_rounds: int) -> None:
+    from herokit.exact import solve_duel
+
+    print("Selected heroes:")
+    print(f"  {describe_fighter(hero_a)}")
+    print(f"  {describe_fighter(hero_b)}")
+    print("=" * 60)
+    result = solve_duel(hero_a, hero_b, max_rounds=max_rounds)
+    labels = {
+        "a_wins": f"{hero_a.name} wins",
+        "b_wins": f"{hero_b.name} wins",
+        "draw": "Draws",
+        "stalemate": "Stalemates",
+    }
+    print(f"Exact odds over {result.states} fight states, {result.expected_rounds:.2f} rounds expected")
+    for name, probability in result.rates().items():
+        print(f"  {labels[name]:<24} {probability:9.4%}")
+
+
+def run_matrix_mode(heroes: List[HeroStats], args: argparse.Namespace) -> None:
+    from herokit.matrix import (
+        MATRIX_DUELS_DEFAULT,
+        ProgressPrinter,
+        run_matrix,
+        write_matrix_csv,
+        write_matrix_json,
+    )
+    from herokit.montecarlo import require_numpy
+
+    try:
+        require_numpy()
+    except RuntimeError as exc:
+        raise SystemExit(str(exc)) from None
+    duels = args.duels if args.duels is not None else MATRIX_DUELS_DEFAULT
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    print(
+        f"Matrix: {len(heroes)}x{len(heroes)} matchups, {duels} duels each, {jobs} worker(s)",
+        file=sys.stderr,
+    )
+    matrix = run_matrix(
+        heroes,
+        duels=duels,
+        max_rounds=args.max_rounds,
+        seed=args.seed,
+        jobs=jobs,
+        progress=ProgressPrinter("Matrix"),
+    )
+    write_matrix_csv(matrix, args.matrix_csv)
+    write_matrix_json(matrix, args.matrix_json)
+    print(f"Matrix written to {args.matrix_csv} and {args.matrix_json}", file=sys.stderr)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Simulate an Overwatch 2 hero duel.")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility.")
-    parser.add_argument("--max-rounds", type=int, default=30, help="Maximum rounds before declaring a draw.")
+    parser.add_argument(
+        "--max-rounds", type=int, default=MAX_ROUNDS_DEFAULT, help="Maximum rounds before declaring a draw."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("rounds", "events"),
+        default="rounds",
+        help=(
+            "rounds: one-second rounds (with --duels, the batched NumPy engine); "
+            "events: continuous time, every shot, reload and regen tick at its own timestamp"
+        ),
+    )
+    parser.add_argument(
+        "--duels",
+        type=positive_int,
+        default=None,
+        help=(
+            "Fight this many duels of the selected pair and print the outcome rates; with --matrix, "
+            "the duels per matchup (default there: 1000)."
+        ),
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Print the exact win/draw/loss probabilities of the selected pair under the round rules, without sampling.",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="Fight every ordered pair of heroes and write win/draw/loss rates and mean time-to-kill.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="With --matrix, run hero rows in this many worker processes; 0 uses every core (default: 1)",
+    )
+    parser.add_argument(
+        "--matrix-csv",
+        type=Path,
+        default=MATRIX_CSV,
+        help=f"Where --matrix writes one row per matchup (default: {MATRIX_CSV.name})",
+    )
+    parser.add_argument(
+        "--matrix-json",
+        type=Path,
+        default=MATRIX_JSON,
+        help=f"Where --matrix writes the rate and time-to-kill matrices (default: {MATRIX_JSON.name})",
+    )
+    add_db_argument(parser, help_text="Load heroes from this SQLite hero store instead of the CSV/JSON files.")
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        default=SNAPSHOT_PATH,
+        help=f"Binary hero snapshot to load when it matches the CSV/JSON files (default: {SNAPSHOT_PATH_DEFAULT})",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        dest="snapshot",
+        action="store_const",
+        const=None,
+        help="Always read the CSV/JSON files.",
+    )
     return parser.parse_args()
 
 
@@ -349,9 +463,19 @@ def main() -> None:
     args = parse_args()
     if args.seed is not None:
         random.seed(args.seed)
-    heroes = assemble_heroes()
+    heroes = load_heroes(args)
+    if args.matrix:
+        run_matrix_mode(heroes, args)
+        return
     hero_a, hero_b = random.sample(heroes, 2)
-    simulate_fight(hero_a, hero_b, args.max_rounds)
+    if args.exact:
+        solve_exact(hero_a, hero_b, args.max_rounds)
+    elif args.duels is not None:
+        simulate_many(heroes, hero_a, hero_b, args.duels, args)
+    elif args.engine == "events":
+        simulate_events(hero_a, hero_b, args.max_rounds)
+    else:
+        simulate_fight(hero_a, hero_b, args.max_rounds)
 
 
 if __name__ == "__main__":
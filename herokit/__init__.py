@@ -0,0 +1 @@
+"""Shared helpers for the cmd-* hero data scripts and the fight simulator."""
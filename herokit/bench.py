@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from bs4 import BeautifulSoup
+
+from herokit.cache import RAW_URL_PREFIX
+from herokit.extractors import (
+    DEFAULT_PARSER,
+    extract_shields,
+    extract_stats,
+    extract_weapons,
+    parse_html,
+    read_ability_rows,
+)
+from herokit.pagestore import open_store
+
+BENCH_FORMAT = 1
+BASELINE_DEFAULT = Path("benchmarks/extract-baseline.json")
+DEFAULT_THRESHOLD = 0.15
+
+# Extractors run against an already parsed page, as extract_page does; parsing is measured on its own.
+EXTRACTOR_TARGETS: dict[str, Callable[[BeautifulSoup], Any]] = {
+    "extract_stats": extract_stats,
+    "extract_weapons": extract_weapons,
+    "extract_shields": extract_shields,
+    "read_ability_rows": lambda soup: list(read_ability_rows(soup)),
+}
+TARGETS = ("parse", *EXTRACTOR_TARGETS)
+
+
+def load_pages(cache_dir: Path, backend: str = "dir", limit: Optional[int] = None) -> list[tuple[str, str]]:
+    """(url, html) for every page in the page cache, in URL order; untrimmed ``keep_raw`` copies are left out."""
+    pages = []
+    with open_store(cache_dir, backend) as store:
+        urls = [url for url in store.urls() if not url.startswith(RAW_URL_PREFIX)]
+        for url in urls[:limit]:
+            html = store.read(url)
+            if html is not None:
+                pages.append((url, html))
+    return pages
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _time_page(
+    html: str, parser: str, targets: list[str], samples: dict[str, list[float]], totals: dict[str, float]
+) -> None:
+    start = time.perf_counter()
+    soup: BeautifulSoup = parse_html(html, parser)
+    if "parse" in targets:
+        seconds = time.perf_counter() - start
+        samples["parse"].append(seconds)
+        totals["parse"] += seconds
+    for target in targets:
+        if target == "parse":
+            continue
+        func = EXTRACTOR_TARGETS[target]
+        seconds = _timed(lambda func=func: func(soup))
+        samples[target].append(seconds)
+        totals[target] += seconds
+
+
+def run_benchmarks(
+    pages: Sequence[tuple[str, str]],
+    *,
+    parser: str = DEFAULT_PARSER,
+    repeat: int = 3,
+    targets: Iterable[str] = TARGETS,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Time each target over ``pages`` ``repeat`` times and summarize the per-page latencies.
+
+    ``pages_per_second`` comes from the fastest round, which is the least
+    disturbed by other work on the machine. Peak memory is measured with
+    tracemalloc in a separate pass, since tracing slows everything down.
+    """
+    targets = list(targets)
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark targets {sorted(unknown)}; choose from {list(TARGETS)}")
+    if not pages:
+        raise ValueError("No pages to benchmark")
+
+    samples: dict[str, list[float]] = {target: [] for target in targets}
+    rounds: dict[str, list[float]] = {target: [] for target in targets}
+    for _ in range(repeat):
+        totals = dict.fromkeys(targets, 0.0)
+        for _url, html in pages:
+            # Like timeit, keep the cyclic GC out of the timings; parsed trees are collected between pages.
+            gc.collect()
+            gc.disable()
+            try:
+                _time_page(html, parser, targets, samples, totals)
+            finally:
+                gc.enable()
+        for target, total in totals.items():
+            rounds[target].append(total)
+
+    peaks = dict.fromkeys(targets, 0)
+    if memory:
+        for _url, html in pages:
+            soup = parse_html(html, parser)
+            for target in targets:
+                if target == "parse":
+                    peak = _peak_memory(lambda html=html: parse_html(html, parser))
+                else:
+                    func = EXTRACTOR_TARGETS[target]
+                    peak = _peak_memory(lambda func=func, soup=soup: func(soup))
+                peaks[target] = max(peaks[target], peak)
+
+    results = {}
+    for target in targets:
+        latencies = samples[target]
+        results[target] = {
+            "pages_per_second": len(pages) / min(rounds[target]),
+            "mean_ms": statistics.fmean(latencies) * 1000,
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p90_ms": _percentile(latencies, 0.90) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+            "max_ms": max(latencies) * 1000,
+            "peak_memory_bytes": peaks[target] if memory else None,
+        }
+    return {
+        "format": BENCH_FORMAT,
+        "parser": parser,
+        "pages": len(pages),
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "targets": results,
+    }
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline`` larger than ``threshold`` (0.15 = 15%).
+
+    Throughput must not drop, and median latency and peak memory must not grow,
+    by more than the threshold. Targets missing from either side are ignored.
+    """
+    regressions = []
+    for target, now in current["targets"].items():
+        before = baseline.get("targets", {}).get(target)
+        if before is None:
+            continue
+        if now["pages_per_second"] < before["pages_per_second"] * (1 - threshold):
+            regressions.append(
+                f"{target}: {now['pages_per_second']:.1f} pages/s, baseline {before['pages_per_second']:.1f}"
+            )
+        if now["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            regressions.append(f"{target}: p50 {now['p50_ms']:.2f} ms, baseline {before['p50_ms']:.2f} ms")
+        if now["peak_memory_bytes"] is not None and before.get("peak_memory_bytes") is not None:
+            if now["peak_memory_bytes"] > before["peak_memory_bytes"] * (1 + threshold):
+                regressions.append(
+                    f"{target}: peak memory {now['peak_memory_bytes']} bytes, "
+                    f"baseline {before['peak_memory_bytes']} bytes"
+                )
+    return regressions
+
+
+def format_results(results: dict[str, Any], baseline: Optional[dict[str, Any]] = None) -> str:
+    lines = [
+        f"{results['pages']} pages, parser {results['parser']}, best of {results['repeat']}",
+        f"  {'target':<18} {'pages/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'peak KiB':>9} {'vs base':>8}",
+    ]
+    for target, stats in results["targets"].items():
+        peak = stats["peak_memory_bytes"]
+        peak_text = "-" if peak is None else f"{peak / 1024:.0f}"
+        before = (baseline or {}).get("targets", {}).get(target)
+        change = f"{stats['pages_per_second'] / before['pages_per_second'] - 1:+.0%}" if before else ""
+        lines.append(
+            f"  {target:<18} {stats['pages_per_second']:9.1f} {stats['p50_ms']:8.2f} "
+            f"{stats['p90_ms']:8.2f} {stats['p99_ms']:8.2f} {peak_text:>9} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def read_results(path: Path) -> dict[str, Any]:
+    with path.open(encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_results(results: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+        handle.write("\n")
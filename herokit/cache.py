@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from herokit.fetch import PageFetcher
+from herokit.pagestore import (
+    STORE_BACKENDS,
+    CacheEntry,
+    PageStore,
+    cache_key,
+    content_hash,
+    open_store,
+)
+from herokit.trim import TRIM_VERSION, trim_article
+
+__all__ = ["CacheEntry", "CacheStats", "PageCache", "cache_key"]
+
+CACHE_DIR_DEFAULT = Path(".cache/hero-pages")
+RAW_URL_PREFIX = "raw+"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    unchanged: int = 0
+    downloaded: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"Cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.revalidated} revalidated (304), {self.unchanged} unchanged, "
+            f"{self.downloaded} downloaded"
+        )
+
+
+class PageCache:
+    """HTML page cache shared by every cmd-* stage.
+
+    Storage is delegated to a :mod:`herokit.pagestore` backend: ``dir`` keeps one
+    HTML file per page, ``pack`` keeps a single compressed pack file. With
+    ``trim`` the page is cut down to its article body before it is stored (see
+    :func:`herokit.trim.trim_html`); ``keep_raw`` also stores the original.
+    Pages without an article body are stored as downloaded.
+
+    A cached page is served as-is until it is older than ``max_age`` seconds (or
+    always, with ``refresh``); then a conditional GET is sent using the stored
+    ETag / Last-Modified and the body is only re-downloaded if it changed.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR_DEFAULT,
+        *,
+        backend: str = "dir",
+        max_age: Optional[float] = None,
+        refresh: bool = False,
+        trim: bool = False,
+        keep_raw: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.backend: PageStore = open_store(directory, backend)
+        self.max_age = max_age
+        self.refresh = refresh
+        self.trim = trim
+        self.keep_raw = keep_raw
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> PageCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def read(self, url: str) -> Optional[str]:
+        """Return the cached page without touching the network."""
+        html = self.backend.read(url)
+        self._count("hits" if html is not None else "misses")
+        return html
+
+    def read_raw(self, url: str) -> Optional[str]:
+        """Return the page as originally downloaded, if it is still available."""
+        raw = self.backend.read(RAW_URL_PREFIX + url)
+        if raw is not None:
+            return raw
+        entry = self.backend.entry(url)
+        if entry is None or entry.trim_version is not None:
+            return None
+        return self.backend.read(url)
+
+    def entry(self, url: str) -> Optional[CacheEntry]:
+        return self.backend.entry(url)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        if self.refresh:
+            return False
+        if self.max_age is None:
+            return True
+        return time.time() - entry.fetched_at <= self.max_age
+
+    def store(
+        self,
+        url: str,
+        html: str,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        entry = self._new_entry(url, html, etag, last_modified)
+        self.put(entry, html)
+        return entry
+
+    def put(self, entry: CacheEntry, html: str) -> str:
+        """Write ``html`` as downloaded for ``entry``, trimming it if configured; return the text stored."""
+        trimmed = trim_article(html) if self.trim else None
+        if trimmed is None:
+            self.backend.write(entry, html)
+            return html
+
+        if self.keep_raw:
+            raw_entry = CacheEntry(**{**asdict(entry), "url": RAW_URL_PREFIX + entry.url})
+            self.backend.write(raw_entry, html)
+        entry.trim_version = TRIM_VERSION
+        self.backend.write(entry, trimmed)
+        return trimmed
+
+    def fetch(self, url: str, fetcher: PageFetcher) -> str:
+        """Return the page for ``url``, hitting the network only when needed."""
+        entry = self.entry(url)
+        html = self.backend.read(url) if entry else None
+        if entry and html is not None and self.is_fresh(entry):
+            self._count("hits")
+            print(f"Cache hit for {url}", file=sys.stderr)
+            return html
+
+        headers: dict[str, str] = {}
+        if entry and html is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = fetcher.get(url, headers=headers or None)
+        if response.status_code == 304 and entry and html is not None:
+            entry.fetched_at = time.time()
+            self.backend.update_entry(entry)
+            self._count("revalidated")
+            print(f"Cache revalidated for {url}", file=sys.stderr)
+            return html
+
+        response.raise_for_status()
+        fresh = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        digest = content_hash(fresh)
+        if entry and html is not None and digest == (entry.sha256 or content_hash(html)):
+            entry.fetched_at = time.time()
+            entry.sha256 = digest
+            entry.etag = etag
+            entry.last_modified = last_modified
+            self.backend.update_entry(entry)
+            self._count("unchanged")
+            print(f"Cache unchanged for {url}", file=sys.stderr)
+            return html
+
+        self._count("misses" if html is None else "downloaded")
+        # Return the page as it was stored, so a trimmed cache gives the same text on a miss as on a hit.
+        return self.put(self._new_entry(url, fresh, etag, last_modified), fresh)
+
+    @staticmethod
+    def _new_entry(url: str, html: str, etag: Optional[str], last_modified: Optional[str]) -> CacheEntry:
+        return CacheEntry(
+            url=url,
+            fetched_at=time.time(),
+            sha256=content_hash(html),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+
+def fetch_page(url: str, fetcher: PageFetcher, cache: Optional[PageCache] = None) -> str:
+    if cache:
+        return cache.fetch(url, fetcher)
+    return fetcher.fetch_text(url)
+
+
+def add_cache_arguments(
+    parser: argparse.ArgumentParser,
+    *,
+    default_dir: Path = CACHE_DIR_DEFAULT,
+    network: bool = True,
+) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=default_dir,
+        help=f"Directory for cached hero pages (default: {default_dir})",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=sorted(STORE_BACKENDS),
+        default="dir",
+        help="Cache storage: one HTML file per page or a compressed pack (default: dir)",
+    )
+    if not network:
+        return
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable reading from or writing to the HTML cache.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate every cached page with a conditional request before using it.",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=None,
+        help="Revalidate cached pages older than this many seconds (default: never).",
+    )
+    parser.add_argument(
+        "--trim",
+        action="store_true",
+        help="Store newly downloaded pages cut down to their article body.",
+    )
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="With --trim, also keep the untrimmed page in the cache.",
+    )
+
+
+def cache_from_args(args: argparse.Namespace) -> Optional[PageCache]:
+    if getattr(args, "no_cache", False):
+        return None
+    return PageCache(
+        args.cache_dir,
+        backend=args.cache_backend,
+        max_age=getattr(args, "max_age", None),
+        refresh=getattr(args, "refresh", False),
+        trim=getattr(args, "trim", False),
+        keep_raw=getattr(args, "keep_raw", False),
+    )
+
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class CheckpointedNdjson:
+    """NDJSON writer that records each completed record in a journal.
+
+    Every :meth:`write` appends one JSON line and flushes it to disk, then
+    appends ``{"key": ..., "end": <byte offset>}`` to ``<path>.journal``. With
+    ``resume`` the file is cut back to the last journaled offset (dropping a
+    record that was half written when the previous run died), the journal is cut
+    back to its last complete entry, and the journaled keys are available in
+    :attr:`done` so callers can skip them. Without it both files start empty.
+    """
+
+    def __init__(self, path: Path, *, resume: bool = False) -> None:
+        self.path = path
+        self.journal_path = path.with_name(path.name + JOURNAL_SUFFIX)
+        self.done: set[str] = set()
+        end = journal_end = 0
+        if resume:
+            self.done, end, journal_end = self._replay()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._data = path.open("r+b" if resume and path.exists() else "wb")
+        self._data.truncate(end)
+        self._data.seek(end)
+        # New entries must follow the last replayed one, or the next resume stops short of them.
+        self._journal = self.journal_path.open("r+b" if resume and self.journal_path.exists() else "wb")
+        self._journal.truncate(journal_end)
+        self._journal.seek(journal_end)
+
+    def __enter__(self) -> CheckpointedNdjson:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, key: str, record: Any) -> None:
+        self._data.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        entry = {"key": key, "end": self._data.tell()}
+        self._journal.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._journal.flush()
+        self.done.add(key)
+
+    def close(self) -> None:
+        self._data.close()
+        self._journal.close()
+
+    def _replay(self) -> tuple[set[str], int, int]:
+        """Journaled keys, the data offset they end at, and the journal offset after the last one."""
+        if not self.journal_path.exists() or not self.path.exists():
+            return set(), 0, 0
+        size = self.path.stat().st_size
+        done: set[str] = set()
+        end = journal_end = 0
+        with self.journal_path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # torn final line
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if entry["end"] > size:
+                    break
+                done.add(entry["key"])
+                end = entry["end"]
+                journal_end += len(line)
+        return done, end, journal_end
+
+
+def read_ndjson(path: Path) -> Iterator[Any]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def ordered_records(
+    records: Iterable[dict[str, Any]], order: Optional[Iterable[str]] = None, *, key: str = "url"
+) -> list[dict[str, Any]]:
+    """Deduplicate ``records`` by ``key`` (last one wins) and sort them by ``order``.
+
+    Records whose key is not in ``order`` keep their file order after the rest.
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    for record in records:
+        latest.pop(record[key], None)
+        latest[record[key]] = record
+    if order is None:
+        return list(latest.values())
+    rank = {value: index for index, value in enumerate(order)}
+    return sorted(latest.values(), key=lambda record: rank.get(record[key], len(rank)))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+# Duel rules shared by fight.py's round-by-round FighterState and the batch engines.
+# One round is one second: both heroes attack, then both take damage, then supports regenerate.
+CRIT_CHANCE = 0.1  # for weapons that can headshot/crit
+CRIT_MULTIPLIER = 2
+ARMOR_DAMAGE_FACTOR = 0.70  # 30% mitigation while armor remains
+TANK_DAMAGE_FACTOR = 0.90  # tank passive mitigation once armor is gone
+DAMAGE_ROLE_FACTOR = 1.05  # +5% DPS passive
+SUPPORT_REGEN = 15.0  # HP per round for a support that took no damage that round
+MAX_ROUNDS_DEFAULT = 30
+
+# Outcome codes, from the point of view of hero A.
+A_WINS = 0
+B_WINS = 1
+DRAW = 2  # both heroes fall in the same round
+STALEMATE = 3  # both still standing after the last round
+OUTCOMES = ("a_wins", "b_wins", "draw", "stalemate")
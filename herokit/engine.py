@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar
+
+from herokit.extractors import DEFAULT_PARSER, EXTRACTORS, Extractor, parse_html, release_tree
+from herokit.fetch import Outcome
+from herokit.pagestore import content_hash
+from herokit.results import ResultCache
+
+T = TypeVar("T")
+
+
+@dataclass
+class PageExtraction:
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+    parse_seconds: float = 0.0
+    extractor_seconds: dict[str, float] = field(default_factory=dict)
+
+
+def select_extractors(names: Optional[Iterable[str]] = None) -> list[Extractor]:
+    if names is None:
+        return list(EXTRACTORS.values())
+    selected = []
+    for name in names:
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown extractor {name!r}; choose from {sorted(EXTRACTORS)}")
+        selected.append(EXTRACTORS[name])
+    return selected
+
+
+def extract_page(
+    html: str, extractors: Iterable[Extractor], *, parser: str = DEFAULT_PARSER
+) -> PageExtraction:
+    """Parse ``html`` once and run every extractor against the same tree.
+
+    A failing extractor is recorded in ``errors`` without stopping the others.
+    The time spent parsing and in each extractor is recorded as well. The tree
+    is released before returning, so only one page is held in memory at a time.
+    """
+    start = time.perf_counter()
+    soup = parse_html(html, parser)
+    result = PageExtraction(parse_seconds=time.perf_counter() - start)
+    try:
+        for extractor in extractors:
+            start = time.perf_counter()
+            try:
+                result.values[extractor.name] = extractor.func(soup)
+            except Exception as exc:
+                result.errors[extractor.name] = exc
+            result.extractor_seconds[extractor.name] = time.perf_counter() - start
+    finally:
+        release_tree(soup)
+    return result
+
+
+def extract_pages(
+    pages: Iterable[Outcome[T, str]],
+    extractors: Iterable[Extractor],
+    *,
+    parser: str = DEFAULT_PARSER,
+    jobs: int = 1,
+    results: Optional[ResultCache] = None,
+) -> Iterator[Outcome[T, PageExtraction]]:
+    """Run :func:`extract_page` over ``pages``, yielding outcomes in input order.
+
+    With ``jobs`` > 1 the parsing happens in a process pool. Pages are submitted
+    as they arrive and at most ``2 * jobs`` are in flight, so results stream back
+    while earlier stages (e.g. fetching) are still producing pages. Pages that
+    already failed are passed through untouched, and a page whose parse raises
+    comes back with ``error`` set, exactly as in serial mode.
+
+    With ``results``, extractors whose output for the same page content is
+    already stored are not run again; a page needing none of them is not parsed.
+    """
+    extractors = list(extractors)
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending: deque[_PendingPage[T]] = deque()
+    try:
+        for page in pages:
+            pending.append(_start(page, extractors, parser, pool, results))
+            while pending and (len(pending) > 2 * jobs or pending[0].future.done()):
+                yield pending.popleft().collect(results)
+        while pending:
+            yield pending.popleft().collect(results)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+@dataclass
+class _PendingPage(Generic[T]):
+    item: T
+    future: Future[PageExtraction]
+    extractors: list[Extractor] = field(default_factory=list)
+    digest: Optional[str] = None
+    reused: dict[str, Any] = field(default_factory=dict)
+
+    def collect(self, results: Optional[ResultCache]) -> Outcome[T, PageExtraction]:
+        try:
+            fresh = self.future.result()
+        except Exception as exc:
+            return Outcome(item=self.item, error=exc)
+
+        if results is not None and self.digest is not None:
+            for extractor in self.extractors:
+                if extractor.name in fresh.values:
+                    results.store(self.digest, extractor, fresh.values[extractor.name])
+        values = {
+            extractor.name: self.reused.get(extractor.name, fresh.values.get(extractor.name))
+            for extractor in self.extractors
+            if extractor.name in self.reused or extractor.name in fresh.values
+        }
+        extraction = PageExtraction(
+            values=values,
+            errors=fresh.errors,
+            parse_seconds=fresh.parse_seconds,
+            extractor_seconds=fresh.extractor_seconds,
+        )
+        return Outcome(item=self.item, value=extraction)
+
+
+def _start(
+    page: Outcome[T, str],
+    extractors: list[Extractor],
+    parser: str,
+    pool: Optional[ProcessPoolExecutor],
+    results: Optional[ResultCache],
+) -> _PendingPage[T]:
+    future: Future[PageExtraction] = Future()
+    if page.error is not None:
+        future.set_exception(page.error)
+        return _PendingPage(page.item, future)
+
+    digest = None
+    reused: dict[str, Any] = {}
+    if results is not None and isinstance(page.value, str):
+        digest = content_hash(page.value)
+        reused = results.lookup(digest, extractors)
+    todo = [extractor for extractor in extractors if extractor.name not in reused]
+
+    if not todo:
+        future.set_result(PageExtraction())
+    elif pool is not None:
+        future = pool.submit(extract_page, page.value, todo, parser=parser)
+    else:
+        try:
+            future.set_result(extract_page(page.value, todo, parser=parser))
+        except Exception as exc:
+            future.set_exception(exc)
+    return _PendingPage(page.item, future, extractors, digest, reused)
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse pages in this many worker processes; 0 uses every core (default: 1)",
+    )
+
+
+def add_stream_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Write each hero's output as soon as its page is extracted and only fetch a few pages "
+            "ahead, so memory stays flat however long the roster is."
+        ),
+    )
+
+
+def jobs_from_args(args: argparse.Namespace) -> int:
+    return args.jobs if args.jobs > 0 else os.cpu_count() or 1
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from herokit.duel import (
+    A_WINS,
+    ARMOR_DAMAGE_FACTOR,
+    B_WINS,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    DAMAGE_ROLE_FACTOR,
+    DRAW,
+    MAX_ROUNDS_DEFAULT,
+    STALEMATE,
+    SUPPORT_REGEN,
+    TANK_DAMAGE_FACTOR,
+)
+from herokit.models import HeroStats
+
+# Events at the same instant run in this order: a support's regen closes the second
+# before it, a finished reload refills the clip, then shots land.
+REGEN = 0
+RELOAD = 1
+SHOT = 2
+
+REGEN_INTERVAL_SECONDS = 1.0
+SUSTAINED_TICK_SECONDS = 0.1  # weapons with only a DPS figure deal it in ticks this long
+
+EventLog = Callable[[float, str], None]
+
+
+class EventFighter:
+    """One hero's state in an event-driven duel.
+
+    Each trigger pull is one SHOT event dealing ``damage_per_shot``, and the
+    next one is scheduled ``1 / shots_per_second`` later. When the clip runs
+    dry the reload starts after that shot's recovery and a RELOAD event refills
+    the clip ``reload_seconds`` later. A clip without a reload time is not
+    refilled, as in fight.py.
+    """
+
+    __slots__ = (
+        "hero",
+        "health",
+        "armor",
+        "max_health",
+        "interval",
+        "damage",
+        "clip",
+        "ammo",
+        "reload_seconds",
+        "critical",
+        "is_damage",
+        "is_tank",
+        "is_support",
+        "last_hit",
+        "shots",
+    )
+
+    def __init__(self, hero: HeroStats) -> None:
+        weapon = hero.weapon
+        role = hero.role.lower()
+        self.hero = hero
+        self.health = float(hero.health)
+        self.armor = float(hero.armor)
+        self.max_health = float(hero.health)
+        self.interval: Optional[float] = None
+        self.damage = 0.0
+        self.clip: Optional[int] = None
+        if weapon.shots_per_second > 0:
+            self.interval = 1.0 / weapon.shots_per_second
+            self.damage = weapon.damage_per_shot
+            self.clip = None if weapon.ammo is None else int(weapon.ammo)
+        elif weapon.dps > 0:
+            self.interval = SUSTAINED_TICK_SECONDS
+            self.damage = weapon.dps * SUSTAINED_TICK_SECONDS
+        self.ammo = self.clip
+        self.reload_seconds = weapon.reload_seconds or 0.0
+        self.critical = weapon.critical
+        self.is_damage = role == "damage"
+        self.is_tank = role == "tank"
+        self.is_support = role == "support"
+        self.last_hit = -math.inf
+        self.shots = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.health > 0
+
+    def can_fire(self) -> bool:
+        return self.interval is not None and self.ammo != 0
+
+    def fire(self, draw: Callable[[], float]) -> tuple[float, bool]:
+        """Damage of one shot, before the target's mitigation, and whether it crit."""
+        self.shots += 1
+        if self.ammo is not None:
+            self.ammo -= 1
+        damage = self.damage
+        crit = self.critical and draw() < CRIT_CHANCE
+        if crit:
+            damage *= CRIT_MULTIPLIER
+        if self.is_damage:
+            damage *= DAMAGE_ROLE_FACTOR
+        return damage, crit
+
+    def take(self, incoming: float, now: float) -> float:
+        """Apply a hit with fight.py's armor and tank mitigation; return the damage taken."""
+        if incoming <= 0:
+            return 0.0
+        effective = incoming
+        if self.armor > 0:
+            effective *= ARMOR_DAMAGE_FACTOR
+            absorbed = min(self.armor, effective)
+            self.armor -= absorbed
+            self.health -= effective - absorbed
+        else:
+            if self.is_tank:
+                effective *= TANK_DAMAGE_FACTOR
+            self.health -= effective
+        self.health = max(self.health, 0.0)
+        self.last_hit = now
+        return effective
+
+    def regenerate(self, now: float) -> float:
+        """Support passive: heal if nothing hit this hero during the second before ``now``."""
+        if not self.is_support or not self.alive or self.last_hit >= now - REGEN_INTERVAL_SECONDS:
+            return 0.0
+        heal = min(SUPPORT_REGEN, self.max_health - self.health)
+        if heal <= 0:
+            return 0.0
+        self.health += heal
+        return heal
+
+
+@dataclass(slots=True)
+class EventDuel:
+    outcome: int
+    seconds: float  # when the duel was decided, or the time limit for a stalemate
+    events: int
+    shots_a: int
+    shots_b: int
+
+
+def simulate_event_duel(
+    hero_a: HeroStats,
+    hero_b: HeroStats,
+    *,
+    max_seconds: float = MAX_ROUNDS_DEFAULT,
+    rng: Optional[random.Random] = None,
+    log: Optional[EventLog] = None,
+) -> EventDuel:
+    """Fight one duel in continuous time, jumping from event to event on a heap.
+
+    Both heroes fire their first shot at t=0. All events at the same instant
+    are applied before anyone is declared dead, so two heroes can still fall
+    together. Crits draw from ``rng``, or from the ``random`` module's global
+    generator if it is not given. ``log`` receives ``(seconds, description)``
+    for every event.
+    """
+    draw = rng.random if rng is not None else random.random
+    fighters = (EventFighter(hero_a), EventFighter(hero_b))
+    queue: list[tuple[float, int, int, int]] = []
+    sequence = 0
+
+    def schedule(at: float, kind: int, side: int) -> None:
+        nonlocal sequence
+        if at < max_seconds:
+            heapq.heappush(queue, (at, kind, sequence, side))
+            sequence += 1
+
+    for side, fighter in enumerate(fighters):
+        if fighter.can_fire():
+            schedule(0.0, SHOT, side)
+        if fighter.is_support:
+            schedule(REGEN_INTERVAL_SECONDS, REGEN, side)
+
+    events = 0
+    while queue:
+        now = queue[0][0]
+        # Everyone standing at the start of this instant gets to act in it.
+        standing = (fighters[0].alive, fighters[1].alive)
+        while queue and queue[0][0] == now:
+            _, kind, _, side = heapq.heappop(queue)
+            events += 1
+            fighter, target = fighters[side], fighters[1 - side]
+            if not standing[side]:
+                continue
+            if kind == SHOT:
+                raw, crit = fighter.fire(draw)
+                taken = target.take(raw, now)
+                if log:
+                    log(
+                        now,
+                        f"{fighter.hero.name} hits {target.hero.name} for {taken:.1f}{' (crit)' if crit else ''} "
+                        f"-> HP {target.health:.1f} / Armor {target.armor:.1f}",
+                    )
+                if fighter.ammo == 0 and fighter.reload_seconds > 0:
+                    schedule(now + fighter.interval + fighter.reload_seconds, RELOAD, side)
+                elif fighter.can_fire():
+                    schedule(now + fighter.interval, SHOT, side)
+            elif kind == RELOAD:
+                fighter.ammo = fighter.clip
+                if log:
+                    log(now, f"{fighter.hero.name} reloads")
+                schedule(now, SHOT, side)
+            else:
+                healed = fighter.regenerate(now)
+                if healed and log:
+                    log(now, f"{fighter.hero.name} regains {healed:.1f} HP from Support passive")
+                schedule(now + REGEN_INTERVAL_SECONDS, REGEN, side)
+
+        alive_a, alive_b = fighters[0].alive, fighters[1].alive
+        if not (alive_a and alive_b):
+            outcome = A_WINS if alive_a else B_WINS if alive_b else DRAW
+            return EventDuel(outcome, now, events, fighters[0].shots, fighters[1].shots)
+    return EventDuel(STALEMATE, float(max_seconds), events, fighters[0].shots, fighters[1].shots)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from herokit.duel import (
+    A_WINS,
+    ARMOR_DAMAGE_FACTOR,
+    B_WINS,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    DAMAGE_ROLE_FACTOR,
+    DRAW,
+    MAX_ROUNDS_DEFAULT,
+    OUTCOMES,
+    STALEMATE,
+    SUPPORT_REGEN,
+    TANK_DAMAGE_FACTOR,
+)
+from herokit.models import HeroStats
+
+# Health, armor and ammo are rounded to this many decimals so that states reached by
+# different crit orders (2x then 1x vs 1x then 2x) merge despite float rounding.
+STATE_DECIMALS = 6
+
+# (health, armor, ammo, reload_timer); ammo is None for weapons without a clip.
+FighterKey = tuple[float, float, Optional[float], float]
+
+
+def _quantize(value: float) -> float:
+    return round(value, STATE_DECIMALS) + 0.0  # + 0.0 folds -0.0 into 0.0
+
+
+class _ExactFighter:
+    """fight.py's FighterState rules as pure functions of a state key, with the crit roll as a branch."""
+
+    def __init__(self, hero: HeroStats) -> None:
+        weapon = hero.weapon
+        role = hero.role.lower()
+        self.weapon = weapon
+        self.start: FighterKey = (
+            float(hero.health),
+            float(hero.armor),
+            None if weapon.ammo is None else float(weapon.ammo),
+            0.0,
+        )
+        self.max_health = float(hero.health)
+        self.is_damage = role == "damage"
+        self.is_tank = role == "tank"
+        self.is_support = role == "support"
+        self.crit_odds = ((False, 1.0 - CRIT_CHANCE), (True, CRIT_CHANCE)) if weapon.critical else ((False, 1.0),)
+        self._attacks: dict[FighterKey, list[tuple[float, FighterKey, float]]] = {}
+
+    def attacks(self, key: FighterKey) -> list[tuple[float, FighterKey, float]]:
+        """``(probability, state after attacking, raw damage)`` for each crit outcome, memoized per state."""
+        branches = self._attacks.get(key)
+        if branches is None:
+            branches = self._attacks[key] = self._attack(key)
+        return branches
+
+    def _attack(self, key: FighterKey) -> list[tuple[float, FighterKey, float]]:
+        health, armor, ammo, reload_timer = key
+        weapon = self.weapon
+        if reload_timer > 0:
+            reload_timer = max(0.0, reload_timer - 1.0)
+            if reload_timer == 0 and weapon.ammo is not None:
+                ammo = float(weapon.ammo)
+            return [(1.0, (health, armor, ammo, reload_timer), 0.0)]
+
+        if weapon.shots_per_second <= 0 and weapon.dps > 0:
+            damage = weapon.dps
+        else:
+            shots = weapon.shots_per_second
+            if ammo is not None:
+                shots = min(ammo, weapon.shots_per_second)
+                ammo -= shots
+                if ammo <= 0 and (weapon.reload_seconds or 0.0) > 0:
+                    reload_timer = weapon.reload_seconds
+                    ammo = 0.0
+                ammo = _quantize(ammo)
+            damage = max(0.0, shots) * weapon.damage_per_shot
+
+        after = (health, armor, ammo, reload_timer)
+        branches = []
+        for crit, probability in self.crit_odds:
+            dealt = damage * CRIT_MULTIPLIER if crit else damage
+            if self.is_damage:
+                dealt *= DAMAGE_ROLE_FACTOR
+            branches.append((probability, after, dealt))
+        return branches
+
+    def take(self, key: FighterKey, incoming: float) -> FighterKey:
+        """Apply a round's incoming damage, then the support passive if nothing got through."""
+        health, armor, ammo, reload_timer = key
+        took_damage = False
+        if incoming > 0:
+            effective = incoming
+            if armor > 0:
+                effective *= ARMOR_DAMAGE_FACTOR
+                absorbed = min(armor, effective)
+                armor -= absorbed
+                health -= effective - absorbed
+            else:
+                if self.is_tank:
+                    effective *= TANK_DAMAGE_FACTOR
+                health -= effective
+            health = max(health, 0.0)
+            took_damage = effective > 0
+        if self.is_support and not took_damage and health > 0 and health < self.max_health:
+            health += min(SUPPORT_REGEN, self.max_health - health)
+        return (_quantize(health), _quantize(armor), ammo, reload_timer)
+
+
+@dataclass
+class ExactDuel:
+    """Exact outcome probabilities of a duel, ordered like :data:`herokit.duel.OUTCOMES`.
+
+    ``expected_rounds`` counts a stalemate as ``max_rounds``, like
+    :class:`herokit.montecarlo.DuelResults`. ``states`` is the number of
+    distinct (fighter A, fighter B) states the solver expanded.
+    """
+
+    probabilities: tuple[float, float, float, float]
+    expected_rounds: float
+    states: int
+
+    def rates(self) -> dict[str, float]:
+        return dict(zip(OUTCOMES, self.probabilities, strict=True))
+
+
+def solve_duel(hero_a: HeroStats, hero_b: HeroStats, *, max_rounds: int = MAX_ROUNDS_DEFAULT) -> ExactDuel:
+    """Win/draw/loss probabilities of fight.py's round engine, without sampling.
+
+    The duel is a Markov chain over both fighters' health, armor, ammo and
+    reload timer; the only randomness is each attack's crit roll, so every
+    round branches at most four ways. States reached by several crit orders
+    are merged and their transitions computed once.
+    """
+    fighter_a = _ExactFighter(hero_a)
+    fighter_b = _ExactFighter(hero_b)
+    steps: dict[tuple[FighterKey, FighterKey], list[tuple[float, FighterKey, FighterKey]]] = {}
+
+    def step(state: tuple[FighterKey, FighterKey]) -> list[tuple[float, FighterKey, FighterKey]]:
+        branches = steps.get(state)
+        if branches is None:
+            key_a, key_b = state
+            branches = steps[state] = [
+                (p_a * p_b, fighter_a.take(after_a, damage_b), fighter_b.take(after_b, damage_a))
+                for p_a, after_a, damage_a in fighter_a.attacks(key_a)
+                for p_b, after_b, damage_b in fighter_b.attacks(key_b)
+            ]
+        return branches
+
+    probabilities = [0.0] * len(OUTCOMES)
+    expected_rounds = 0.0
+    current: dict[tuple[FighterKey, FighterKey], float] = {(fighter_a.start, fighter_b.start): 1.0}
+    for round_number in range(1, max_rounds + 1):
+        following: dict[tuple[FighterKey, FighterKey], float] = defaultdict(float)
+        for state, probability in current.items():
+            for branch, key_a, key_b in step(state):
+                reached = probability * branch
+                alive_a, alive_b = key_a[0] > 0, key_b[0] > 0
+                if alive_a and alive_b:
+                    following[(key_a, key_b)] += reached
+                    continue
+                outcome = A_WINS if alive_a else B_WINS if alive_b else DRAW
+                probabilities[outcome] += reached
+                expected_rounds += reached * round_number
+        current = following
+        if not current:
+            break
+    stalemate = sum(current.values())
+    probabilities[STALEMATE] += stalemate
+    expected_rounds += stalemate * max_rounds
+    return ExactDuel(tuple(probabilities), expected_rounds, len(steps))  # type: ignore[arg-type]
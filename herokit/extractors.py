@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+
+from herokit.stats import normalize_weapon
+
+PARSER_BACKENDS = ("html.parser", "lxml", "scoped", "scoped-lxml")
+DEFAULT_PARSER = "html.parser"
+# Everything the extractors read sits inside the article body; the "scoped"
+# backends skip building the rest of the page.
+ARTICLE_BODY = SoupStrainer("div", class_=re.compile(r"(^|\s)mw-parser-output(\s|$)"))
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+TARGET_LABELS = {
+    "dmg. amplification": "damage_amplification",
+    "dmg. reduction": "damage_reduction",
+    "duration": "duration",
+}
+
+
+def parse_html(html: str, backend: str = DEFAULT_PARSER) -> BeautifulSoup:
+    """Parse a hero page with one of :data:`PARSER_BACKENDS`.
+
+    ``lxml`` and ``scoped-lxml`` need the optional lxml package. Every backend
+    yields the same extractor output on the cached pages (see
+    tests/test_parser_backends.py).
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}; choose from {list(PARSER_BACKENDS)}")
+    features = "lxml" if backend.endswith("lxml") else "html.parser"
+    parse_only = ARTICLE_BODY if backend.startswith("scoped") else None
+    try:
+        return BeautifulSoup(html, features, parse_only=parse_only)
+    except FeatureNotFound:
+        raise RuntimeError(
+            f"The {backend!r} parser backend needs the optional lxml package (pip install lxml)."
+        ) from None
+
+
+def release_tree(soup: BeautifulSoup) -> None:
+    """Tear down a parsed page so its memory is freed now rather than by the cyclic GC.
+
+    Elements point at their parents and siblings, so a dropped tree lingers until
+    a full collection runs. ``soup.decompose()`` alone does not help: the root
+    has no ``next_element``, so each top-level child is decomposed instead.
+    """
+    for child in list(soup.contents):
+        child.decompose()
+
+
+def add_parser_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER,
+        help=f"HTML parser backend for hero pages (default: {DEFAULT_PARSER})",
+    )
+
+
+def _as_soup(page: BeautifulSoup | str) -> BeautifulSoup:
+    return parse_html(page) if isinstance(page, str) else page
+
+
+# Health and armor (cmd-02)
+
+
+def extract_stats(page: BeautifulSoup | str) -> dict[str, Optional[float | int]]:
+    soup = _as_soup(page)
+    health = _extract_stat(soup, data_source="health", label_prefix="health")
+    armor = _extract_stat(soup, data_source="armor", label_prefix="armor")
+
+    if health is None:
+        raise RuntimeError("Could not locate a numeric health value on the page.")
+
+    return {"health": health, "armor": armor}
+
+
+def _extract_stat(
+    soup: BeautifulSoup, *, data_source: str, label_prefix: str
+) -> Optional[float | int]:
+    section = soup.find(attrs={"data-source": data_source})
+    if section is not None:
+        value = _first_number(section.get_text(" ", strip=True))
+        if value is not None:
+            return value
+
+    for label in soup.select(".pi-data-label"):
+        if label.get_text(strip=True).lower().startswith(label_prefix.lower()):
+            value_container = label.find_next(class_="pi-data-value")
+            if value_container:
+                value = _first_number(value_container.get_text(" ", strip=True))
+                if value is not None:
+                    return value
+
+    return None
+
+
+def _first_number(text: str) -> Optional[float | int]:
+    match = NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+    number = float(match.group(0))
+    return int(number) if number.is_integer() else number
+
+
+# Weapons (cmd-03)
+
+
+def extract_weapons(page: BeautifulSoup | str) -> list[dict[str, Any]]:
+    soup = _as_soup(page)
+    abilities_heading = _find_abilities_heading(soup)
+    if not abilities_heading:
+        return []
+
+    weapons: list[dict[str, Any]] = []
+    for node in _iter_ability_nodes(abilities_heading):
+        weapon = _parse_weapon_node(node)
+        if weapon:
+            weapon["stats"] = normalize_weapon(weapon)
+            weapons.append(weapon)
+    return weapons
+
+
+def _find_abilities_heading(soup: BeautifulSoup) -> Optional[Tag]:
+    heading_ids = [
+        "Abilities",
+        "Weapons_&_Abilities",
+        "Weapons_%26_Abilities",
+        "Weapons_and_Abilities",
+    ]
+    for heading_id in heading_ids:
+        span = soup.find("span", id=heading_id)
+        if span:
+            parent = span.find_parent("h2")
+            if parent:
+                return parent
+
+    for h2 in soup.find_all("h2"):
+        headline = h2.find(class_="mw-headline")
+        if headline and "abilities" in headline.get_text(strip=True).lower():
+            return h2
+    return None
+
+
+def _iter_ability_nodes(heading: Tag):
+    for sibling in heading.find_next_siblings():
+        if getattr(sibling, "name", None) == "h2":
+            break
+        if isinstance(sibling, Tag) and "ability-details" in sibling.get("class", []):
+            yield sibling
+
+
+def _parse_weapon_node(node: Tag) -> Optional[dict[str, Any]]:
+    header = node.select_one(".ability-box .header")
+    if not header:
+        return None
+    ability_name = header.get_text(strip=True)
+
+    type_blocks = _extract_type_blocks(node)
+    ability_type = (type_blocks.get("type") or "").strip().lower()
+    if not ability_type.startswith("weapon"):
+        return None
+
+    stats = _extract_stats(node)
+    effect_type = type_blocks.get("effect type")
+    blocked_by = _extract_blocked_by(node)
+    additional_details = _extract_additional_details(node)
+    keywords = _extract_keywords(node)
+    damage = _extract_damage(stats)
+
+    def stat_value(key: str) -> Optional[str]:
+        data = stats.get(key)
+        return data["text"] if data else None
+
+    spread_parts = stats.get("spread", {}).get("parts") if stats.get("spread") else []
+
+    return {
+        "name": ability_name,
+        "effect_type": effect_type,
+        "blocked_by": blocked_by,
+        "damage": damage,
+        "falloff_range": stat_value("falloff_range"),
+        "headshot": stat_value("headshot"),
+        "rate_of_fire": stat_value("rate_of_fire"),
+        "shots_per_volley": stat_value("shots_per_volley"),
+        "ammo_comsumption": stat_value("ammo_consumption"),
+        "ammo": stat_value("ammo"),
+        "reload_time": stat_value("reload_time"),
+        "projectile_speed": stat_value("projectile_speed"),
+        "projectile_radious": stat_value("projectile_radius"),
+        "spread": spread_parts,
+        "additional_details": additional_details,
+        "keywords": keywords,
+    }
+
+
+def _extract_type_blocks(node: Tag) -> dict[str, str]:
+    blocks: dict[str, str] = {}
+    for block in node.select(".type-section .type-block"):
+        header = block.select_one(".type-header")
+        if not header:
+            continue
+        label = header.get_text(" ", strip=True).lower()
+        text = block.get_text(" ", strip=True)
+        value = text.replace(header.get_text(" ", strip=True), "", 1).strip()
+        blocks[label] = value or None
+    return blocks
+
+
+def _extract_stats(node: Tag) -> dict[str, dict[str, Any]]:
+    stats: dict[str, dict[str, Any]] = {}
+    for row in node.select(".stats .data-row"):
+        header_el = row.select_one(".data-row-header")
+        value_el = row.select_one(".data-row-value")
+        if not header_el or not value_el:
+            continue
+        label = header_el.get_text(" ", strip=True)
+        key = _normalize_key(label)
+        key = _dedupe_key(key, stats)
+        parts = [part.strip() for part in value_el.stripped_strings if part.strip()]
+        text = " ".join(parts)
+        stats[key] = {"label": label, "text": text or None, "parts": parts}
+    return stats
+
+
+def _normalize_key(label: str) -> str:
+    key = label.strip().lower()
+    key = key.replace("%", "percent")
+    key = re.sub(r"[^a-z0-9]+", "_", key)
+    key = re.sub(r"_+", "_", key).strip("_")
+    return key
+
+
+def _dedupe_key(key: str, stats: dict[str, Any]) -> str:
+    if key not in stats:
+        return key
+    index = 2
+    while f"{key}_{index}" in stats:
+        index += 1
+    return f"{key}_{index}"
+
+
+def _extract_blocked_by(node: Tag) -> list[str]:
+    panel = node.select_one(".interaction-panel")
+    blocked: list[str] = []
+    if not panel:
+        return blocked
+    for span in panel.select(".image-border span[title]"):
+        title = span.get("title", "").strip()
+        lowered = title.lower()
+        if lowered.startswith("blocked by"):
+            entry = title.split("Blocked by", 1)[1].strip(" .")
+            if entry:
+                blocked.append(entry)
+    return blocked
+
+
+def _extract_additional_details(node: Tag) -> list[str]:
+    details: list[str] = []
+    for item in node.select(".ability-notes ul li"):
+        text = item.get_text(" ", strip=True)
+        if text and text not in details:
+            details.append(text)
+    return details
+
+
+def _extract_keywords(node: Tag) -> list[str]:
+    keywords: list[str] = []
+    for kw in node.select(".keyword .keyword-title"):
+        text = kw.get_text(" ", strip=True)
+        if text and text not in keywords:
+            keywords.append(text)
+    return keywords
+
+
+def _extract_damage(stats: dict[str, dict[str, Any]]) -> dict[str, Optional[str]]:
+    damage: dict[str, Optional[str]] = {}
+    for key, data in stats.items():
+        label = data["label"].lower()
+        if "damage" in label or "dmg" in label:
+            damage[key] = data["text"]
+    return damage
+
+
+# Damage amplification / reduction abilities (cmd-04)
+
+
+def section_title(node) -> str:
+    current = node
+    while current:
+        current = current.previous_sibling
+        if current is None:
+            break
+        name = getattr(current, "name", None)
+        if name and name.lower().startswith("h"):
+            return current.get_text(strip=True)
+    return ""
+
+
+def read_ability_rows(page: BeautifulSoup | str) -> Iterable[Dict[str, str]]:
+    soup = _as_soup(page)
+    for ability in soup.select(".ability-details"):
+        header = ability.select_one(".ability-box .header")
+        if not header:
+            continue
+        if section_title(ability).strip().lower() != "abilities":
+            continue
+        name = header.find(string=True, recursive=False)
+        if name:
+            ability_name = name.strip()
+        else:
+            ability_name = header.get_text(" ", strip=True)
+        ability_name = " ".join(ability_name.split())
+        if not ability_name:
+            continue
+
+        stats: Dict[str, str] = {}
+        for row in ability.select(".data-row"):
+            label_el = row.select_one(".data-row-header")
+            value_el = row.select_one(".data-row-value")
+            if not label_el or not value_el:
+                continue
+            label = " ".join(label_el.get_text(" ", strip=True).split())
+            label = label.rstrip(":").strip().lower()
+            key = TARGET_LABELS.get(label)
+            if not key:
+                continue
+            value = " ".join(value_el.get_text(" ", strip=True).split())
+            stats[key] = value
+
+        has_amp = bool(stats.get("damage_amplification"))
+        has_red = bool(stats.get("damage_reduction"))
+        if not (has_amp or has_red):
+            continue
+
+        if stats:
+            yield {
+                "ability_name": ability_name,
+                **stats,
+            }
+
+
+def extract_ability_effects(page: BeautifulSoup | str) -> list[Dict[str, str]]:
+    return list(read_ability_rows(page))
+
+
+# Shields (cmd-05)
+
+
+def extract_shields(page: BeautifulSoup | str) -> Optional[float | int]:
+    soup = _as_soup(page)
+    for key in ("shield", "shields"):
+        section = soup.find(attrs={"data-source": key})
+        if section:
+            value = _first_number(section.get_text(" ", strip=True))
+            if value is not None:
+                return value
+
+    for label in soup.select(".pi-data-label"):
+        text = label.get_text(" ", strip=True).lower()
+        if not text.startswith("shield"):
+            continue
+        value_container = label.find_next(class_="pi-data-value")
+        if value_container:
+            value = _first_number(value_container.get_text(" ", strip=True))
+            if value is not None:
+                return value
+    return None
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """A named extraction over a parsed hero page.
+
+    ``version`` must be bumped whenever the output of ``func`` changes for the
+    same page.
+    """
+
+    name: str
+    version: int
+    func: Callable[[BeautifulSoup], Any]
+
+
+EXTRACTORS: dict[str, Extractor] = {
+    extractor.name: extractor
+    for extractor in (
+        Extractor("health", 1, extract_stats),
+        Extractor("weapons", 2, extract_weapons),
+        Extractor("ability_effects", 1, extract_ability_effects),
+        Extractor("shields", 1, extract_shields),
+    )
+}
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from herokit.metrics import Metrics
+
+REQUEST_TIMEOUT = 30
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 CodexBot/1.0"
+)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE_LIMIT = 10.0
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class Outcome(Generic[T, R]):
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host to at most ``per_second`` per second."""
+
+    def __init__(self, per_second: Optional[float]) -> None:
+        self._interval = 1.0 / per_second if per_second and per_second > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if not self._interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PageFetcher:
+    """Keep-alive HTTP session plus a bounded worker pool for fetching many pages.
+
+    Results from :meth:`map` come back in input order regardless of which request
+    finishes first, so callers can write deterministic output.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+        timeout: float = REQUEST_TIMEOUT,
+        user_agent: str = USER_AGENT,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.metrics = metrics
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(rate_limit)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> PageFetcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get(self, url: str, *, headers: Optional[dict[str, str]] = None) -> requests.Response:
+        self.limiter.wait(url)
+        if self.metrics is None:
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            self.metrics.record_fetch(url, time.perf_counter() - start, 0, None)
+            raise
+        self.metrics.record_fetch(url, time.perf_counter() - start, len(response.content), response.status_code)
+        return response
+
+    def fetch_text(self, url: str) -> str:
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def map(
+        self, func: Callable[[T], R], items: Iterable[T], *, window: Optional[int] = None
+    ) -> Iterator[Outcome[T, R]]:
+        """Run ``func`` over ``items`` on the worker pool, yielding outcomes in input order.
+
+        By default every item is submitted up front. With ``window`` at most that
+        many results are in flight or waiting to be consumed, which bounds the
+        memory held by fetched pages when the consumer is slower than the network.
+        """
+        if self.concurrency == 1:
+            for item in items:
+                yield _call(func, item)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            if window is None:
+                futures = [pool.submit(_call, func, item) for item in items]
+                for future in futures:
+                    yield future.result()
+                return
+            pending: deque[Future[Outcome[T, R]]] = deque()
+            for item in items:
+                pending.append(pool.submit(_call, func, item))
+                if len(pending) >= max(1, window):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _call(func: Callable[[T], R], item: T) -> Outcome[T, R]:
+    try:
+        return Outcome(item=item, value=func(item))
+    except Exception as exc:
+        return Outcome(item=item, error=exc)
+
+
+def add_fetch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum number of pages fetched at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help=(
+            "Maximum requests per second to a single host; 0 disables the limit "
+            f"(default: {DEFAULT_RATE_LIMIT:g})"
+        ),
+    )
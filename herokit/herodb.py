@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from herokit.models import AbilityEffect, HeroStats
+from herokit.outputs import ability_rows
+from herokit.stats import primary_weapon, weapon_stats
+
+# Each entry upgrades the schema by one version; PRAGMA user_version records how many have run.
+# Stages may open a new database concurrently, so migrations must be safe to run twice.
+MIGRATIONS = (
+    """
+    CREATE TABLE IF NOT EXISTS heroes (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        role TEXT NOT NULL,
+        url TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS heroes_role ON heroes (role);
+
+    CREATE TABLE IF NOT EXISTS pools (
+        hero_id INTEGER PRIMARY KEY REFERENCES heroes (id) ON DELETE CASCADE,
+        health REAL,
+        armor REAL,
+        shields REAL
+    );
+
+    CREATE TABLE IF NOT EXISTS weapons (
+        id INTEGER PRIMARY KEY,
+        hero_id INTEGER NOT NULL REFERENCES heroes (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        name TEXT,
+        effect_type TEXT,
+        is_primary INTEGER NOT NULL,
+        damage_per_projectile REAL,
+        projectiles_per_shot REAL,
+        shots_per_second REAL NOT NULL,
+        dps REAL NOT NULL,
+        ammo REAL,
+        reload_seconds REAL,
+        critical INTEGER NOT NULL,
+        record TEXT NOT NULL,
+        UNIQUE (hero_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS weapons_primary ON weapons (hero_id, is_primary);
+
+    CREATE TABLE IF NOT EXISTS ability_effects (
+        id INTEGER PRIMARY KEY,
+        hero_id INTEGER NOT NULL REFERENCES heroes (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        ability_name TEXT NOT NULL,
+        damage_amplification TEXT,
+        damage_reduction TEXT,
+        duration TEXT,
+        UNIQUE (hero_id, position)
+    );
+    """,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+HERO_ROWS_QUERY = """
+    SELECT heroes.role, heroes.name, heroes.url,
+           pools.health, pools.armor, pools.shields,
+           weapons.name AS weapon_name, weapons.effect_type, weapons.damage_per_projectile, weapons.projectiles_per_shot,
+           weapons.shots_per_second, weapons.dps, weapons.ammo, weapons.reload_seconds,
+           weapons.critical, weapons.record AS weapon_record
+    FROM heroes
+    JOIN pools ON pools.hero_id = heroes.id
+    JOIN weapons ON weapons.hero_id = heroes.id AND weapons.is_primary = 1
+    WHERE pools.health IS NOT NULL
+"""
+
+
+class HeroStore:
+    """SQLite copy of the extracted hero data, written by the cmd-* stages.
+
+    Heroes are keyed by name; every ``save_*`` call creates the hero on first
+    sight, so stages can run in any order. Each ``save_*`` and
+    :meth:`remove_hero` call commits on its own, so a writer holds the lock only
+    briefly and stages can run concurrently against one database (WAL mode
+    keeps readers unblocked, and writers wait on each other's locks).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+
+    def __enter__(self) -> HeroStore:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.connection.commit()
+        self.connection.close()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    @property
+    def schema_version(self) -> int:
+        return self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def hero_id(self, role: str, name: str, url: str) -> int:
+        row = self.connection.execute(
+            """
+            INSERT INTO heroes (name, role, url) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET role = excluded.role, url = excluded.url
+            RETURNING id
+            """,
+            (name, role, url),
+        ).fetchone()
+        return row[0]
+
+    def remove_hero(self, name: str) -> None:
+        """Delete a hero that left the roster, with its pool, weapons and ability effects."""
+        with self.connection:
+            self.connection.execute("DELETE FROM heroes WHERE name = ?", (name,))
+
+    def save_health(self, role: str, name: str, url: str, *, health: Optional[float], armor: Optional[float]) -> None:
+        with self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO pools (hero_id, health, armor) VALUES (?, ?, ?)
+                ON CONFLICT (hero_id) DO UPDATE SET health = excluded.health, armor = excluded.armor
+                """,
+                (self.hero_id(role, name, url), health, armor),
+            )
+
+    def save_shields(self, role: str, name: str, url: str, shields: Optional[float]) -> None:
+        with self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO pools (hero_id, shields) VALUES (?, ?)
+                ON CONFLICT (hero_id) DO UPDATE SET shields = excluded.shields
+                """,
+                (self.hero_id(role, name, url), shields),
+            )
+
+    def save_weapons(self, role: str, name: str, url: str, weapons: list[dict[str, Any]]) -> None:
+        with self.connection:
+            hero_id = self.hero_id(role, name, url)
+            primary = primary_weapon(weapons)
+            self.connection.execute("DELETE FROM weapons WHERE hero_id = ?", (hero_id,))
+            self.connection.executemany(
+                """
+                INSERT INTO weapons (
+                    hero_id, position, name, effect_type, is_primary, damage_per_projectile,
+                    projectiles_per_shot, shots_per_second, dps, ammo, reload_seconds, critical, record
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        hero_id,
+                        position,
+                        weapon.get("name"),
+                        weapon.get("effect_type"),
+                        weapon is primary,
+                        stats["damage_per_projectile"],
+                        stats["projectiles_per_shot"],
+                        stats["shots_per_second"],
+                        stats["dps"],
+                        stats["ammo"],
+                        stats["reload_seconds"],
+                        stats["critical"],
+                        json.dumps(weapon, ensure_ascii=False),
+                    )
+                    for position, weapon in enumerate(weapons)
+                    for stats in (weapon_stats(weapon),)
+                ],
+            )
+
+    def save_ability_effects(self, role: str, name: str, url: str, effects: Iterable[AbilityEffect]) -> None:
+        with self.connection:
+            hero_id = self.hero_id(role, name, url)
+            self.connection.execute("DELETE FROM ability_effects WHERE hero_id = ?", (hero_id,))
+            self.connection.executemany(
+                """
+                INSERT INTO ability_effects (
+                    hero_id, position, ability_name, damage_amplification, damage_reduction, duration
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        hero_id,
+                        position,
+                        effect.ability_name,
+                        effect.damage_amplification,
+                        effect.damage_reduction,
+                        effect.duration,
+                    )
+                    for position, effect in enumerate(effects)
+                ],
+            )
+
+    def save_extracted(self, role: str, name: str, url: str, values: dict[str, Any]) -> None:
+        """Save whichever :data:`herokit.extractors.EXTRACTORS` results ``values`` holds."""
+        if "health" in values:
+            self.save_health(role, name, url, health=values["health"]["health"], armor=values["health"]["armor"])
+        if "weapons" in values:
+            self.save_weapons(role, name, url, values["weapons"])
+        if "ability_effects" in values:
+            self.save_ability_effects(role, name, url, ability_rows(name, values["ability_effects"]))
+        if "shields" in values:
+            self.save_shields(role, name, url, values["shields"])
+
+    def hero_rows(self, *, role: Optional[str] = None, names: Optional[Iterable[str]] = None) -> list[sqlite3.Row]:
+        """Heroes with a health pool and a weapon, joined with their primary weapon, in insertion order."""
+        query = HERO_ROWS_QUERY
+        params: list[Any] = []
+        if role is not None:
+            query += " AND heroes.role = ?"
+            params.append(role)
+        if names is not None:
+            names = list(names)
+            query += f" AND heroes.name IN ({', '.join('?' for _ in names)})"
+            params.extend(names)
+        return self.connection.execute(query + " ORDER BY heroes.id", params).fetchall()
+
+    def heroes(self, *, role: Optional[str] = None, names: Optional[Iterable[str]] = None) -> list[HeroStats]:
+        return [HeroStats.from_row(row) for row in self.hero_rows(role=role, names=names)]
+
+    def ability_effects(self, name: str) -> list[AbilityEffect]:
+        rows = self.connection.execute(
+            """
+            SELECT heroes.name AS hero_name, ability_name, damage_amplification, damage_reduction, duration
+            FROM ability_effects JOIN heroes ON heroes.id = ability_effects.hero_id
+            WHERE heroes.name = ? ORDER BY position
+            """,
+            (name,),
+        )
+        return [AbilityEffect(**row) for row in rows]
+
+    def _migrate(self) -> None:
+        version = self.schema_version
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.path} has schema version {version}, newer than this code supports ({SCHEMA_VERSION})"
+            )
+        for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            self.connection.executescript(f"BEGIN IMMEDIATE; {script}; PRAGMA user_version = {number}; COMMIT;")
+
+
+def add_db_argument(
+    parser: argparse.ArgumentParser, *, help_text: str = "Also write the results to this SQLite hero store."
+) -> None:
+    parser.add_argument("--db", type=Path, default=None, help=help_text)
+
+
+def store_from_args(args: argparse.Namespace) -> Optional[HeroStore]:
+    if args.db is None:
+        return None
+    return HeroStore(args.db)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from herokit.duel import A_WINS, B_WINS, DRAW, MAX_ROUNDS_DEFAULT, OUTCOMES, STALEMATE
+from herokit.models import HeroStats
+from herokit.montecarlo import np, require_numpy, simulate_duels
+
+MATRIX_DUELS_DEFAULT = 1000
+BATCH_DUELS = 250_000  # duels per simulate_duels call, which bounds worker memory
+MATRIX_FIELDS = [
+    "hero_a",
+    "role_a",
+    "hero_b",
+    "role_b",
+    "duels",
+    "wins",
+    "draws",
+    "losses",
+    "stalemates",
+    "win_rate",
+    "draw_rate",
+    "loss_rate",
+    "mean_ttk_seconds",
+]
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class MatchupMatrix:
+    """Round-robin results: ``counts[a, b]`` holds hero a's duels against hero b.
+
+    The last axis follows :data:`herokit.duel.OUTCOMES`. ``mean_ttk[a, b]`` is
+    the mean number of rounds (seconds) until someone fell, over the duels that
+    did not stalemate; NaN when every duel stalemated.
+    """
+
+    heroes: list[HeroStats]
+    duels: int
+    max_rounds: int
+    seed: Optional[int]
+    counts: Any
+    mean_ttk: Any
+
+    def rate(self, outcome: int) -> Any:
+        return self.counts[:, :, outcome] / self.duels
+
+    def rows(self) -> list[dict[str, Any]]:
+        rows = []
+        for a, hero_a in enumerate(self.heroes):
+            for b, hero_b in enumerate(self.heroes):
+                counts = self.counts[a, b]
+                ttk = self.mean_ttk[a, b]
+                rows.append(
+                    {
+                        "hero_a": hero_a.name,
+                        "role_a": hero_a.role,
+                        "hero_b": hero_b.name,
+                        "role_b": hero_b.role,
+                        "duels": self.duels,
+                        "wins": int(counts[A_WINS]),
+                        "draws": int(counts[DRAW]),
+                        "losses": int(counts[B_WINS]),
+                        "stalemates": int(counts[STALEMATE]),
+                        "win_rate": round(counts[A_WINS] / self.duels, 6),
+                        "draw_rate": round(counts[DRAW] / self.duels, 6),
+                        "loss_rate": round(counts[B_WINS] / self.duels, 6),
+                        "mean_ttk_seconds": "" if np.isnan(ttk) else round(float(ttk), 4),
+                    }
+                )
+        return rows
+
+    def to_json(self) -> dict[str, Any]:
+        def matrix(values: Any) -> list[list[Optional[float]]]:
+            return [[None if np.isnan(value) else round(float(value), 6) for value in row] for row in values]
+
+        return {
+            "heroes": [{"name": hero.name, "role": hero.role} for hero in self.heroes],
+            "duels": self.duels,
+            "max_rounds": self.max_rounds,
+            "seed": self.seed,
+            "outcomes": list(OUTCOMES),
+            "win_rate": matrix(self.rate(A_WINS)),
+            "draw_rate": matrix(self.rate(DRAW)),
+            "loss_rate": matrix(self.rate(B_WINS)),
+            "stalemate_rate": matrix(self.rate(STALEMATE)),
+            "mean_ttk_seconds": matrix(self.mean_ttk),
+        }
+
+
+def matchup_row(heroes: Sequence[HeroStats], a: int, duels: int, max_rounds: int, seed: Any) -> tuple[Any, Any]:
+    """Outcome counts and summed kill times of hero ``a`` against every hero, ``duels`` times each."""
+    rng = np.random.default_rng(seed)
+    size = len(heroes)
+    counts = np.zeros(size * len(OUTCOMES), dtype=np.int64)
+    ttk_sum = np.zeros(size)
+    per_batch = max(1, BATCH_DUELS // size)
+    remaining = duels
+    while remaining:
+        repeats = min(per_batch, remaining)
+        opponents = np.tile(np.arange(size), repeats)
+        results = simulate_duels(heroes, np.full_like(opponents, a), opponents, max_rounds=max_rounds, rng=rng)
+        counts += np.bincount(opponents * len(OUTCOMES) + results.outcome, minlength=len(counts))
+        decided = results.outcome != STALEMATE
+        ttk_sum += np.bincount(opponents[decided], weights=results.rounds[decided], minlength=size)
+        remaining -= repeats
+    return counts.reshape(size, len(OUTCOMES)), ttk_sum
+
+
+_worker_heroes: list[HeroStats] = []
+
+
+def _init_worker(heroes: list[HeroStats]) -> None:
+    global _worker_heroes
+    _worker_heroes = heroes
+
+
+def _worker_row(a: int, duels: int, max_rounds: int, seed: Any) -> tuple[int, Any, Any]:
+    return (a, *matchup_row(_worker_heroes, a, duels, max_rounds, seed))
+
+
+def run_matrix(
+    heroes: Sequence[HeroStats],
+    *,
+    duels: int = MATRIX_DUELS_DEFAULT,
+    max_rounds: int = MAX_ROUNDS_DEFAULT,
+    seed: Optional[int] = None,
+    jobs: int = 1,
+    progress: Optional[ProgressCallback] = None,
+) -> MatchupMatrix:
+    """Fight every ordered pair of ``heroes`` (mirror matches included) ``duels`` times.
+
+    Each hero's row is one task for the process pool and draws from its own
+    child of ``seed``, so a seeded matrix is the same for any ``jobs``.
+    """
+    require_numpy()
+    heroes = list(heroes)
+    size = len(heroes)
+    seeds = np.random.SeedSequence(seed).spawn(size)
+    counts = np.zeros((size, size, len(OUTCOMES)), dtype=np.int64)
+    ttk_sum = np.zeros((size, size))
+    done = 0
+
+    def record(a: int, row_counts: Any, row_ttk: Any) -> None:
+        nonlocal done
+        counts[a] = row_counts
+        ttk_sum[a] = row_ttk
+        done += 1
+        if progress:
+            progress(done, size)
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(heroes,)) as pool:
+            futures = [pool.submit(_worker_row, a, duels, max_rounds, seeds[a]) for a in range(size)]
+            for future in as_completed(futures):
+                record(*future.result())
+    else:
+        for a in range(size):
+            record(a, *matchup_row(heroes, a, duels, max_rounds, seeds[a]))
+
+    decided = duels - counts[:, :, STALEMATE]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_ttk = np.where(decided > 0, ttk_sum / decided, np.nan)
+    return MatchupMatrix(heroes, duels, max_rounds, seed, counts, mean_ttk)
+
+
+class ProgressPrinter:
+    """Prints ``done/total`` with elapsed time and an estimate of the time left to stderr."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.started = time.perf_counter()
+
+    def __call__(self, done: int, total: int) -> None:
+        elapsed = time.perf_counter() - self.started
+        left = elapsed / done * (total - done)
+        print(
+            f"{self.label}: {done}/{total} ({done / total:.0%}), {elapsed:.1f}s elapsed, ~{left:.1f}s left",
+            file=sys.stderr,
+        )
+
+
+def write_matrix_csv(matrix: MatchupMatrix, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=MATRIX_FIELDS)
+        writer.writeheader()
+        writer.writerows(matrix.rows())
+
+
+def write_matrix_json(matrix: MatchupMatrix, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(matrix.to_json(), handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Optional
+
+SUMMARY_ROWS = 10
+
+
+@dataclass
+class FetchMetric:
+    url: str
+    seconds: float
+    bytes: int
+    status: Optional[int]
+
+
+@dataclass
+class PageMetric:
+    page: str
+    parse_seconds: float
+    extractor_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        return self.parse_seconds + sum(self.extractor_seconds.values())
+
+
+class Metrics:
+    """Timings collected by one cmd-* run for ``--metrics-out``.
+
+    Fetches are recorded by :class:`herokit.fetch.PageFetcher`, page parse and
+    extractor times come from :class:`herokit.engine.PageExtraction`, and
+    ``counters`` holds snapshots such as the page cache's hit/miss counts.
+    Safe to use from the fetcher's worker threads.
+    """
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.fetches: list[FetchMetric] = []
+        self.pages: list[PageMetric] = []
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record_fetch(self, url: str, seconds: float, size: int, status: Optional[int]) -> None:
+        with self._lock:
+            self.fetches.append(FetchMetric(url, seconds, size, status))
+
+    def record_page(self, page: str, parse_seconds: float, extractor_seconds: dict[str, float]) -> None:
+        """Record one parsed page; pages served entirely from the result cache are skipped."""
+        if not parse_seconds and not extractor_seconds:
+            return
+        with self._lock:
+            self.pages.append(PageMetric(page, parse_seconds, dict(extractor_seconds)))
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def add_counters(self, name: str, counters: Any) -> None:
+        """Record a stats dataclass (e.g. :class:`herokit.cache.CacheStats`) under ``name``."""
+        self.counters[name] = asdict(counters)
+
+    def extractor_totals(self) -> dict[str, dict[str, float]]:
+        totals: dict[str, dict[str, float]] = {}
+        for page in self.pages:
+            for name, seconds in page.extractor_seconds.items():
+                total = totals.setdefault(name, {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+                total["calls"] += 1
+                total["total_seconds"] += seconds
+                total["max_seconds"] = max(total["max_seconds"], seconds)
+        return totals
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "started_at": self.started_at,
+            "seconds": time.perf_counter() - self._started,
+            "phases": self.phases,
+            "counters": self.counters,
+            "fetch": {
+                "count": len(self.fetches),
+                "total_seconds": sum(fetch.seconds for fetch in self.fetches),
+                "total_bytes": sum(fetch.bytes for fetch in self.fetches),
+            },
+            "parse": {
+                "count": len(self.pages),
+                "total_seconds": sum(page.parse_seconds for page in self.pages),
+            },
+            "extractors": self.extractor_totals(),
+            "fetches": [asdict(fetch) for fetch in self.fetches],
+            "pages": [asdict(page) for page in self.pages],
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
+            handle.write("\n")
+
+    def finish(self, path: Path) -> None:
+        """Write the JSON report to ``path`` and print the summary table to stderr."""
+        self.write(path)
+        print(self.summary_table(), file=sys.stderr)
+        print(f"Metrics written to {path}", file=sys.stderr)
+
+    def summary_table(self, rows: int = SUMMARY_ROWS) -> str:
+        lines = [f"{self.stage}: {time.perf_counter() - self._started:.2f}s"]
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name:<24} {seconds:8.3f}s")
+        for name, counters in self.counters.items():
+            lines.append(f"  {name}: " + ", ".join(f"{key}={value}" for key, value in counters.items()))
+        if self.fetches:
+            lines.append(f"Slowest fetches ({len(self.fetches)} total):")
+            lines.append(f"  {'seconds':>8} {'bytes':>9} {'status':>6}  url")
+            for fetch in sorted(self.fetches, key=lambda fetch: fetch.seconds, reverse=True)[:rows]:
+                status = "-" if fetch.status is None else str(fetch.status)
+                lines.append(f"  {fetch.seconds:8.3f} {fetch.bytes:9d} {status:>6}  {fetch.url}")
+        if self.pages:
+            lines.append(f"Slowest pages, parse + extractors ({len(self.pages)} total):")
+            lines.append(f"  {'seconds':>8} {'parse':>8}  page")
+            for page in sorted(self.pages, key=lambda page: page.seconds, reverse=True)[:rows]:
+                lines.append(f"  {page.seconds:8.3f} {page.parse_seconds:8.3f}  {page.page}")
+        totals = self.extractor_totals()
+        if totals:
+            lines.append("Extractors:")
+            lines.append(f"  {'total s':>8} {'max s':>8} {'calls':>6}  name")
+            ranked = sorted(totals.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+            for name, total in ranked[:rows]:
+                lines.append(
+                    f"  {total['total_seconds']:8.3f} {total['max_seconds']:8.3f} {total['calls']:6d}  {name}"
+                )
+        return "\n".join(lines)
+
+
+def timed_phase(metrics: Optional[Metrics], name: str) -> ContextManager[None]:
+    """``metrics.phase(name)``, or a no-op when metrics are off."""
+    return metrics.phase(name) if metrics else contextlib.nullcontext()
+
+
+def add_metrics_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        default=None,
+        help="Write fetch, cache and parse timings to this JSON file and print the slowest pages.",
+    )
+
+
+def metrics_from_args(args: argparse.Namespace, stage: str) -> Optional[Metrics]:
+    if args.metrics_out is None:
+        return None
+    return Metrics(stage)
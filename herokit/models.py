@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from herokit.stats import primary_weapon, weapon_stats
+
+# Slotted records shared by the cmd-* scripts, the hero store, the snapshot and fight.py.
+# Simulations keep thousands of these alive, so they carry no per-instance __dict__.
+
+
+@dataclass(slots=True)
+class Hero:
+    role: str
+    name: str
+    url: str
+
+
+@dataclass(slots=True)
+class HealthPool:
+    role: str
+    name: str
+    health: Optional[float] = None
+    armor: Optional[float] = None
+    shields: Optional[float] = None
+
+
+@dataclass(slots=True)
+class Weapon:
+    """The numbers :func:`herokit.stats.normalize_weapon` derives for one weapon."""
+
+    name: str
+    effect_type: str
+    damage_per_projectile: Optional[float]
+    projectiles_per_shot: Optional[float]
+    shots_per_second: float
+    dps: float
+    ammo: Optional[float]
+    reload_seconds: Optional[float]
+    critical: bool
+
+    @classmethod
+    def from_record(cls, weapon: dict[str, Any]) -> Weapon:
+        """Build from a hero-weapons.json weapon entry."""
+        stats = weapon_stats(weapon)
+        return cls(
+            name=weapon.get("name") or "Unknown Weapon",
+            effect_type=weapon.get("effect_type") or "",
+            damage_per_projectile=stats["damage_per_projectile"],
+            projectiles_per_shot=stats["projectiles_per_shot"],
+            shots_per_second=stats["shots_per_second"],
+            dps=stats["dps"],
+            ammo=stats["ammo"],
+            reload_seconds=stats["reload_seconds"],
+            critical=bool(stats["critical"]),
+        )
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Weapon:
+        """Build from a :meth:`herokit.herodb.HeroStore.hero_rows` row."""
+        return cls(
+            name=row["weapon_name"] or "Unknown Weapon",
+            effect_type=row["effect_type"] or "",
+            damage_per_projectile=row["damage_per_projectile"],
+            projectiles_per_shot=row["projectiles_per_shot"],
+            shots_per_second=row["shots_per_second"],
+            dps=row["dps"],
+            ammo=row["ammo"],
+            reload_seconds=row["reload_seconds"],
+            critical=bool(row["critical"]),
+        )
+
+    @property
+    def damage_per_shot(self) -> float:
+        # One "shot" is a trigger pull, so it carries every projectile of a volley.
+        return (self.damage_per_projectile or 0.0) * (self.projectiles_per_shot or 1.0)
+
+
+@dataclass(slots=True)
+class AbilityEffect:
+    hero_name: str
+    ability_name: str
+    damage_amplification: str = ""
+    damage_reduction: str = ""
+    duration: str = ""
+
+
+@dataclass(slots=True)
+class HeroStats:
+    """A hero joined with its health pool and primary weapon; missing pool values are 0."""
+
+    role: str
+    name: str
+    url: str
+    health: float
+    armor: float
+    shields: float
+    weapon: Weapon
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> HeroStats:
+        return cls(
+            role=row["role"],
+            name=row["name"],
+            url=row["url"],
+            health=row["health"] or 0.0,
+            armor=row["armor"] or 0.0,
+            shields=row["shields"] or 0.0,
+            weapon=Weapon.from_row(row),
+        )
+
+
+def _optional_float(value: Optional[str]) -> Optional[float]:
+    return float(value) if value else None
+
+
+def read_heroes(csv_path: Path) -> list[Hero]:
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Could not find hero CSV at {csv_path}")
+
+    heroes: list[Hero] = []
+    with csv_path.open("r", encoding="utf-8", newline="") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            role = (row.get("role") or "").strip()
+            name = (row.get("name") or "").strip()
+            url = (row.get("url") or "").strip()
+            if not (role and name and url):
+                continue
+            heroes.append(Hero(role=role, name=name, url=url))
+    return heroes
+
+
+def load_health_pools(health_csv: Path, shields_csv: Optional[Path] = None) -> list[HealthPool]:
+    """Rows of hero-health.csv in file order, with shields from hero-shields.csv if given."""
+    shields: dict[str, Optional[float]] = {}
+    if shields_csv is not None:
+        with shields_csv.open(newline="", encoding="utf-8") as handle:
+            shields = {row["name"]: _optional_float(row.get("shields")) for row in csv.DictReader(handle)}
+    with health_csv.open(newline="", encoding="utf-8") as handle:
+        return [
+            HealthPool(
+                role=row["role"],
+                name=row["name"],
+                health=_optional_float(row.get("health")),
+                armor=_optional_float(row.get("armor")),
+                shields=shields.get(row["name"]),
+            )
+            for row in csv.DictReader(handle)
+        ]
+
+
+def load_primary_weapons(weapons_json: Path) -> dict[str, Weapon]:
+    """Primary weapon of each hero in hero-weapons.json, by hero name."""
+    with weapons_json.open(encoding="utf-8") as handle:
+        records = json.load(handle)
+    weapons: dict[str, Weapon] = {}
+    for record in records:
+        entry = primary_weapon(record.get("weapons") or [])
+        if entry is not None:
+            weapons[record["name"]] = Weapon.from_record(entry)
+    return weapons
+
+
+def load_ability_effects(path: Path) -> list[AbilityEffect]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [AbilityEffect(**row) for row in csv.DictReader(handle)]
+
+
+def load_hero_stats(
+    health_csv: Path,
+    weapons_json: Path,
+    *,
+    shields_csv: Optional[Path] = None,
+    roster_csv: Optional[Path] = None,
+) -> list[HeroStats]:
+    """Heroes that have both a health row and a primary weapon.
+
+    They follow the roster order when ``roster_csv`` is given (which also
+    supplies their URLs) and the order of ``health_csv`` otherwise.
+    """
+    pools = {pool.name: pool for pool in load_health_pools(health_csv, shields_csv)}
+    weapons = load_primary_weapons(weapons_json)
+    heroes: Iterable[Hero]
+    if roster_csv is not None:
+        heroes = read_heroes(roster_csv)
+    else:
+        heroes = (Hero(role=pool.role, name=pool.name, url="") for pool in pools.values())
+    stats = []
+    for hero in heroes:
+        pool = pools.get(hero.name)
+        weapon = weapons.get(hero.name)
+        if pool is None or weapon is None:
+            continue
+        stats.append(
+            HeroStats(
+                role=hero.role,
+                name=hero.name,
+                url=hero.url,
+                health=pool.health or 0.0,
+                armor=pool.armor or 0.0,
+                shields=pool.shields or 0.0,
+                weapon=weapon,
+            )
+        )
+    return stats
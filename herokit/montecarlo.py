@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from herokit.duel import (
+    A_WINS,
+    ARMOR_DAMAGE_FACTOR,
+    B_WINS,
+    CRIT_CHANCE,
+    CRIT_MULTIPLIER,
+    DAMAGE_ROLE_FACTOR,
+    DRAW,
+    MAX_ROUNDS_DEFAULT,
+    OUTCOMES,
+    STALEMATE,
+    SUPPORT_REGEN,
+    TANK_DAMAGE_FACTOR,
+)
+from herokit.models import HeroStats
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; see require_numpy
+    np = None  # type: ignore[assignment]
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("The batched duel engine needs the optional numpy package (pip install numpy).")
+
+
+class HeroArrays:
+    """Per-hero columns of a roster, indexed like the ``heroes`` sequence."""
+
+    def __init__(self, heroes: Sequence[HeroStats]) -> None:
+        require_numpy()
+        roles = [hero.role.lower() for hero in heroes]
+        weapons = [hero.weapon for hero in heroes]
+        self.health = np.array([hero.health for hero in heroes], dtype=np.float64)
+        self.armor = np.array([hero.armor for hero in heroes], dtype=np.float64)
+        self.is_damage = np.array([role == "damage" for role in roles])
+        self.is_tank = np.array([role == "tank" for role in roles])
+        self.is_support = np.array([role == "support" for role in roles])
+        self.shots_per_second = np.array([weapon.shots_per_second for weapon in weapons], dtype=np.float64)
+        self.dps = np.array([weapon.dps for weapon in weapons], dtype=np.float64)
+        self.damage_per_shot = np.array([weapon.damage_per_shot for weapon in weapons], dtype=np.float64)
+        self.has_clip = np.array([weapon.ammo is not None for weapon in weapons])
+        self.clip = np.array([weapon.ammo or 0.0 for weapon in weapons], dtype=np.float64)
+        self.reload_seconds = np.array([weapon.reload_seconds or 0.0 for weapon in weapons], dtype=np.float64)
+        self.critical = np.array([weapon.critical for weapon in weapons])
+
+
+class _Side:
+    """One side of every running duel: hero constants gathered per duel plus mutable state."""
+
+    CONSTANTS = (
+        "max_health",
+        "is_damage",
+        "is_tank",
+        "is_support",
+        "shots_per_second",
+        "dps",
+        "damage_per_shot",
+        "has_clip",
+        "clip",
+        "reload_seconds",
+        "critical",
+    )
+    STATE = ("health", "armor", "ammo", "reload_timer", "took_damage")
+
+    def __init__(self, table: HeroArrays, index: Any) -> None:
+        self.max_health = table.health[index]
+        for name in self.CONSTANTS[1:]:
+            setattr(self, name, getattr(table, name)[index])
+        self.health = self.max_health.copy()
+        self.armor = table.armor[index]
+        self.ammo = self.clip.copy()
+        self.reload_timer = np.zeros(len(index))
+        self.took_damage = np.zeros(len(index), dtype=bool)
+
+    def keep(self, mask: Any) -> None:
+        for name in self.CONSTANTS + self.STATE:
+            setattr(self, name, getattr(self, name)[mask])
+
+    def attack(self, rng: Any) -> Any:
+        """Raw damage of this round's attack, as FighterState.attack computes it."""
+        reloading = self.reload_timer > 0
+        self.reload_timer = np.where(reloading, np.maximum(self.reload_timer - 1.0, 0.0), self.reload_timer)
+        refill = reloading & (self.reload_timer == 0) & self.has_clip
+        self.ammo = np.where(refill, self.clip, self.ammo)
+
+        firing = ~reloading
+        sustained = firing & (self.shots_per_second <= 0) & (self.dps > 0)
+        from_clip = firing & ~sustained & self.has_clip
+        available = np.minimum(self.ammo, self.shots_per_second)
+        shots = np.where(from_clip, available, self.shots_per_second)
+        self.ammo = np.where(from_clip, self.ammo - available, self.ammo)
+        empty = from_clip & (self.ammo <= 0) & (self.reload_seconds > 0)
+        self.reload_timer = np.where(empty, self.reload_seconds, self.reload_timer)
+        self.ammo = np.where(empty, 0.0, self.ammo)
+
+        damage = np.where(sustained, self.dps, np.maximum(shots, 0.0) * self.damage_per_shot)
+        damage = np.where(firing, damage, 0.0)
+        crit = firing & self.critical & (rng.random(len(damage)) < CRIT_CHANCE)
+        damage = np.where(crit, damage * CRIT_MULTIPLIER, damage)
+        return np.where(self.is_damage, damage * DAMAGE_ROLE_FACTOR, damage)
+
+    def take(self, incoming: Any) -> None:
+        hit = incoming > 0
+        armored = hit & (self.armor > 0)
+        effective = np.where(
+            armored,
+            incoming * ARMOR_DAMAGE_FACTOR,
+            np.where(self.is_tank, incoming * TANK_DAMAGE_FACTOR, incoming),
+        )
+        absorbed = np.where(armored, np.minimum(self.armor, effective), 0.0)
+        self.armor = self.armor - absorbed
+        self.health = np.where(hit, np.maximum(self.health - (effective - absorbed), 0.0), self.health)
+        self.took_damage = hit & (effective > 0)
+
+    def regenerate(self) -> None:
+        missing = self.max_health - self.health
+        heals = self.is_support & ~self.took_damage & (self.health > 0) & (missing > 0)
+        self.health = np.where(heals, self.health + np.minimum(SUPPORT_REGEN, missing), self.health)
+
+
+@dataclass
+class DuelResults:
+    """Outcome code (see :mod:`herokit.duel`) and rounds played for each duel."""
+
+    outcome: Any
+    rounds: Any
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    def counts(self) -> dict[str, int]:
+        totals = np.bincount(self.outcome, minlength=len(OUTCOMES))
+        return {name: int(total) for name, total in zip(OUTCOMES, totals, strict=True)}
+
+    def rates(self) -> dict[str, float]:
+        return {name: count / len(self) for name, count in self.counts().items()}
+
+
+def simulate_duels(
+    heroes: Sequence[HeroStats],
+    a_index: Any,
+    b_index: Any,
+    *,
+    max_rounds: int = MAX_ROUNDS_DEFAULT,
+    rng: Optional[Any] = None,
+) -> DuelResults:
+    """Fight duel ``i`` between ``heroes[a_index[i]]`` and ``heroes[b_index[i]]``, all at once.
+
+    Every duel follows the rules of fight.py's FighterState, round for round;
+    only the random crit draws differ. Finished duels are dropped from the
+    working arrays, so long tails of close fights stay cheap.
+    """
+    require_numpy()
+    rng = rng if rng is not None else np.random.default_rng()
+    a_index = np.asarray(a_index, dtype=np.intp)
+    b_index = np.asarray(b_index, dtype=np.intp)
+    if a_index.shape != b_index.shape or a_index.ndim != 1:
+        raise ValueError("a_index and b_index must be one-dimensional and the same length")
+
+    table = HeroArrays(heroes)
+    outcome = np.full(len(a_index), STALEMATE, dtype=np.int8)
+    rounds = np.full(len(a_index), max_rounds, dtype=np.int16)
+    running = np.arange(len(a_index))
+    side_a = _Side(table, a_index)
+    side_b = _Side(table, b_index)
+    for round_number in range(1, max_rounds + 1):
+        if not len(running):
+            break
+        damage_a = side_a.attack(rng)
+        damage_b = side_b.attack(rng)
+        side_b.take(damage_a)
+        side_a.take(damage_b)
+        side_a.regenerate()
+        side_b.regenerate()
+
+        alive_a = side_a.health > 0
+        alive_b = side_b.health > 0
+        over = ~(alive_a & alive_b)
+        if over.any():
+            finished = running[over]
+            outcome[finished] = np.where(alive_a[over], A_WINS, np.where(alive_b[over], B_WINS, DRAW))
+            rounds[finished] = round_number
+            still = ~over
+            running = running[still]
+            side_a.keep(still)
+            side_b.keep(still)
+    return DuelResults(outcome, rounds)
+
+
+def simulate_pair(
+    heroes: Sequence[HeroStats],
+    a: int,
+    b: int,
+    duels: int,
+    *,
+    max_rounds: int = MAX_ROUNDS_DEFAULT,
+    rng: Optional[Any] = None,
+) -> DuelResults:
+    """``duels`` independent duels of ``heroes[a]`` against ``heroes[b]``."""
+    require_numpy()
+    return simulate_duels(
+        heroes,
+        np.full(duels, a, dtype=np.intp),
+        np.full(duels, b, dtype=np.intp),
+        max_rounds=max_rounds,
+        rng=rng,
+    )
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Iterable, Optional, TextIO
+
+from herokit.models import AbilityEffect, Hero
+
+HEALTH_FIELDS = ["role", "name", "health", "armor"]
+ABILITY_FIELDS = [
+    "hero_name",
+    "ability_name",
+    "damage_amplification",
+    "damage_reduction",
+    "duration",
+]
+SHIELD_FIELDS = ["role", "name", "shields"]
+
+
+def health_row(hero: Hero, stats: dict[str, Optional[float | int]]) -> list[Any]:
+    return [
+        hero.role,
+        hero.name,
+        stats["health"],
+        stats["armor"] if stats["armor"] is not None else "",
+    ]
+
+
+def write_health_csv(rows: Iterable[list[Any]], handle: TextIO) -> None:
+    writer = csv.writer(handle)
+    writer.writerow(HEALTH_FIELDS)
+    writer.writerows(rows)
+
+
+def weapon_record(hero: Hero, weapons: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "role": hero.role,
+        "name": hero.name,
+        "url": hero.url,
+        "weapons": weapons,
+    }
+
+
+def write_weapons_json(records: list[dict[str, Any]], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as outfile:
+        json.dump(records, outfile, ensure_ascii=False, indent=2)
+        outfile.write("\n")
+
+
+class JsonArrayWriter:
+    """Writes a JSON array one record at a time, byte for byte as :func:`write_weapons_json` does.
+
+    Records go to ``<path>.tmp``, which replaces ``path`` on :meth:`close`; a
+    ``with`` block that raises discards it and leaves ``path`` as it was.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._handle = self._tmp_path.open("w", encoding="utf-8")
+        self._handle.write("[")
+        self.count = 0
+
+    def __enter__(self) -> JsonArrayWriter:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(self, record: Any) -> None:
+        text = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._handle.write(("," if self.count else "") + "\n  " + text)
+        self.count += 1
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.write("\n]\n" if self.count else "]\n")
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def ability_rows(hero_name: str, abilities: Iterable[dict[str, str]]) -> list[AbilityEffect]:
+    return [
+        AbilityEffect(
+            hero_name=hero_name,
+            ability_name=ability["ability_name"],
+            damage_amplification=ability.get("damage_amplification", ""),
+            damage_reduction=ability.get("damage_reduction", ""),
+            duration=ability.get("duration", ""),
+        )
+        for ability in abilities
+    ]
+
+
+class AbilityCsvWriter:
+    """hero-ability-damage.csv written a hero at a time, replaced on close like :class:`JsonArrayWriter`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._handle = self._tmp_path.open("w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._handle, fieldnames=ABILITY_FIELDS)
+        self._writer.writeheader()
+
+    def __enter__(self) -> AbilityCsvWriter:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(self, effects: Iterable[AbilityEffect]) -> None:
+        self._writer.writerows(asdict(effect) for effect in effects)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def write_ability_csv(effects: Iterable[AbilityEffect], path: Path) -> None:
+    with AbilityCsvWriter(path) as writer:
+        writer.write(effects)
+
+
+def shield_row(role: str, name: str, shields: Optional[float | int]) -> dict[str, Any]:
+    return {
+        "role": role,
+        "name": name,
+        "shields": shields if shields is not None else "",
+    }
+
+
+def write_shields_csv(rows: Iterable[dict[str, Any]], path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SHIELD_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# Readers for the files above, keyed by hero name, so an incremental run can keep
+# the rows of heroes it does not re-extract. Values stay as written (CSV fields are
+# strings), so writing them back reproduces the same bytes. Missing files read as empty.
+
+
+def read_health_rows(path: Path) -> dict[str, list[Any]]:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        next(reader, None)
+        return {row[1]: row for row in reader if len(row) > 1}
+
+
+def read_weapon_records(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as handle:
+        return {record["name"]: record for record in json.load(handle)}
+
+
+def read_ability_effects(path: Path) -> dict[str, list[AbilityEffect]]:
+    effects: dict[str, list[AbilityEffect]] = {}
+    if not path.exists():
+        return effects
+    with path.open(encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            effects.setdefault(row["hero_name"], []).append(AbilityEffect(**row))
+    return effects
+
+
+def read_shield_rows(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8", newline="") as handle:
+        return {row["name"]: row for row in csv.DictReader(handle)}
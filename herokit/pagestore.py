@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Optional, Protocol
+from urllib.parse import quote, quote_plus, unquote, unquote_plus
+
+INDEX_FILENAME = "index.json"
+PACK_FILENAME = "pages.pack"
+PACK_INDEX_FILENAME = "pages.pack.json"
+PACK_MAGIC = b"HPK1"
+PACK_HEADER = struct.Struct("<4sII")  # magic, metadata length, compressed body length
+COMPRESSION_LEVEL = 6
+
+
+def cache_key(url: str) -> str:
+    """File stem used for ``url`` by every stage that reads or writes the cache."""
+    return quote(url, safe="")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _legacy_keys(url: str) -> list[str]:
+    # cmd-03 used to name files with quote_plus, which differs from quote for spaces.
+    return [quote_plus(url, safe="")]
+
+
+def _url_for_key(key: str) -> str:
+    """Invert :func:`cache_key`, or the legacy quote_plus naming for stems it did not produce."""
+    url = unquote(key)
+    return url if cache_key(url) == key else unquote_plus(key)
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    fetched_at: float
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    trim_version: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CacheEntry:
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class PageStore(Protocol):
+    def read(self, url: str) -> Optional[str]: ...
+
+    def entry(self, url: str) -> Optional[CacheEntry]: ...
+
+    def write(self, entry: CacheEntry, html: str) -> None: ...
+
+    def update_entry(self, entry: CacheEntry) -> None: ...
+
+    def urls(self) -> list[str]: ...
+
+    def close(self) -> None: ...
+
+    def __enter__(self) -> PageStore: ...
+
+    def __exit__(self, *exc_info: object) -> None: ...
+
+
+class DirectoryStore:
+    """One ``<cache_key(url)>.html`` file per page plus a JSON sidecar.
+
+    ``index.json`` maps each URL to its file stem, so pages stored under an older
+    key scheme are still found. Only writes save the index; a lookup that finds a
+    page under a legacy key remembers it in memory, since several stages read the
+    same cache at once.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def __enter__(self) -> DirectoryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass  # every read and write opens and closes its own file
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILENAME
+
+    def key_for(self, url: str) -> str:
+        key = self._index.get(url)
+        if key is not None:
+            return key
+
+        key = cache_key(url)
+        if not (self.directory / f"{key}.html").exists():
+            for legacy in _legacy_keys(url):
+                if (self.directory / f"{legacy}.html").exists():
+                    key = legacy
+                    break
+        if (self.directory / f"{key}.html").exists():
+            with self._lock:
+                self._index.setdefault(url, key)
+        return key
+
+    def page_path(self, url: str) -> Path:
+        return self.directory / f"{self.key_for(url)}.html"
+
+    def meta_path(self, url: str) -> Path:
+        return self.directory / f"{self.key_for(url)}.json"
+
+    def read(self, url: str) -> Optional[str]:
+        path = self.page_path(url)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def entry(self, url: str) -> Optional[CacheEntry]:
+        meta_path = self.meta_path(url)
+        if meta_path.exists():
+            with meta_path.open(encoding="utf-8") as handle:
+                return CacheEntry.from_dict(json.load(handle))
+
+        # Pages cached before sidecars existed: fall back to the file itself.
+        page_path = self.page_path(url)
+        if not page_path.exists():
+            return None
+        return CacheEntry(url=url, fetched_at=page_path.stat().st_mtime, sha256="")
+
+    def write(self, entry: CacheEntry, html: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.page_path(entry.url).write_text(html, encoding="utf-8")
+        self.update_entry(entry)
+        self._remember(entry.url, self.key_for(entry.url))
+
+    def update_entry(self, entry: CacheEntry) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.meta_path(entry.url).open("w", encoding="utf-8") as handle:
+            json.dump(asdict(entry), handle, indent=2)
+            handle.write("\n")
+
+    def urls(self) -> list[str]:
+        urls = set(self._index)
+        indexed = set(self._index.values())
+        for path in self.directory.glob("*.html"):
+            if path.stem not in indexed:
+                urls.add(_url_for_key(path.stem))
+        return sorted(urls)
+
+    def _load_index(self) -> dict[str, str]:
+        if not self.index_path.exists():
+            return {}
+        with self.index_path.open(encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _remember(self, url: str, key: str) -> None:
+        with self._lock:
+            if self._index.get(url) == key:
+                return
+            # Keep entries other processes saved since this store loaded the index.
+            self._index = {**self._load_index(), **self._index, url: key}
+            _write_json_atomic(self.index_path, dict(sorted(self._index.items())))
+
+
+class PackStore:
+    """Append-only pack of zlib-compressed pages with an offset index.
+
+    Every write appends a record (header, metadata JSON, compressed body) to
+    ``pages.pack``; ``pages.pack.json`` maps each URL to the location of its
+    latest record plus earlier ones, so old snapshots of a page stay readable.
+    Reads memory-map the pack and decompress only the requested record; call
+    :meth:`close` (or use a ``with`` block) to release the map.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._index: dict[str, dict[str, Any]] = self._load_index()
+
+    def __enter__(self) -> PackStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def pack_path(self) -> Path:
+        return self.directory / PACK_FILENAME
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / PACK_INDEX_FILENAME
+
+    def read(self, url: str) -> Optional[str]:
+        record = self._index.get(url)
+        if record is None:
+            return None
+        return self.read_version(record)
+
+    def read_version(self, version: dict[str, Any]) -> str:
+        offset, length = version["offset"], version["length"]
+        view = self._view(offset + length)
+        return zlib.decompress(view[offset : offset + length]).decode("utf-8")
+
+    def history(self, url: str) -> list[dict[str, Any]]:
+        """Every stored version of ``url``, oldest first, each readable via :meth:`read_version`."""
+        record = self._index.get(url)
+        if record is None:
+            return []
+        return [*record.get("history", []), _version_of(record)]
+
+    def entry(self, url: str) -> Optional[CacheEntry]:
+        record = self._index.get(url)
+        if record is None:
+            return None
+        return CacheEntry.from_dict(record["entry"])
+
+    def write(self, entry: CacheEntry, html: str) -> None:
+        with self._lock:
+            previous = self._index.get(entry.url)
+            # sha256 is of the page as downloaded; the stored body also depends on how it was trimmed.
+            if (
+                previous is not None
+                and previous["entry"]["sha256"] == entry.sha256
+                and previous["entry"].get("trim_version") == entry.trim_version
+            ):
+                previous["entry"] = asdict(entry)
+                self._save_index()
+                return
+
+            body = zlib.compress(html.encode("utf-8"), COMPRESSION_LEVEL)
+            meta = json.dumps(asdict(entry), ensure_ascii=False).encode("utf-8")
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self.pack_path.open("ab") as handle:
+                start = handle.tell()
+                handle.write(PACK_HEADER.pack(PACK_MAGIC, len(meta), len(body)))
+                handle.write(meta)
+                handle.write(body)
+
+            history = []
+            if previous is not None:
+                history = [*previous.get("history", []), _version_of(previous)]
+            self._index[entry.url] = {
+                "offset": start + PACK_HEADER.size + len(meta),
+                "length": len(body),
+                "size": len(html.encode("utf-8")),
+                "entry": asdict(entry),
+                "history": history,
+            }
+            self._save_index()
+
+    def update_entry(self, entry: CacheEntry) -> None:
+        with self._lock:
+            record = self._index.get(entry.url)
+            if record is None:
+                raise KeyError(f"No packed page for {entry.url}")
+            record["entry"] = asdict(entry)
+            self._save_index()
+
+    def urls(self) -> list[str]:
+        return sorted(self._index)
+
+    def rebuild_index(self) -> None:
+        """Recreate ``pages.pack.json`` by scanning the pack records in order."""
+        with self._lock:
+            self._index = {}
+            data = self.pack_path.read_bytes() if self.pack_path.exists() else b""
+            position = 0
+            while position + PACK_HEADER.size <= len(data):
+                magic, meta_length, body_length = PACK_HEADER.unpack_from(data, position)
+                if magic != PACK_MAGIC:
+                    raise ValueError(f"Corrupt pack record at offset {position}")
+                meta_start = position + PACK_HEADER.size
+                entry = json.loads(data[meta_start : meta_start + meta_length])
+                previous = self._index.get(entry["url"])
+                history = []
+                if previous is not None:
+                    history = [*previous["history"], _version_of(previous)]
+                self._index[entry["url"]] = {
+                    "offset": meta_start + meta_length,
+                    "length": body_length,
+                    "size": None,
+                    "entry": entry,
+                    "history": history,
+                }
+                position = meta_start + meta_length + body_length
+            self._save_index()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def _view(self, needed: int) -> mmap.mmap:
+        with self._lock:
+            if self._mmap is None or len(self._mmap) < needed:
+                # The pack grew since it was mapped. Readers may still hold the old
+                # map, so let it be released when they drop it instead of closing it.
+                with self.pack_path.open("rb") as handle:
+                    self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        with self.index_path.open(encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _save_index(self) -> None:
+        _write_json_atomic(self.index_path, dict(sorted(self._index.items())))
+
+
+def _version_of(record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "offset": record["offset"],
+        "length": record["length"],
+        "sha256": record["entry"]["sha256"],
+        "fetched_at": record["entry"]["fetched_at"],
+    }
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # One temporary file per writer: stages sharing a cache may save the same index at once.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
+    os.replace(tmp_path, path)
+
+
+STORE_BACKENDS = {"dir": DirectoryStore, "pack": PackStore}
+
+
+def open_store(directory: Path, backend: str = "dir") -> PageStore:
+    try:
+        store_class = STORE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown cache backend {backend!r}; choose from {sorted(STORE_BACKENDS)}") from None
+    return store_class(directory)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+STATE_PATH_DEFAULT = Path(".cache/pipeline-state.json")
+SKIPPED_DIRS = {"__pycache__"}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One script in the pipeline.
+
+    ``command`` is run with the current interpreter from the pipeline root. A
+    stage depends on every stage that lists one of its ``inputs`` as an output;
+    inputs may be files or directories. Files in an input directory whose names
+    match one of the ``ignore`` patterns (such as metadata the stage rewrites
+    itself) are left out of its hash. With ``stdout`` the command's standard
+    output becomes that output file. A stage that reads something outside the
+    tree, such as the wiki, sets ``max_age`` to rerun once its last successful
+    run is that many seconds old.
+    """
+
+    name: str
+    command: tuple[str, ...]
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    stdout: Optional[Path] = None
+    ignore: tuple[str, ...] = ()
+    max_age: Optional[float] = None
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # "skipped", "ran", "failed", "blocked" or "stale" (dry run)
+    seconds: float = 0.0
+    detail: str = ""
+
+
+class PathHasher:
+    """sha256 of files and directory trees, reusing earlier hashes while size and mtime match."""
+
+    def __init__(self, root: Path, known: Optional[dict[str, list]] = None) -> None:
+        self.root = root
+        self.known: dict[str, list] = dict(known or {})
+        self._lock = threading.Lock()
+
+    def hash(self, path: Path, ignore: Sequence[str] = ()) -> Optional[str]:
+        full = self.root / path
+        if full.is_dir():
+            digest = hashlib.sha256()
+            for child in sorted(_walk(full)):
+                if any(fnmatch.fnmatch(child.name, pattern) for pattern in ignore):
+                    continue
+                relative = child.relative_to(self.root)
+                digest.update(f"{relative.as_posix()}\0{self._hash_file(relative)}\n".encode())
+            return digest.hexdigest()
+        if full.is_file():
+            return self._hash_file(path)
+        return None
+
+    def _hash_file(self, path: Path) -> str:
+        stat = (self.root / path).stat()
+        key = path.as_posix()
+        with self._lock:
+            known = self.known.get(key)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = hashlib.sha256()
+        with (self.root / path).open("rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        with self._lock:
+            self.known[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def _walk(directory: Path) -> Iterable[Path]:
+    for entry in directory.iterdir():
+        if entry.is_dir():
+            if entry.name not in SKIPPED_DIRS:
+                yield from _walk(entry)
+        elif not entry.name.endswith(".tmp"):
+            yield entry
+
+
+class Pipeline:
+    """Runs stages in dependency order, skipping those whose inputs and outputs are unchanged.
+
+    After a stage succeeds the hashes of its inputs and outputs are written to
+    the state file; the next run skips the stage while all of them still match.
+    Stages whose dependencies have finished run concurrently, up to ``jobs`` at a
+    time.
+    """
+
+    def __init__(self, stages: Sequence[Stage], *, root: Path, state_path: Path = STATE_PATH_DEFAULT) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.root = root
+        self.state_path = root / state_path
+        self.producers: dict[Path, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"{output} is produced by both {self.producers[output]} and {stage.name}")
+                self.producers[output] = stage.name
+        self.dependencies = {
+            stage.name: {self.producers[path] for path in stage.inputs if path in self.producers} - {stage.name}
+            for stage in stages
+        }
+        self._order = self._topological_order()
+        self._state_lock = threading.Lock()
+
+    def upstream(self, names: Iterable[str]) -> list[str]:
+        """``names`` plus everything they depend on, in run order."""
+        wanted: set[str] = set()
+        todo = list(names)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r}; choose from {list(self.stages)}")
+            if name not in wanted:
+                wanted.add(name)
+                todo.extend(self.dependencies[name])
+        return [name for name in self._order if name in wanted]
+
+    def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        *,
+        jobs: int = 4,
+        force: Iterable[str] = (),
+        assume_current: Iterable[str] = (),
+        dry_run: bool = False,
+        report: Callable[[StageResult], None] = lambda result: None,
+    ) -> dict[str, StageResult]:
+        names = self.upstream(targets) if targets is not None else list(self._order)
+        forced = set(force)
+        assumed = set(assume_current)
+        state = self._load_state()
+        hasher = PathHasher(self.root, state.get("files"))
+        results: dict[str, StageResult] = {}
+        waiting = list(names)
+        running: dict[Future[StageResult], str] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while waiting or running:
+                for name in list(waiting):
+                    upstream = [dep for dep in self.dependencies[name] if dep in names]
+                    if any(dep not in results for dep in upstream):
+                        continue
+                    waiting.remove(name)
+                    stage = self.stages[name]
+                    failed = [dep for dep in upstream if results[dep].status in ("failed", "blocked")]
+                    # In a dry run nothing is rebuilt, so anything downstream of a stale stage is stale too.
+                    stale_upstream = any(results[dep].status == "stale" for dep in upstream)
+                    if failed:
+                        result = StageResult(name, "blocked", detail=f"needs {', '.join(sorted(failed))}")
+                    elif name in assumed:
+                        result = StageResult(name, "skipped", detail="assumed up to date")
+                    elif name not in forced and not stale_upstream and self._is_current(stage, state, hasher):
+                        result = StageResult(name, "skipped", detail="up to date")
+                    elif dry_run:
+                        result = StageResult(name, "stale")
+                    else:
+                        running[pool.submit(self._run_stage, stage, state, hasher)] = name
+                        continue
+                    results[name] = result
+                    report(result)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[running.pop(future)] = result
+                    report(result)
+
+        if not dry_run:
+            state["files"] = hasher.known
+            self._save_state(state)
+        return results
+
+    def _is_current(self, stage: Stage, state: dict, hasher: PathHasher) -> bool:
+        recorded = state.get("stages", {}).get(stage.name)
+        if not recorded:
+            return False
+        if stage.max_age is not None:
+            ran_at = state.get("ran_at", {}).get(stage.name)
+            if ran_at is None or time.time() - ran_at > stage.max_age:
+                return False
+        current = self._fingerprint(stage, hasher)
+        return None not in current["outputs"].values() and current == recorded
+
+    def _fingerprint(self, stage: Stage, hasher: PathHasher) -> dict[str, dict[str, Optional[str]]]:
+        return {
+            "command": list(stage.command),
+            "inputs": {path.as_posix(): hasher.hash(path, stage.ignore) for path in stage.inputs},
+            "outputs": {path.as_posix(): hasher.hash(path) for path in stage.outputs},
+        }
+
+    def _run_stage(self, stage: Stage, state: dict, hasher: PathHasher) -> StageResult:
+        started = time.perf_counter()
+        stdout_path = self.root / stage.stdout if stage.stdout else None
+        tmp_path = stdout_path.with_name(stdout_path.name + ".tmp") if stdout_path else None
+        with open(tmp_path, "w", encoding="utf-8") if tmp_path else open(os.devnull, "w") as stdout:
+            completed = subprocess.run(
+                [sys.executable, *stage.command],
+                cwd=self.root,
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        seconds = time.perf_counter() - started
+        if completed.returncode != 0:
+            if tmp_path:
+                tmp_path.unlink(missing_ok=True)
+            tail = "\n".join(completed.stderr.strip().splitlines()[-5:])
+            return StageResult(stage.name, "failed", seconds, f"exit code {completed.returncode}\n{tail}")
+
+        if tmp_path and stdout_path:
+            os.replace(tmp_path, stdout_path)
+        fingerprint = self._fingerprint(stage, hasher)
+        with self._state_lock:
+            state.setdefault("stages", {})[stage.name] = fingerprint
+            state.setdefault("ran_at", {})[stage.name] = time.time()
+        return StageResult(stage.name, "ran", seconds)
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage {name!r} is part of a dependency cycle")
+            visiting.add(name)
+            for dep in sorted(self.dependencies[name]):
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        with self.state_path.open(encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _save_state(self, state: dict) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(state, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import requests
+
+from herokit.cache import CacheStats, PageCache, fetch_page
+from herokit.engine import extract_pages
+from herokit.extractors import DEFAULT_PARSER, Extractor
+from herokit.fetch import PageFetcher
+from herokit.metrics import Metrics
+from herokit.models import Hero
+from herokit.roster import HEROES_PATH, extract_heroes
+from herokit.stubwiki import StubStats, StubWiki
+
+PASS_KINDS = ("cold", "warm", "revalidate")
+
+
+@dataclass
+class ReplayPass:
+    """One scrape of every hero page against a :class:`herokit.stubwiki.StubWiki`.
+
+    ``cold`` starts from an empty page cache, ``warm`` reuses the cache without
+    requests, and ``revalidate`` sends a conditional request for every page.
+    """
+
+    kind: str
+    pages: int
+    failures: int
+    seconds: float
+    cache: CacheStats
+    server: StubStats
+    fetch_seconds: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def fetch_percentile_ms(self, fraction: float) -> Optional[float]:
+        if not self.fetch_seconds:
+            return None
+        ordered = sorted(self.fetch_seconds)
+        return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))] * 1000
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "pages": self.pages,
+            "failures": self.failures,
+            "seconds": self.seconds,
+            "pages_per_second": self.pages_per_second,
+            "fetch_p50_ms": self.fetch_percentile_ms(0.5),
+            "fetch_p90_ms": self.fetch_percentile_ms(0.9),
+            "cache": asdict(self.cache),
+            "server": asdict(self.server),
+        }
+
+
+def read_stub_roster(wiki: StubWiki, fetcher: PageFetcher) -> list[Hero]:
+    """Fetch and parse the stub's Heroes navbox, as cmd-01 does against the wiki."""
+    return extract_heroes(fetcher.fetch_text(wiki.base_url + HEROES_PATH), wiki.base_url)
+
+
+def replay_scrape(
+    wiki: StubWiki,
+    cache_dir: Path,
+    *,
+    passes: Iterable[str] = ("cold", "revalidate"),
+    concurrency: int = 8,
+    rate_limit: Optional[float] = None,
+    extractors: Sequence[Extractor] = (),
+    parser: str = DEFAULT_PARSER,
+    jobs: int = 1,
+) -> list[ReplayPass]:
+    """Scrape the stub's roster once per entry of ``passes`` and time each pass.
+
+    Each ``cold`` pass uses a fresh subdirectory of ``cache_dir``; the other
+    kinds reuse the most recent one. With ``extractors`` the pages are also
+    parsed, as cmd-extract-all does, so the timing covers the whole scrape.
+    """
+    results = []
+    cold_runs = 0
+    pass_cache_dir = cache_dir / "cold-0"
+    for kind in passes:
+        if kind not in PASS_KINDS:
+            raise ValueError(f"Unknown replay pass {kind!r}; choose from {list(PASS_KINDS)}")
+        if kind == "cold":
+            cold_runs += 1
+            pass_cache_dir = cache_dir / f"cold-{cold_runs}"
+        cache = PageCache(pass_cache_dir, refresh=kind == "revalidate")
+        metrics = Metrics(kind)
+        server_before = StubStats(**asdict(wiki.stats))
+
+        start = time.perf_counter()
+        with cache, PageFetcher(concurrency=concurrency, rate_limit=rate_limit, metrics=metrics) as fetcher:
+            try:
+                heroes = read_stub_roster(wiki, fetcher)
+            except requests.RequestException as exc:
+                # Without a roster there is nothing to scrape; the pass counts as one failure.
+                print(f"Failed to fetch the stub roster ({wiki.base_url + HEROES_PATH}): {exc}", file=sys.stderr)
+                heroes = []
+                roster_failures = 1
+            else:
+                roster_failures = 0
+            outcomes = fetcher.map(lambda hero, cache=cache: fetch_page(hero.url, fetcher, cache), heroes)
+            if extractors:
+                outcomes = extract_pages(outcomes, extractors, parser=parser, jobs=jobs)
+            failures = roster_failures + sum(1 for outcome in outcomes if outcome.error is not None)
+        seconds = time.perf_counter() - start
+
+        server = StubStats(
+            **{name: value - getattr(server_before, name) for name, value in asdict(wiki.stats).items()}
+        )
+        results.append(
+            ReplayPass(
+                kind=kind,
+                pages=len(heroes),
+                failures=failures,
+                seconds=seconds,
+                cache=cache.stats,
+                server=server,
+                fetch_seconds=[fetch.seconds for fetch in metrics.fetches],
+            )
+        )
+    return results
+
+
+def format_passes(passes: Sequence[ReplayPass]) -> str:
+    lines = [
+        f"  {'pass':<11} {'pages':>5} {'failed':>6} {'seconds':>8} {'pages/s':>8} "
+        f"{'p50 ms':>7} {'p90 ms':>7} {'200':>4} {'304':>4} {'5xx':>4}"
+    ]
+    for result in passes:
+        p50 = result.fetch_percentile_ms(0.5)
+        p90 = result.fetch_percentile_ms(0.9)
+        lines.append(
+            f"  {result.kind:<11} {result.pages:5d} {result.failures:6d} {result.seconds:8.2f} "
+            f"{result.pages_per_second:8.1f} {'-' if p50 is None else f'{p50:.1f}':>7} "
+            f"{'-' if p90 is None else f'{p90:.1f}':>7} {result.server.ok:4d} "
+            f"{result.server.not_modified:4d} {result.server.errors:4d}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from herokit.extractors import Extractor
+
+RESULTS_DIR_DEFAULT = Path(".cache/extract-results")
+
+
+@dataclass
+class ResultStats:
+    hits: int = 0
+    misses: int = 0
+
+    def summary(self) -> str:
+        return f"Results: {self.hits} reused, {self.misses} extracted"
+
+
+class ResultCache:
+    """Extractor output memoized by (page sha256, extractor name, extractor version).
+
+    Each result lives in ``<name>-v<version>/<sha256>.json``, so bumping an
+    extractor's version simply stops old results from being found. Values must
+    survive a JSON round trip unchanged, which holds for every extractor in
+    :data:`herokit.extractors.EXTRACTORS`.
+    """
+
+    def __init__(self, directory: Path = RESULTS_DIR_DEFAULT) -> None:
+        self.directory = directory
+        self.stats = ResultStats()
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str, extractor: Extractor) -> Path:
+        return self.directory / f"{extractor.name}-v{extractor.version}" / f"{digest}.json"
+
+    def lookup(self, digest: str, extractors: Iterable[Extractor]) -> dict[str, Any]:
+        """Return the stored values for whichever ``extractors`` already ran on ``digest``."""
+        found: dict[str, Any] = {}
+        for extractor in extractors:
+            path = self.path_for(digest, extractor)
+            try:
+                with path.open(encoding="utf-8") as handle:
+                    found[extractor.name] = json.load(handle)["value"]
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                self._count("misses")
+                continue
+            self._count("hits")
+        return found
+
+    def store(self, digest: str, extractor: Extractor, value: Any) -> None:
+        path = self.path_for(digest, extractor)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"value": value}, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+
+def add_result_cache_arguments(
+    parser: argparse.ArgumentParser, *, default_dir: Path = RESULTS_DIR_DEFAULT
+) -> None:
+    parser.add_argument(
+        "--result-cache-dir",
+        type=Path,
+        default=default_dir,
+        help=f"Directory for memoized extraction results (default: {default_dir})",
+    )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Parse every page even if its extraction results are already stored.",
+    )
+
+
+def result_cache_from_args(args: argparse.Namespace) -> Optional[ResultCache]:
+    if args.no_result_cache:
+        return None
+    return ResultCache(args.result_cache_dir)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from herokit.models import Hero, read_heroes
+
+__all__ = [
+    "HEROES_PATH",
+    "ROSTER_CHANGES_DEFAULT",
+    "ROSTER_CSV_DEFAULT",
+    "WIKI_BASE_URL",
+    "Hero",
+    "RosterDiff",
+    "diff_rosters",
+    "extract_heroes",
+    "read_heroes",
+    "read_roster_diff",
+    "write_heroes",
+    "write_roster_diff",
+]
+
+ROSTER_CSV_DEFAULT = Path("data-heroes.hidden.csv")
+ROSTER_CHANGES_DEFAULT = Path(".cache/roster-changes.json")
+WIKI_BASE_URL = "https://overwatch.fandom.com"
+HEROES_PATH = "/wiki/Heroes"
+
+
+def extract_heroes(html: str, base_url: str = WIKI_BASE_URL) -> list[Hero]:
+    """Heroes listed in the navbox of the wiki's Heroes page, with absolute URLs."""
+    soup = BeautifulSoup(html, "html.parser")
+    navbox = soup.select_one("table.navbox")
+    if navbox is None:
+        raise RuntimeError("Could not find the hero navbox on the Heroes page.")
+
+    heroes: list[Hero] = []
+    current_role: Optional[str] = None
+
+    for row in navbox.select("tr"):
+        header = row.find("th", class_="navbox-group")
+        if header:
+            current_role = header.get_text(strip=True)
+
+        if not current_role:
+            continue
+
+        for cell in row.find_all("td"):
+            link = _first_named_link(cell)
+            if not link:
+                continue
+
+            name = link.get_text(strip=True)
+            href = urljoin(base_url, link["href"])
+            heroes.append(Hero(role=current_role, name=name, url=href))
+
+    if not heroes:
+        raise RuntimeError("No hero entries were parsed from the navbox.")
+
+    return heroes
+
+
+def _first_named_link(cell: Tag) -> Optional[Tag]:
+    for link in cell.select("a[href]"):
+        text = link.get_text(strip=True)
+        href = link.get("href", "")
+        if not text or not href.startswith("/wiki/"):
+            continue
+        if text in {"Tank", "Damage", "Support"}:
+            continue
+        return link
+    return None
+
+
+def write_heroes(heroes: Iterable[Hero], path: Path) -> None:
+    with path.open("w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=["role", "name", "url"])
+        writer.writeheader()
+        writer.writerows(asdict(hero) for hero in heroes)
+
+
+@dataclass
+class RosterDiff:
+    """What changed between two rosters.
+
+    ``renamed`` and ``role_changed`` hold ``(old, new)`` pairs. A hero counts as
+    renamed when its name or its page URL changed; its page has to be scraped
+    again either way. A role change alone does not need a new scrape; a renamed
+    hero whose role also changed is listed under both.
+    """
+
+    added: list[Hero] = field(default_factory=list)
+    removed: list[Hero] = field(default_factory=list)
+    renamed: list[tuple[Hero, Hero]] = field(default_factory=list)
+    role_changed: list[tuple[Hero, Hero]] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.renamed or self.role_changed)
+
+    @property
+    def rescrape(self) -> list[Hero]:
+        """Heroes whose page the downstream stages have not seen yet."""
+        return self.added + [new for _old, new in self.renamed]
+
+    @property
+    def dropped(self) -> list[Hero]:
+        """Heroes whose previous output rows no longer belong to the roster."""
+        return self.removed + [old for old, _new in self.renamed]
+
+    def describe(self) -> list[str]:
+        lines = [f"+ {hero.name} ({hero.role}): {hero.url}" for hero in self.added]
+        lines += [f"- {hero.name} ({hero.role})" for hero in self.removed]
+        for old, new in self.renamed:
+            if old.name != new.name:
+                lines.append(f"~ {old.name} -> {new.name}: {new.url}")
+            else:
+                lines.append(f"~ {new.name}: {old.url} -> {new.url}")
+        lines += [f"* {new.name}: {old.role} -> {new.role}" for old, new in self.role_changed]
+        return lines
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "added": [asdict(hero) for hero in self.added],
+            "removed": [asdict(hero) for hero in self.removed],
+            "renamed": [[asdict(old), asdict(new)] for old, new in self.renamed],
+            "role_changed": [[asdict(old), asdict(new)] for old, new in self.role_changed],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> RosterDiff:
+        return cls(
+            added=[Hero(**hero) for hero in data.get("added", [])],
+            removed=[Hero(**hero) for hero in data.get("removed", [])],
+            renamed=[(Hero(**old), Hero(**new)) for old, new in data.get("renamed", [])],
+            role_changed=[(Hero(**old), Hero(**new)) for old, new in data.get("role_changed", [])],
+        )
+
+
+def diff_rosters(old: Iterable[Hero], new: Iterable[Hero]) -> RosterDiff:
+    """Compare two rosters, matching heroes by name first and then by page URL."""
+    unmatched = {hero.name: hero for hero in old}
+    by_url = {hero.url: hero for hero in unmatched.values()}
+    diff = RosterDiff()
+    pending = []
+    for hero in new:
+        previous = unmatched.pop(hero.name, None)
+        if previous is None:
+            pending.append(hero)
+        elif previous.url != hero.url:
+            diff.renamed.append((previous, hero))
+        elif previous.role != hero.role:
+            diff.role_changed.append((previous, hero))
+    # Only heroes no name matched can be renames that kept their page.
+    for hero in pending:
+        previous = by_url.get(hero.url)
+        if previous is not None and unmatched.pop(previous.name, None) is not None:
+            diff.renamed.append((previous, hero))
+        else:
+            diff.added.append(hero)
+    diff.removed = list(unmatched.values())
+    diff.role_changed += [(previous, hero) for previous, hero in diff.renamed if previous.role != hero.role]
+    return diff
+
+
+def write_roster_diff(diff: RosterDiff, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(diff.to_json(), handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+
+
+def read_roster_diff(path: Path) -> RosterDiff:
+    with path.open(encoding="utf-8") as handle:
+        return RosterDiff.from_json(json.load(handle))
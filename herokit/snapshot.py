@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+from herokit.models import HeroStats
+
+SNAPSHOT_PATH_DEFAULT = Path(".cache/hero-snapshot.bin")
+SNAPSHOT_MAGIC = b"HEROSNAP"
+SNAPSHOT_FORMAT = 2
+
+# magic, format, hero count, length of the trailing JSON string table, sha256 of the sources.
+HEADER = struct.Struct("<8sIII32s4x")
+# One float64 column per name, in this order, straight after the header. None is stored as NaN.
+POOL_COLUMNS = ("health", "armor", "shields")
+WEAPON_COLUMNS = (
+    "damage_per_projectile",
+    "projectiles_per_shot",
+    "shots_per_second",
+    "dps",
+    "ammo",
+    "reload_seconds",
+    "critical",
+)
+COLUMNS = POOL_COLUMNS + WEAPON_COLUMNS
+# Per-hero strings, kept as one JSON list of lists after the columns.
+STRINGS = ("role", "name", "url", "weapon_name", "effect_type")
+
+
+def source_digest(paths: Iterable[Path]) -> bytes:
+    """sha256 over the contents of ``paths``; a snapshot is fresh while this matches its header."""
+    digest = hashlib.sha256()
+    for path in paths:
+        data = path.read_bytes()
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+def _hero_values(hero: HeroStats) -> dict[str, Any]:
+    values = {"role": hero.role, "name": hero.name, "url": hero.url, "weapon_name": hero.weapon.name}
+    values.update((column, getattr(hero, column)) for column in POOL_COLUMNS)
+    values.update((column, getattr(hero.weapon, column)) for column in ("effect_type", *WEAPON_COLUMNS))
+    return values
+
+
+def write_snapshot(path: Path, heroes: Sequence[HeroStats], digest: bytes) -> None:
+    """Write ``heroes`` to ``path`` atomically."""
+    rows = [_hero_values(hero) for hero in heroes]
+    strings = json.dumps([[row[key] for key in STRINGS] for row in rows], ensure_ascii=False).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    with partial.open("wb") as handle:
+        handle.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(rows), len(strings), digest))
+        for column in COLUMNS:
+            values = (row[column] for row in rows)
+            array("d", (math.nan if value is None else float(value) for value in values)).tofile(handle)
+        handle.write(strings)
+    os.replace(partial, path)
+
+
+class HeroSnapshot:
+    """Read-only, memory-mapped view of a file written by :func:`write_snapshot`.
+
+    Raises ValueError if the file is not a snapshot in the current format.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"{path} is too short to be a hero snapshot")
+            magic, version, self.count, strings_length, self.digest = HEADER.unpack_from(self._map)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT:
+                raise ValueError(f"{path} is not a format {SNAPSHOT_FORMAT} hero snapshot")
+            self._strings_offset = HEADER.size + len(COLUMNS) * self.count * 8
+            if len(self._map) != self._strings_offset + strings_length:
+                raise ValueError(f"{path} is truncated")
+        except ValueError:
+            self._map.close()
+            raise
+
+    def __enter__(self) -> HeroSnapshot:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def column(self, name: str) -> array:
+        start = HEADER.size + COLUMNS.index(name) * self.count * 8
+        values = array("d")
+        values.frombytes(self._map[start : start + self.count * 8])
+        return values
+
+    def heroes(self) -> list[HeroStats]:
+        strings = json.loads(self._map[self._strings_offset :])
+        columns = {name: self.column(name) for name in COLUMNS}
+        heroes = []
+        for index, values in enumerate(strings):
+            row: dict[str, Any] = dict(zip(STRINGS, values, strict=True))
+            for name, column in columns.items():
+                value = column[index]
+                row[name] = None if math.isnan(value) else value
+            heroes.append(HeroStats.from_row(row))
+        return heroes
+
+
+def load_fresh_heroes(path: Path, sources: Iterable[Path]) -> Optional[list[HeroStats]]:
+    """Heroes in the snapshot at ``path`` if it was built from the current ``sources``, else None."""
+    try:
+        with HeroSnapshot(path) as snapshot:
+            if snapshot.digest != source_digest(sources):
+                return None
+            return snapshot.heroes()
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Optional
+
+STATS_VERSION = 1
+
+NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+")
+DAMAGE_SEGMENT_PATTERN = re.compile(
+    r"(?P<first>\d*\.?\d+)(?:\s*[-–]\s*(?P<second>\d*\.?\d+))?"
+    r"(?:\s*(?P<per>per\s+[a-z]+|over\s+\d*\.?\d+\s+seconds?))?"
+    r"(?:\s*\((?P<note>[^)]*)\))?",
+    re.IGNORECASE,
+)
+THOUSANDS_PATTERN = re.compile(r"(?<=\d),(?=\d{3})")
+HEADSHOT_PATTERN = re.compile(r"x\s*(\d*\.?\d+)", re.IGNORECASE)
+PER_SECOND_KEYWORDS = (
+    "shots/s",
+    "shots per second",
+    "shots/second",
+    "rounds per second",
+    "rounds/s",
+    "volleys/s",
+)
+
+
+def parse_numbers(value: Any) -> list[float]:
+    if value is None:
+        return []
+    return [float(match) for match in NUMBER_PATTERN.findall(str(value).replace(",", ""))]
+
+
+def parse_number(value: Any) -> Optional[float]:
+    numbers = parse_numbers(value)
+    return numbers[0] if numbers else None
+
+
+def parse_fire_rate(text: Optional[str]) -> float:
+    """Trigger pulls per second from a rate-of-fire cell; a volley counts as one shot."""
+    if not text:
+        return 0.0
+
+    lowered = text.lower()
+    numbers = parse_numbers(text)
+    if not numbers:
+        return 0.0
+
+    if any(keyword in lowered for keyword in PER_SECOND_KEYWORDS):
+        return max(numbers)
+
+    if ("shot per" in lowered or "swing per" in lowered or "shot every" in lowered or "swing every" in lowered) and "second" in lowered:
+        if len(numbers) >= 2 and numbers[1] > 0:
+            return numbers[0] / numbers[1]
+        if numbers[0] > 0:
+            return 1 / numbers[0]
+
+    if "seconds" in lowered or "second" in lowered:
+        seconds = numbers[0]
+        if seconds > 0:
+            return 1 / seconds
+
+    return max(numbers)
+
+
+def parse_damage_segments(text: Optional[str]) -> list[dict[str, Any]]:
+    """Split a damage cell such as ``"2 – 0.6 (per projectile) 22 - 6.6 (per volley)"``.
+
+    Each segment carries ``max``/``min`` (a single value has both equal) and the
+    ``qualifier`` that followed it, e.g. ``"per projectile"`` or ``"splash, enemy"``.
+    """
+    if not text:
+        return []
+    segments = []
+    for match in DAMAGE_SEGMENT_PATTERN.finditer(THOUSANDS_PATTERN.sub("", text)):
+        values = [float(match["first"])]
+        if match["second"] is not None:
+            values.append(float(match["second"]))
+        qualifier = ", ".join(part.strip() for part in (match["per"], match["note"]) if part)
+        segments.append({"max": max(values), "min": min(values), "qualifier": qualifier or None})
+    return segments
+
+
+def _listed_dps(details: Iterable[str]) -> Optional[float]:
+    for detail in details:
+        if "damage per second" in detail.lower():
+            return parse_number(detail)
+    return None
+
+
+def _range(text: Optional[str]) -> Optional[dict[str, float]]:
+    numbers = parse_numbers(text)
+    if len(numbers) < 2:
+        return None
+    return {"start": numbers[0], "end": numbers[1]}
+
+
+def normalize_weapon(weapon: dict[str, Any]) -> dict[str, Any]:
+    """Numeric view of one weapon record from :func:`herokit.extractors.extract_weapons`.
+
+    Computed once at extraction time and stored as ``weapon["stats"]`` so that
+    cmd-06 and fight.py read the same numbers instead of re-parsing the text.
+    ``shots_per_second`` counts trigger pulls (volleys); ``dps`` is
+    ``damage_per_projectile * projectiles_per_shot * shots_per_second``.
+    """
+    damage_text = (weapon.get("damage") or {}).get("damage")
+    damage_per_projectile = parse_number(damage_text)
+    projectiles_per_shot = parse_number(weapon.get("shots_per_volley"))
+    shots_per_second = parse_fire_rate(weapon.get("rate_of_fire"))
+    # Beam-style weapons list DPS in the damage field; treat that as damage/shot at 1 shot per second.
+    if shots_per_second == 0 and "per second" in str(damage_text).lower():
+        shots_per_second = 1.0
+
+    headshot = weapon.get("headshot") or ""
+    multiplier = HEADSHOT_PATTERN.search(headshot)
+    keywords = [keyword.lower() for keyword in weapon.get("keywords") or []]
+    return {
+        "version": STATS_VERSION,
+        "damage": parse_damage_segments(damage_text),
+        "damage_per_projectile": damage_per_projectile,
+        "projectiles_per_shot": projectiles_per_shot,
+        "shots_per_second": shots_per_second,
+        "dps": round((damage_per_projectile or 0.0) * (projectiles_per_shot or 1.0) * shots_per_second, 4),
+        "listed_dps": _listed_dps(weapon.get("additional_details") or []),
+        "ammo": parse_number(weapon.get("ammo")),
+        "reload_seconds": parse_number(weapon.get("reload_time")),
+        "headshot_multiplier": float(multiplier.group(1)) if "✓" in headshot and multiplier else None,
+        "critical": "✓" in headshot or "critical" in keywords,
+        "falloff_meters": _range(weapon.get("falloff_range")),
+    }
+
+
+def weapon_stats(weapon: dict[str, Any]) -> dict[str, Any]:
+    """The stored ``stats`` of ``weapon``, computed on the fly for files written before they existed."""
+    stats = weapon.get("stats")
+    if stats is not None and stats.get("version") == STATS_VERSION:
+        return stats
+    return normalize_weapon(weapon)
+
+
+def primary_weapon(weapons: Iterable[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """The first weapon that lists damage, else the first weapon."""
+    weapons = list(weapons)
+    for weapon in weapons:
+        if (weapon.get("damage") or {}).get("damage"):
+            return weapon
+    return next(iter(weapons), None)
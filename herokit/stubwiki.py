@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+import html
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import unquote, urlsplit
+
+from herokit.cache import CACHE_DIR_DEFAULT
+from herokit.models import Hero
+from herokit.pagestore import STORE_BACKENDS, content_hash, open_store
+from herokit.roster import HEROES_PATH, ROSTER_CSV_DEFAULT, read_heroes
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+FALLBACK_ROLE = "Heroes"
+
+
+@dataclass
+class StubBehavior:
+    """How the stub answers: every response waits ``latency`` ± ``jitter`` seconds,
+    and a fraction ``error_rate`` of requests fail with 503. With ``etag`` pages
+    carry ETag/Last-Modified headers and conditional requests get 304s.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    etag: bool = True
+    seed: Optional[int] = None
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    ok: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    not_found: int = 0
+    bytes: int = 0
+
+
+def navbox_html(heroes: Sequence[Hero]) -> str:
+    """A Heroes page whose navbox has the shape :func:`herokit.roster.extract_heroes` reads."""
+    by_role: dict[str, list[Hero]] = defaultdict(list)
+    for hero in heroes:
+        by_role[hero.role].append(hero)
+    rows = []
+    for role, members in by_role.items():
+        cells = "".join(
+            f'<td><a href="{html.escape(urlsplit(hero.url).path)}">{html.escape(hero.name)}</a></td>'
+            for hero in members
+        )
+        rows.append(f'<tr><th class="navbox-group">{html.escape(role)}</th>{cells}</tr>')
+    return (
+        "<!DOCTYPE html><html><head><title>Heroes</title></head><body>"
+        '<div class="mw-parser-output"><table class="navbox"><tbody>'
+        f"{''.join(rows)}</tbody></table></div></body></html>"
+    )
+
+
+def heroes_from_urls(urls: Sequence[str]) -> list[Hero]:
+    """Stand-in roster for cached pages when the real roster CSV is not available."""
+    return [
+        Hero(role=FALLBACK_ROLE, name=unquote(urlsplit(url).path.rsplit("/", 1)[-1]).replace("_", " "), url=url)
+        for url in urls
+    ]
+
+
+class StubWiki:
+    """Local HTTP stand-in for the wiki, serving pages by their original path.
+
+    ``pages`` maps original page URLs to HTML; ``https://overwatch.fandom.com/wiki/Ana``
+    is served at ``<base_url>/wiki/Ana``. The Heroes page is generated from
+    ``heroes``. Runs in a background thread between :meth:`start` and :meth:`close`
+    (or inside a ``with`` block); ``port`` 0 picks a free port.
+    """
+
+    def __init__(
+        self,
+        pages: dict[str, str],
+        heroes: Sequence[Hero],
+        behavior: Optional[StubBehavior] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.behavior = behavior or StubBehavior()
+        self.stats = StubStats()
+        self._pages = {urlsplit(url).path: page for url, page in pages.items()}
+        self._pages[HEROES_PATH] = navbox_html(heroes)
+        self._etags = {path: f'"{content_hash(page)[:16]}"' for path, page in self._pages.items()}
+        self._random = random.Random(self.behavior.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.wiki = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_cache(
+        cls,
+        cache_dir: Path,
+        *,
+        backend: str = "dir",
+        heroes: Optional[Sequence[Hero]] = None,
+        behavior: Optional[StubBehavior] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> StubWiki:
+        """Serve every page in a page cache; without ``heroes`` the navbox lists them all."""
+        with open_store(cache_dir, backend) as store:
+            pages = {url: page for url in store.urls() if (page := store.read(url)) is not None}
+        if heroes is None:
+            heroes = heroes_from_urls(sorted(pages))
+        else:
+            heroes = [hero for hero in heroes if hero.url in pages]
+        return cls(pages, heroes, behavior, host=host, port=port)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, url: str) -> str:
+        """The stub's URL for an original wiki URL."""
+        return self.base_url + urlsplit(url).path
+
+    def __enter__(self) -> StubWiki:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+    def respond(self, path: str, if_none_match: Optional[str]) -> tuple[int, dict[str, str], bytes]:
+        """Status, headers and body for a GET of ``path``, after the configured delay."""
+        with self._lock:
+            self.stats.requests += 1
+            delay = self.behavior.latency + self._random.uniform(-self.behavior.jitter, self.behavior.jitter)
+            fail = self._random.random() < self.behavior.error_rate
+        if delay > 0:
+            time.sleep(delay)
+
+        page = self._pages.get(path)
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if fail:
+            status, body = 503, b"Service Unavailable"
+        elif page is None:
+            status, body = 404, b"Not Found"
+        elif self.behavior.etag and if_none_match == self._etags[path]:
+            status, body = 304, b""
+        else:
+            status, body = 200, page.encode("utf-8")
+        if page is not None and self.behavior.etag and status in (200, 304):
+            headers["ETag"] = self._etags[path]
+            headers["Last-Modified"] = LAST_MODIFIED
+
+        with self._lock:
+            if status == 200:
+                self.stats.ok += 1
+            elif status == 304:
+                self.stats.not_modified += 1
+            elif status == 404:
+                self.stats.not_found += 1
+            else:
+                self.stats.errors += 1
+            self.stats.bytes += len(body)
+        return status, headers, body
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        wiki: StubWiki = self.server.wiki  # type: ignore[attr-defined]
+        status, headers, body = wiki.respond(urlsplit(self.path).path, self.headers.get("If-None-Match"))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--pages-dir",
+        type=Path,
+        default=CACHE_DIR_DEFAULT,
+        help=f"Page cache whose pages the stub serves (default: {CACHE_DIR_DEFAULT})",
+    )
+    parser.add_argument(
+        "--pages-backend",
+        choices=sorted(STORE_BACKENDS),
+        default="dir",
+        help="Storage backend of --pages-dir (default: dir)",
+    )
+    parser.add_argument(
+        "--roster",
+        type=Path,
+        default=ROSTER_CSV_DEFAULT,
+        help=(
+            "Hero CSV used to build the stub's Heroes navbox; if missing, every cached "
+            f"page is listed under one role (default: {ROSTER_CSV_DEFAULT})"
+        ),
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to --latency (default: 0)")
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 503 (default: 0)",
+    )
+    parser.add_argument(
+        "--no-etag",
+        dest="etag",
+        action="store_false",
+        help="Send no ETag/Last-Modified headers, so revalidation always re-downloads.",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for jitter and errors, for repeatable runs.")
+
+
+def stub_from_args(args: argparse.Namespace, *, port: int = 0) -> StubWiki:
+    heroes = read_heroes(args.roster) if args.roster.exists() else None
+    behavior = StubBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        etag=args.etag,
+        seed=args.seed,
+    )
+    return StubWiki.from_cache(args.pages_dir, backend=args.pages_backend, heroes=heroes, behavior=behavior, port=port)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from html import escape
+from typing import Optional
+
+from bs4 import BeautifulSoup, Comment
+
+# Bump whenever trim_html keeps or drops something different, so cached pages
+# record which rules produced them.
+TRIM_VERSION = 1
+
+DROPPED_TAGS = ["script", "style", "noscript", "link", "meta"]
+DROPPED_SELECTORS = "table.navbox, div.toc, div.mw-references-wrap"
+
+
+def trim_html(html: str) -> str:
+    """Reduce a Fandom page to its ``mw-parser-output`` article body.
+
+    Everything the extractors read (the portable infobox and the
+    ``.ability-details`` blocks with their section headings) lives inside the
+    article body; site chrome, scripts, navigation boxes and references do not.
+    Pages without an article body are returned unchanged.
+    """
+    trimmed = trim_article(html)
+    return html if trimmed is None else trimmed
+
+
+def trim_article(html: str) -> Optional[str]:
+    """Like :func:`trim_html`, but None for a page without an article body."""
+    soup = BeautifulSoup(html, "html.parser")
+    body = soup.select_one(".mw-parser-output")
+    if body is None:
+        return None
+
+    for tag in body.find_all(DROPPED_TAGS):
+        tag.decompose()
+    for tag in body.select(DROPPED_SELECTORS):
+        tag.decompose()
+    for comment in body.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    return (
+        "<!DOCTYPE html>\n"
+        f'<html><head><meta charset="utf-8"/><title>{escape(title)}</title></head>'
+        f"<body>{body}</body></html>\n"
+    )
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from herokit.montecarlo import np, require_numpy
+
+DETAILS_CSV_DEFAULT = Path("data-hero-details.csv")
+
+# Armor on a non-piercing bullet: half damage below this, otherwise a flat reduction (steven-fight-v2).
+ARMOR_FLAT_THRESHOLD = 14.0
+ARMOR_HALF_FACTOR = 0.50
+ARMOR_FLAT_REDUCTION = 7.0
+# Ratios like 250 / 12.5 can land a hair above a whole number; don't count an extra bullet for it.
+CEIL_TOLERANCE = 1e-9
+
+
+class DetailArrays:
+    """Columns of data-hero-details.csv, indexed like its rows. A missing ``ammo`` is an endless clip."""
+
+    def __init__(self, rows: Sequence[Mapping[str, str]]) -> None:
+        require_numpy()
+
+        def column(field: str) -> Any:
+            return np.array([float(row[field] or 0.0) for row in rows], dtype=np.float64)
+
+        self.names = [row["name"] for row in rows]
+        self.roles = [row["role"] for row in rows]
+        self.damage = column("damage_per_bullet")
+        self.bullets_per_shot = column("bullets_per_shot")
+        self.fire_rate = column("fire_rate")
+        self.reload_time = column("reload_time")
+        self.ammo = np.array([float(row["ammo"]) if row["ammo"] else np.inf for row in rows], dtype=np.float64)
+        self.armor_piercing = np.array([row["armor_piercing"] == "True" for row in rows])
+        self.health = column("health")
+        self.shields = column("shields")
+        self.armor = column("armor")
+
+    @classmethod
+    def from_csv(cls, path: Path = DETAILS_CSV_DEFAULT) -> DetailArrays:
+        if not path.exists():
+            raise FileNotFoundError(f"Could not find hero details CSV at {path}")
+        with path.open("r", encoding="utf-8", newline="") as handle:
+            return cls(list(csv.DictReader(handle)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _ceil(values: Any) -> Any:
+    return np.ceil(values - CEIL_TOLERANCE)
+
+
+def time_to_kill(
+    damage: Any,
+    bullets_per_shot: Any,
+    fire_rate: Any,
+    reload_time: Any,
+    ammo: Any,
+    armor_piercing: Any,
+    health: Any,
+    shields: Any,
+    armor: Any,
+) -> Any:
+    """Seconds for an attacker to empty a training dummy's health, shields and armor.
+
+    The closed form of steven-fight-v2.py: every bullet hits for full damage,
+    armor soaks ``armor / mitigated damage`` extra bullets, shots go out at
+    ``fire_rate`` and every emptied clip but the last costs a reload. Accepts
+    scalars or NumPy arrays and broadcasts them against each other; an
+    attacker who deals no damage never kills (``inf``).
+    """
+    require_numpy()
+    damage = np.asarray(damage, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mitigated = np.where(
+            armor_piercing,
+            damage,
+            np.where(damage < ARMOR_FLAT_THRESHOLD, damage * ARMOR_HALF_FACTOR, damage - ARMOR_FLAT_REDUCTION),
+        )
+        bullets = _ceil((health + shields) / damage + armor / mitigated)
+        shots = _ceil(bullets / bullets_per_shot)
+        # A kill on the last round of a clip needs no reload after it: 10 shots from a 5-round clip reload once.
+        reloads = np.maximum(np.floor(shots / ammo) - (np.mod(shots, ammo) == 0), 0)
+        seconds = shots / fire_rate + reload_time * reloads
+    kills = (damage > 0) & (mitigated > 0) & (np.asarray(fire_rate) > 0)
+    return np.where(kills, seconds, np.inf)
+
+
+def ttk_matrix(details: DetailArrays) -> Any:
+    """``matrix[a, d]``: seconds for hero ``a`` to kill hero ``d``, for every pair at once."""
+    return time_to_kill(
+        details.damage[:, None],
+        details.bullets_per_shot[:, None],
+        details.fire_rate[:, None],
+        details.reload_time[:, None],
+        details.ammo[:, None],
+        details.armor_piercing[:, None],
+        details.health[None, :],
+        details.shields[None, :],
+        details.armor[None, :],
+    )
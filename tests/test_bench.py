@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from herokit.bench import TARGETS, compare_results, load_pages, run_benchmarks
+from herokit.cache import PageCache
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "hero-pages"
+
+
+def result(pages_per_second: float, p50_ms: float, peak: int) -> dict[str, object]:
+    return {"targets": {"parse": {"pages_per_second": pages_per_second, "p50_ms": p50_ms, "peak_memory_bytes": peak}}}
+
+
+def test_run_benchmarks_reports_every_target() -> None:
+    pages = [(url, html) for url, html in load_pages(CACHE_DIR) if url.endswith("/Zenyatta")]
+
+    results = run_benchmarks(pages, repeat=1)
+
+    assert results["pages"] == 1
+    assert list(results["targets"]) == list(TARGETS)
+    parse = results["targets"]["parse"]
+    assert parse["pages_per_second"] > 0
+    assert parse["p50_ms"] <= parse["p99_ms"] <= parse["max_ms"]
+    assert parse["peak_memory_bytes"] > 0
+
+
+def test_load_pages_skips_raw_copies(tmp_path: Path) -> None:
+    page = '<html><nav>menu</nav><div class="mw-parser-output"><p>Ana</p></div></html>'
+    PageCache(tmp_path, trim=True, keep_raw=True).store("https://wiki.test/Ana", page)
+
+    assert [url for url, _ in load_pages(tmp_path)] == ["https://wiki.test/Ana"]
+
+
+def test_compare_flags_only_changes_beyond_threshold() -> None:
+    baseline = result(10.0, 100.0, 1000)
+
+    assert compare_results(result(9.0, 110.0, 1100), baseline, threshold=0.15) == []
+    regressions = compare_results(result(8.0, 120.0, 1200), baseline, threshold=0.15)
+    assert len(regressions) == 3
+    assert all(regression.startswith("parse:") for regression in regressions)
+    assert compare_results(result(8.0, 120.0, 1200), {"targets": {}}, threshold=0.15) == []
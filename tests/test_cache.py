@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from herokit.cache import PageCache
+from herokit.fetch import PageFetcher
+
+
+class WikiStub(BaseHTTPRequestHandler):
+    pages: dict[str, str] = {}
+    requests_seen: list[tuple[str, int]] = []
+
+    def do_GET(self) -> None:
+        body = self.pages[self.path]
+        etag = f'"{zlib.crc32(body.encode()):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.requests_seen.append((self.path, 304))
+            return
+
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.requests_seen.append((self.path, 200))
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def wiki() -> Iterator[str]:
+    WikiStub.pages = {"/wiki/Ana": "<p>Ana v1</p>", "/wiki/Mei": "<p>Mei v1</p>"}
+    WikiStub.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), WikiStub)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fresh_entries_are_served_without_requests(wiki: str, tmp_path: Path) -> None:
+    url = f"{wiki}/wiki/Ana"
+    with PageFetcher(rate_limit=None) as fetcher:
+        assert PageCache(tmp_path).fetch(url, fetcher) == "<p>Ana v1</p>"
+        assert PageCache(tmp_path, max_age=3600).fetch(url, fetcher) == "<p>Ana v1</p>"
+
+    assert WikiStub.requests_seen == [("/wiki/Ana", 200)]
+    entry = PageCache(tmp_path).entry(url)
+    assert entry is not None and entry.etag and entry.sha256
+
+
+def test_refresh_sends_conditional_requests(wiki: str, tmp_path: Path) -> None:
+    urls = [f"{wiki}/wiki/Ana", f"{wiki}/wiki/Mei"]
+    with PageFetcher(rate_limit=None) as fetcher:
+        for url in urls:
+            PageCache(tmp_path).fetch(url, fetcher)
+
+        WikiStub.pages["/wiki/Mei"] = "<p>Mei v2</p>"
+        cache = PageCache(tmp_path, refresh=True)
+        assert [cache.fetch(url, fetcher) for url in urls] == ["<p>Ana v1</p>", "<p>Mei v2</p>"]
+
+    assert WikiStub.requests_seen[2:] == [("/wiki/Ana", 304), ("/wiki/Mei", 200)]
+    assert cache.read(urls[1]) == "<p>Mei v2</p>"
+
+
+def test_max_age_expires_entries(wiki: str, tmp_path: Path) -> None:
+    url = f"{wiki}/wiki/Ana"
+    with PageFetcher(rate_limit=None) as fetcher:
+        PageCache(tmp_path).fetch(url, fetcher)
+        before = PageCache(tmp_path).entry(url)
+        time.sleep(0.05)
+        PageCache(tmp_path, max_age=0.01).fetch(url, fetcher)
+
+    after = PageCache(tmp_path).entry(url)
+    assert WikiStub.requests_seen == [("/wiki/Ana", 200), ("/wiki/Ana", 304)]
+    assert before is not None and after is not None
+    assert after.fetched_at > before.fetched_at
+
+
+def test_trimmed_cache_returns_the_same_text_on_miss_and_hit(wiki: str, tmp_path: Path) -> None:
+    WikiStub.pages["/wiki/Ana"] = '<html><body><nav>menu</nav><div class="mw-parser-output"><p>Ana</p></div></body></html>'
+    url = f"{wiki}/wiki/Ana"
+    with PageFetcher(rate_limit=None) as fetcher:
+        first = PageCache(tmp_path, trim=True).fetch(url, fetcher)
+        second = PageCache(tmp_path, trim=True).fetch(url, fetcher)
+        bodiless = PageCache(tmp_path, trim=True).fetch(f"{wiki}/wiki/Mei", fetcher)
+
+    assert first == second and "menu" not in first and "<p>Ana</p>" in first
+    assert PageCache(tmp_path).entry(url).trim_version is not None
+    # A page without an article body is stored untrimmed and recorded as such.
+    assert bodiless == "<p>Mei v1</p>"
+    assert PageCache(tmp_path).entry(f"{wiki}/wiki/Mei").trim_version is None
+
+
+def test_read_finds_pages_under_legacy_keys(tmp_path: Path) -> None:
+    url = "https://overwatch.fandom.com/wiki/Some Hero"
+    (tmp_path / "https%3A%2F%2Foverwatch.fandom.com%2Fwiki%2FSome+Hero.html").write_text(
+        "<p>legacy</p>", encoding="utf-8"
+    )
+
+    cache = PageCache(tmp_path)
+    assert cache.read(url) == "<p>legacy</p>"
+    assert cache.read("https://overwatch.fandom.com/wiki/Missing") is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    # Later stages find the legacy page the same way; reads never rewrite the shared index.
+    assert PageCache(tmp_path).read(url) == "<p>legacy</p>"
+    assert not cache.backend.index_path.exists()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from herokit.checkpoint import CheckpointedNdjson, ordered_records, read_ndjson
+
+
+def test_resume_drops_torn_record_and_skips_finished_keys(tmp_path: Path) -> None:
+    path = tmp_path / "weapons.ndjson"
+    with CheckpointedNdjson(path) as stream:
+        stream.write("a", {"url": "a", "weapons": []})
+        stream.write("b", {"url": "b", "weapons": []})
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"url": "c", "wea')
+
+    with CheckpointedNdjson(path, resume=True) as stream:
+        assert stream.done == {"a", "b"}
+        stream.write("c", {"url": "c", "weapons": [1]})
+
+    assert [record["url"] for record in read_ndjson(path)] == ["a", "b", "c"]
+
+
+def test_resume_drops_torn_journal_line_before_appending(tmp_path: Path) -> None:
+    path = tmp_path / "weapons.ndjson"
+    with CheckpointedNdjson(path) as stream:
+        stream.write("a", {"url": "a"})
+    with stream.journal_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"key": "b", "en')
+
+    with CheckpointedNdjson(path, resume=True) as stream:
+        assert stream.done == {"a"}
+        stream.write("b", {"url": "b"})
+        stream.write("c", {"url": "c"})
+
+    with CheckpointedNdjson(path, resume=True) as stream:
+        assert stream.done == {"a", "b", "c"}
+
+    assert [record["url"] for record in read_ndjson(path)] == ["a", "b", "c"]
+
+
+def test_without_resume_starts_over(tmp_path: Path) -> None:
+    path = tmp_path / "weapons.ndjson"
+    with CheckpointedNdjson(path) as stream:
+        stream.write("a", {"url": "a"})
+
+    with CheckpointedNdjson(path) as stream:
+        assert stream.done == set()
+
+    assert list(read_ndjson(path)) == []
+
+
+def test_ordered_records_follow_roster_and_keep_latest() -> None:
+    records = [{"url": "b", "n": 1}, {"url": "x", "n": 2}, {"url": "a", "n": 3}, {"url": "b", "n": 4}]
+
+    assert ordered_records(records, ["a", "b"]) == [{"url": "a", "n": 3}, {"url": "b", "n": 4}, {"url": "x", "n": 2}]
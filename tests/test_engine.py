@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from herokit.engine import extract_page, extract_pages, select_extractors
+from herokit.extractors import (
+    Extractor,
+    extract_ability_effects,
+    extract_shields,
+    extract_stats,
+    extract_weapons,
+)
+from herokit.fetch import Outcome
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "hero-pages"
+
+
+def test_single_pass_matches_individual_extractors() -> None:
+    html = (CACHE_DIR / "https%3A%2F%2Foverwatch.fandom.com%2Fwiki%2FZenyatta.html").read_text(encoding="utf-8")
+
+    result = extract_page(html, select_extractors())
+
+    assert result.errors == {}
+    assert result.values == {
+        "health": extract_stats(html),
+        "weapons": extract_weapons(html),
+        "ability_effects": extract_ability_effects(html),
+        "shields": extract_shields(html),
+    }
+    assert result.values["shields"] == 175
+
+
+def test_failing_extractor_does_not_stop_the_others() -> None:
+    def boom(soup: object) -> None:
+        raise RuntimeError("no infobox")
+
+    result = extract_page("<p>empty</p>", [Extractor("broken", 1, boom), *select_extractors(["shields"])])
+
+    assert isinstance(result.errors["broken"], RuntimeError)
+    assert result.values == {"shields": None}
+    assert set(result.extractor_seconds) == {"broken", "shields"}
+
+
+def test_unknown_extractor_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        select_extractors(["mana"])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_extract_pages_keeps_order_and_errors(jobs: int) -> None:
+    pages = [
+        Outcome(item="zenyatta", value=(CACHE_DIR / "https%3A%2F%2Foverwatch.fandom.com%2Fwiki%2FZenyatta.html").read_text(encoding="utf-8")),
+        Outcome(item="offline", error=ConnectionError("timed out")),
+        Outcome(item="empty", value="<p>empty</p>"),
+        Outcome(item="unparsed", value=None),
+    ]
+
+    results = list(extract_pages(pages, select_extractors(["health", "shields"]), jobs=jobs))
+
+    assert [result.item for result in results] == ["zenyatta", "offline", "empty", "unparsed"]
+    assert results[0].value.values["shields"] == 175
+    assert isinstance(results[1].error, ConnectionError)
+    assert isinstance(results[2].value.errors["health"], RuntimeError)
+    assert isinstance(results[3].error, TypeError)
+
+
+def _large_page(index: int) -> str:
+    rows = "".join(f'<tr><td>row {row}</td><td><a href="/wiki/{row}">{row}</a></td></tr>' for row in range(1000))
+    return f'<html><body><div class="mw-parser-output"><h1>Page {index}</h1><table>{rows}</table></div></body></html>'
+
+
+def test_extract_pages_holds_one_parsed_page_at_a_time() -> None:
+    pages = [_large_page(index) for index in range(5)]
+    extractors = select_extractors(["shields"])
+
+    def peak_bytes(count: int) -> int:
+        tracemalloc.reset_peak()
+        for _ in extract_pages((Outcome(item=index, value=page) for index, page in enumerate(pages[:count])), extractors):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+
+    # With the cyclic GC off, any tree that is not released explicitly stays alive until the end.
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        one_page = peak_bytes(1)
+        all_pages = peak_bytes(len(pages))
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+
+    assert all_pages < 1.5 * one_page
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+import pytest
+
+from herokit.duel import A_WINS, B_WINS, DRAW, STALEMATE, SUPPORT_REGEN
+from herokit.events import EventDuel, simulate_event_duel
+from herokit.models import HeroStats, Weapon
+
+
+def make_hero(
+    name: str,
+    *,
+    role: str = "Hero",
+    health: float = 200.0,
+    armor: float = 0.0,
+    damage: Optional[float] = 10.0,
+    shots_per_second: float = 1.0,
+    dps: float = 0.0,
+    ammo: Optional[float] = None,
+    reload_seconds: Optional[float] = None,
+) -> HeroStats:
+    weapon = Weapon(
+        name=f"{name} gun",
+        effect_type="Hitscan",
+        damage_per_projectile=damage,
+        projectiles_per_shot=1.0 if damage else None,
+        shots_per_second=shots_per_second,
+        dps=dps or (damage or 0.0) * shots_per_second,
+        ammo=ammo,
+        reload_seconds=reload_seconds,
+        critical=False,
+    )
+    return HeroStats(role=role, name=name, url="", health=health, armor=armor, shields=0.0, weapon=weapon)
+
+
+def shot_times(log: list[tuple[float, str]], shooter: str) -> list[float]:
+    return [seconds for seconds, text in log if text.startswith(f"{shooter} hits")]
+
+
+def test_reload_starts_after_the_last_shots_recovery() -> None:
+    gunner = make_hero("Gunner", damage=1.0, shots_per_second=2.0, ammo=3, reload_seconds=1.5)
+    wall = make_hero("Wall", health=1000.0, damage=None, shots_per_second=0.0)
+    log: list[tuple[float, str]] = []
+
+    duel = simulate_event_duel(gunner, wall, max_seconds=6, log=lambda seconds, text: log.append((seconds, text)))
+
+    assert shot_times(log, "Gunner") == [0.0, 0.5, 1.0, 3.0, 3.5, 4.0]
+    assert [seconds for seconds, text in log if text == "Gunner reloads"] == [3.0]
+    assert duel.outcome == STALEMATE
+    assert duel.seconds == 6.0
+    assert (duel.shots_a, duel.shots_b) == (6, 0)
+
+
+def test_the_faster_killer_wins_at_the_moment_of_the_kill() -> None:
+    fast = make_hero("Fast", health=100.0, damage=25.0, shots_per_second=4.0)
+    slow = make_hero("Slow", health=100.0, damage=50.0, shots_per_second=1.0)
+
+    duel = simulate_event_duel(fast, slow)
+
+    # Fast needs 4 shots (0, 0.25, 0.5, 0.75s); Slow's second shot would land at 1s.
+    assert duel.outcome == A_WINS
+    assert duel.seconds == pytest.approx(0.75)
+
+
+def test_heroes_killing_each_other_in_the_same_instant_draw() -> None:
+    left = make_hero("Left", health=30.0, damage=10.0)
+    right = make_hero("Right", health=30.0, damage=10.0)
+
+    duel = simulate_event_duel(left, right)
+
+    assert duel.outcome == DRAW
+    assert duel.seconds == 2.0
+
+
+def test_support_regenerates_only_after_a_second_without_damage() -> None:
+    support = make_hero("Medic", role="Support", health=100.0, damage=None, shots_per_second=0.0)
+    attacker = make_hero("Burst", damage=20.0, shots_per_second=1.0, ammo=2, reload_seconds=10.0)
+    log: list[tuple[float, str]] = []
+
+    duel = simulate_event_duel(attacker, support, max_seconds=5, log=lambda seconds, text: log.append((seconds, text)))
+
+    # Hit at 0s and 1s; the regen ticks at 1s and 2s fall within a second of a hit.
+    assert [seconds for seconds, text in log if "regains" in text] == [3.0, 4.0]
+    assert duel.outcome == STALEMATE
+    assert sum(1 for _, text in log if f"regains {SUPPORT_REGEN:.1f} HP" in text) == 2
+
+
+def test_sustained_weapons_deal_their_dps_in_ticks() -> None:
+    beam = make_hero("Beam", damage=None, shots_per_second=0.0, dps=100.0)
+    target = make_hero("Target", health=95.0, damage=None, shots_per_second=0.0)
+
+    duel = simulate_event_duel(beam, target)
+
+    assert duel.outcome == A_WINS
+    assert duel.seconds == pytest.approx(0.9)
+    assert duel.shots_a == 10
+
+
+def test_seeded_duels_are_repeatable() -> None:
+    a = make_hero("A", role="Damage", health=250.0, damage=40.0, shots_per_second=2.0, ammo=6, reload_seconds=1.5)
+    b = make_hero("B", role="Damage", health=250.0, damage=45.0, shots_per_second=2.0, ammo=6, reload_seconds=1.5)
+    a.weapon.critical = b.weapon.critical = True
+
+    def run() -> list[EventDuel]:
+        rng = random.Random(3)
+        return [simulate_event_duel(a, b, rng=rng) for _ in range(200)]
+
+    first = run()
+
+    assert first == run()
+    assert {A_WINS, B_WINS} <= {duel.outcome for duel in first}  # crits decide some duels each way
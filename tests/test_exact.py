@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+from pathlib import Path
+
+import pytest
+
+import fight
+from herokit.duel import OUTCOMES
+from herokit.exact import solve_duel
+from herokit.models import HeroStats, load_hero_stats
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def heroes() -> list[HeroStats]:
+    return load_hero_stats(ROOT / "hero-health.csv", ROOT / "hero-weapons.json")
+
+
+def test_without_crits_every_pair_is_certain_and_matches_the_scalar_engine(heroes: list[HeroStats]) -> None:
+    steady = [dataclasses.replace(hero, weapon=dataclasses.replace(hero.weapon, critical=False)) for hero in heroes]
+
+    for hero_a in steady:
+        for hero_b in steady:
+            outcome, rounds = fight.run_duel(hero_a, hero_b, 30)
+            result = solve_duel(hero_a, hero_b)
+
+            assert result.probabilities[outcome] == 1.0, (hero_a.name, hero_b.name)
+            assert result.expected_rounds == rounds
+
+
+def test_crit_odds_agree_with_the_monte_carlo_engine(heroes: list[HeroStats]) -> None:
+    np = pytest.importorskip("numpy")
+    from herokit.montecarlo import simulate_pair
+
+    names = [hero.name for hero in heroes]
+    a, b = names.index("Wrecking Ball"), names.index("Mauga")  # the pair with the most fight states
+    duels = 200_000
+
+    exact = solve_duel(heroes[a], heroes[b])
+    sampled = simulate_pair(heroes, a, b, duels, rng=np.random.default_rng(11))
+
+    assert sum(exact.probabilities) == pytest.approx(1.0)
+    assert exact.states > 100
+    for name, probability in exact.rates().items():
+        tolerance = 4 * math.sqrt(probability * (1 - probability) / duels) + 1e-9
+        assert abs(sampled.rates()[name] - probability) <= tolerance, name
+    assert float(sampled.rounds.mean()) == pytest.approx(exact.expected_rounds, abs=0.02)
+
+
+def test_round_limit_leaves_a_stalemate(heroes: list[HeroStats]) -> None:
+    names = [hero.name for hero in heroes]
+    result = solve_duel(heroes[names.index("Wrecking Ball")], heroes[names.index("Mauga")], max_rounds=1)
+
+    assert set(result.rates()) == set(OUTCOMES)
+    assert result.rates()["stalemate"] > 0
+    assert result.expected_rounds == 1
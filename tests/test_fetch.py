@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from herokit.fetch import HostRateLimiter, PageFetcher
+from herokit.metrics import Metrics
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        # Earlier pages answer more slowly so completion order differs from request order.
+        index = int(self.path.rsplit("/", 1)[-1])
+        time.sleep(0.05 * (5 - index % 5))
+        body = f"page {index}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def server() -> Iterator[str]:
+    SlowHandler.in_flight = 0
+    SlowHandler.peak = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_map_returns_results_in_input_order(server: str) -> None:
+    urls = [f"{server}/wiki/{index}" for index in range(10)]
+    with PageFetcher(concurrency=4, rate_limit=None) as fetcher:
+        outcomes = list(fetcher.map(fetcher.fetch_text, urls))
+
+    assert [outcome.item for outcome in outcomes] == urls
+    assert [outcome.value for outcome in outcomes] == [f"page {index}" for index in range(10)]
+    assert all(outcome.error is None for outcome in outcomes)
+
+
+def test_fetcher_records_metrics(server: str) -> None:
+    metrics = Metrics("test")
+    with PageFetcher(concurrency=2, rate_limit=None, metrics=metrics) as fetcher:
+        list(fetcher.map(fetcher.fetch_text, [f"{server}/wiki/{index}" for index in range(3)]))
+
+    assert sorted((fetch.url.rsplit("/", 1)[-1], fetch.bytes, fetch.status) for fetch in metrics.fetches) == [
+        ("0", 6, 200),
+        ("1", 6, 200),
+        ("2", 6, 200),
+    ]
+    assert all(fetch.seconds > 0 for fetch in metrics.fetches)
+
+
+def test_map_respects_concurrency_cap(server: str) -> None:
+    urls = [f"{server}/wiki/{index}" for index in range(12)]
+    with PageFetcher(concurrency=3, rate_limit=None) as fetcher:
+        list(fetcher.map(fetcher.fetch_text, urls))
+
+    assert 1 < SlowHandler.peak <= 3
+
+
+def test_map_reports_errors_per_item() -> None:
+    def explode(item: int) -> int:
+        if item == 2:
+            raise ValueError("boom")
+        return item * 10
+
+    with PageFetcher(concurrency=2, rate_limit=None) as fetcher:
+        outcomes = list(fetcher.map(explode, range(4)))
+
+    assert [outcome.value for outcome in outcomes] == [0, 10, None, 30]
+    assert isinstance(outcomes[2].error, ValueError)
+
+
+def test_rate_limiter_spaces_requests_per_host() -> None:
+    limiter = HostRateLimiter(per_second=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://example.test/a")
+    limiter.wait("http://other.test/a")
+    elapsed = time.monotonic() - start
+
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_map_window_bounds_pages_held_ahead() -> None:
+    submitted = []
+
+    def items() -> Iterator[int]:
+        for index in range(10):
+            submitted.append(index)
+            yield index
+
+    with PageFetcher(concurrency=4, rate_limit=None) as fetcher:
+        outcomes = fetcher.map(lambda index: index * 2, items(), window=3)
+        first = next(outcomes)
+        ahead = len(submitted)
+        rest = [outcome.value for outcome in outcomes]
+
+    assert first.value == 0
+    assert ahead == 3
+    assert rest == [index * 2 for index in range(1, 10)]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from herokit.herodb import SCHEMA_VERSION, HeroStore
+from herokit.models import AbilityEffect
+
+WEAPONS = [
+    {"name": "Melee", "damage": {"damage": ""}},
+    {"name": "Peacekeeper", "damage": {"damage": "70"}, "rate_of_fire": "2 shots per second", "ammo": "6"},
+]
+
+
+def test_saves_from_each_stage_join_into_hero_rows(tmp_path: Path) -> None:
+    path = tmp_path / "heroes.sqlite3"
+    with HeroStore(path) as store:
+        assert store.schema_version == SCHEMA_VERSION
+        store.save_weapons("Damage", "Cassidy", "/cassidy", WEAPONS)
+        store.save_health("Damage", "Cassidy", "/cassidy", health=225, armor=None)
+        store.save_shields("Damage", "Cassidy", "/cassidy", None)
+        store.save_ability_effects("Damage", "Cassidy", "/cassidy", [AbilityEffect("Cassidy", "Flashbang")])
+        store.save_weapons("Tank", "Orisa", "/orisa", WEAPONS)
+
+    with HeroStore(path) as store:
+        rows = store.hero_rows()
+        assert [row["name"] for row in rows] == ["Cassidy"]  # Orisa has no health pool yet
+        assert rows[0]["weapon_name"] == "Peacekeeper"
+        assert rows[0]["dps"] == 140
+        assert rows[0]["ammo"] == 6
+        assert store.hero_rows(role="Tank") == []
+        assert store.ability_effects("Cassidy") == [AbilityEffect("Cassidy", "Flashbang")]
+        assert store.heroes()[0].weapon.damage_per_shot == 70
+
+
+def test_remove_hero_drops_its_rows(tmp_path: Path) -> None:
+    with HeroStore(tmp_path / "heroes.sqlite3") as store:
+        store.save_weapons("Damage", "Cassidy", "/cassidy", WEAPONS)
+        store.save_health("Damage", "Cassidy", "/cassidy", health=225, armor=None)
+        store.save_ability_effects("Damage", "Cassidy", "/cassidy", [AbilityEffect("Cassidy", "Flashbang")])
+
+        store.remove_hero("Cassidy")
+
+        assert store.hero_rows() == []
+        assert store.ability_effects("Cassidy") == []
+        assert store.connection.execute("SELECT COUNT(*) FROM weapons").fetchone()[0] == 0
+
+
+def test_two_stages_can_write_to_one_store_at_once(tmp_path: Path) -> None:
+    path = tmp_path / "heroes.sqlite3"
+    with HeroStore(path) as health_stage, HeroStore(path) as weapons_stage:
+        for store in (health_stage, weapons_stage):
+            store.connection.execute("PRAGMA busy_timeout = 100")  # fail fast instead of waiting 30s
+        health_stage.save_health("Damage", "Cassidy", "/cassidy", health=225, armor=None)
+        weapons_stage.save_weapons("Damage", "Cassidy", "/cassidy", WEAPONS)
+        health_stage.save_health("Tank", "Orisa", "/orisa", health=275, armor=350)
+        weapons_stage.save_weapons("Tank", "Orisa", "/orisa", WEAPONS)
+
+    with HeroStore(path) as store:
+        assert [row["name"] for row in store.hero_rows()] == ["Cassidy", "Orisa"]
+
+
+def test_refuses_database_from_newer_code(tmp_path: Path) -> None:
+    path = tmp_path / "heroes.sqlite3"
+    with sqlite3.connect(path) as connection:
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    with pytest.raises(RuntimeError, match="newer"):
+        HeroStore(path)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+import fight
+from herokit.models import HeroStats, load_hero_stats
+
+np = pytest.importorskip("numpy")
+from herokit.matrix import run_matrix, write_matrix_csv, write_matrix_json  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def heroes() -> list[HeroStats]:
+    return load_hero_stats(ROOT / "hero-health.csv", ROOT / "hero-weapons.json")[:4]
+
+
+def test_seeded_matrix_does_not_depend_on_worker_count(heroes: list[HeroStats]) -> None:
+    progress: list[tuple[int, int]] = []
+
+    serial = run_matrix(heroes, duels=300, seed=11, progress=lambda done, total: progress.append((done, total)))
+    pooled = run_matrix(heroes, duels=300, seed=11, jobs=2)
+
+    assert np.array_equal(serial.counts, pooled.counts)
+    assert np.allclose(serial.mean_ttk, pooled.mean_ttk, equal_nan=True)
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert (serial.counts.sum(axis=2) == 300).all()
+
+
+def test_mirror_matches_are_symmetric_and_outputs_are_written(heroes: list[HeroStats], tmp_path: Path) -> None:
+    matrix = run_matrix(heroes, duels=2000, seed=3)
+
+    # A hero against itself wins as often as it loses, up to sampling noise.
+    wins = np.diagonal(matrix.counts[:, :, 0])
+    losses = np.diagonal(matrix.counts[:, :, 1])
+    assert (abs(wins - losses) < 200).all()
+
+    write_matrix_csv(matrix, tmp_path / "matrix.csv")
+    write_matrix_json(matrix, tmp_path / "matrix.json")
+    with (tmp_path / "matrix.csv").open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    data = json.loads((tmp_path / "matrix.json").read_text(encoding="utf-8"))
+
+    assert len(rows) == 16
+    assert rows[1]["hero_a"] == heroes[0].name and rows[1]["hero_b"] == heroes[1].name
+    assert float(rows[1]["win_rate"]) == data["win_rate"][0][1]
+    assert [hero["name"] for hero in data["heroes"]] == [hero.name for hero in heroes]
+
+
+def test_duel_counts_must_be_positive() -> None:
+    assert fight.positive_int("250") == 250
+    for value in ("0", "-5"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            fight.positive_int(value)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from herokit.cache import CacheStats
+from herokit.metrics import Metrics
+
+
+def test_report_aggregates_pages_and_extractors(tmp_path: Path) -> None:
+    metrics = Metrics("cmd-test")
+    metrics.record_page("/fast", 0.1, {"health": 0.01, "weapons": 0.02})
+    metrics.record_page("/slow", 0.5, {"health": 0.03, "weapons": 0.2})
+    metrics.record_page("/reused", 0.0, {})
+    metrics.record_fetch("/slow", 1.5, 2048, 200)
+    metrics.add_counters("cache", CacheStats(hits=3, misses=1))
+    with metrics.phase("write"):
+        pass
+
+    path = tmp_path / "metrics.json"
+    metrics.write(path)
+    report = json.loads(path.read_text(encoding="utf-8"))
+
+    assert [page["page"] for page in report["pages"]] == ["/fast", "/slow"]
+    assert report["extractors"]["weapons"]["calls"] == 2
+    assert report["extractors"]["weapons"]["max_seconds"] == 0.2
+    assert report["fetch"] == {"count": 1, "total_seconds": 1.5, "total_bytes": 2048}
+    assert report["counters"]["cache"]["hits"] == 3
+    assert "write" in report["phases"]
+
+    table = metrics.summary_table().splitlines()
+    slowest_page = table.index(next(line for line in table if line.startswith("Slowest pages"))) + 2
+    assert table[slowest_page].endswith("/slow")
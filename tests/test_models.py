@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from herokit.models import HealthPool, load_health_pools, load_hero_stats
+
+
+def test_load_hero_stats_joins_pools_and_primary_weapons(tmp_path: Path) -> None:
+    roster = tmp_path / "heroes.csv"
+    roster.write_text("role,name,url\nDamage,Cassidy,/cassidy\nTank,Orisa,/orisa\nSupport,Ana,/ana\n", encoding="utf-8")
+    health = tmp_path / "health.csv"
+    health.write_text("role,name,health,armor\nTank,Orisa,275,300\nDamage,Cassidy,225,\n", encoding="utf-8")
+    shields = tmp_path / "shields.csv"
+    shields.write_text("role,name,shields\nTank,Orisa,\n", encoding="utf-8")
+    weapons = tmp_path / "weapons.json"
+    melee = {"name": "Melee", "damage": {"damage": ""}}
+    gun = {"name": "Peacekeeper", "damage": {"damage": "70"}, "rate_of_fire": "2 shots per second", "ammo": "6"}
+    records = [{"name": name, "weapons": [melee, gun]} for name in ("Cassidy", "Orisa", "Ana")]
+    weapons.write_text(json.dumps(records), encoding="utf-8")
+
+    assert load_health_pools(health, shields)[0] == HealthPool("Tank", "Orisa", 275.0, 300.0, None)
+
+    by_roster = load_hero_stats(health, weapons, shields_csv=shields, roster_csv=roster)
+    assert [(hero.name, hero.url) for hero in by_roster] == [("Cassidy", "/cassidy"), ("Orisa", "/orisa")]
+    assert by_roster[0].armor == 0.0
+    assert by_roster[0].weapon.name == "Peacekeeper"
+    assert by_roster[0].weapon.dps == 140
+    assert [hero.name for hero in load_hero_stats(health, weapons)] == ["Orisa", "Cassidy"]
+    assert not hasattr(by_roster[0], "__dict__")
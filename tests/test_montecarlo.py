@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+import fight
+from herokit.duel import A_WINS, OUTCOMES
+from herokit.models import HeroStats, load_hero_stats
+
+np = pytest.importorskip("numpy")
+from herokit.montecarlo import simulate_duels, simulate_pair  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def heroes() -> list[HeroStats]:
+    return load_hero_stats(ROOT / "hero-health.csv", ROOT / "hero-weapons.json")
+
+
+def test_without_crits_every_pair_matches_the_scalar_engine(heroes: list[HeroStats]) -> None:
+    # Crits are the only randomness, so without them both engines must agree duel for duel.
+    steady = [dataclasses.replace(hero, weapon=dataclasses.replace(hero.weapon, critical=False)) for hero in heroes]
+    pairs = [(a, b) for a in range(len(steady)) for b in range(len(steady)) if a != b]
+
+    results = simulate_duels(steady, [a for a, _ in pairs], [b for _, b in pairs])
+
+    expected = [fight.run_duel(steady[a], steady[b], 30) for a, b in pairs]
+    assert results.outcome.tolist() == [outcome for outcome, _ in expected]
+    assert results.rounds.tolist() == [rounds for _, rounds in expected]
+
+
+def test_crit_win_rates_agree_with_the_scalar_engine(heroes: list[HeroStats]) -> None:
+    names = [hero.name for hero in heroes]
+    a, b = names.index("Ashe"), names.index("Widowmaker")
+    duels = 4000
+    random.seed(7)
+    scalar = sum(fight.run_duel(heroes[a], heroes[b], 30)[0] == A_WINS for _ in range(duels)) / duels
+
+    batched = simulate_pair(heroes, a, b, 200_000, rng=np.random.default_rng(7)).rates()["a_wins"]
+
+    assert 0.05 < batched < 0.95  # a pair whose result actually depends on the crit draws
+    assert abs(scalar - batched) < 4 * math.sqrt(batched * (1 - batched) / duels)
+
+
+def test_results_count_every_outcome(heroes: list[HeroStats]) -> None:
+    results = simulate_pair(heroes, 0, 1, 1000, rng=np.random.default_rng(1))
+
+    assert sum(results.counts().values()) == 1000
+    assert set(results.counts()) == set(OUTCOMES)
+    assert results.rounds.min() >= 1
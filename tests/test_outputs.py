@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from herokit.models import AbilityEffect
+from herokit.outputs import AbilityCsvWriter, JsonArrayWriter, write_ability_csv, write_weapons_json
+
+RECORDS = [
+    {"role": "Support", "name": "Lúcio", "url": "/wiki/L%C3%BAcio", "weapons": [{"name": "Sonic Amplifier"}]},
+    {"role": "Tank", "name": "Orisa", "url": "/wiki/Orisa", "weapons": []},
+]
+
+
+def test_streamed_json_matches_write_weapons_json(tmp_path: Path) -> None:
+    for records in (RECORDS, []):
+        write_weapons_json(records, tmp_path / "whole.json")
+        with JsonArrayWriter(tmp_path / "streamed.json") as writer:
+            for record in records:
+                writer.write(record)
+
+        assert (tmp_path / "streamed.json").read_bytes() == (tmp_path / "whole.json").read_bytes()
+
+
+def test_streamed_ability_csv_matches_write_ability_csv(tmp_path: Path) -> None:
+    effects = [AbilityEffect("Ana", "Nano Boost", "50%", "50%", "8 seconds"), AbilityEffect("Mercy", "Caduceus Staff")]
+    write_ability_csv(effects, tmp_path / "whole.csv")
+    with AbilityCsvWriter(tmp_path / "streamed.csv") as writer:
+        for effect in effects:
+            writer.write([effect])
+
+    assert (tmp_path / "streamed.csv").read_bytes() == (tmp_path / "whole.csv").read_bytes()
+
+
+def test_streams_that_fail_keep_the_previous_output(tmp_path: Path) -> None:
+    for writer_class, name in ((JsonArrayWriter, "weapons.json"), (AbilityCsvWriter, "abilities.csv")):
+        path = tmp_path / name
+        path.write_text("previous run\n", encoding="utf-8")
+        with pytest.raises(RuntimeError):
+            with writer_class(path):
+                raise RuntimeError("page failed to parse")
+
+        assert path.read_text(encoding="utf-8") == "previous run\n"
+        assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from herokit.cache import PageCache
+from herokit.pagestore import CacheEntry, DirectoryStore, PackStore, cache_key, content_hash
+
+
+def _entry(url: str, html: str, fetched_at: float = 1.0) -> CacheEntry:
+    return CacheEntry(url=url, fetched_at=fetched_at, sha256=content_hash(html))
+
+
+def test_pack_store_round_trips_pages(tmp_path: Path) -> None:
+    store = PackStore(tmp_path)
+    pages = {f"https://wiki.test/{name}": f"<p>{name}</p>" * 200 for name in ("Ana", "Mei", "Sigma")}
+    for url, html in pages.items():
+        store.write(_entry(url, html), html)
+
+    reopened = PackStore(tmp_path)
+    assert reopened.urls() == sorted(pages)
+    for url, html in pages.items():
+        assert reopened.read(url) == html
+        assert reopened.entry(url).sha256 == content_hash(html)
+    assert reopened.read("https://wiki.test/Missing") is None
+    assert reopened.pack_path.stat().st_size < sum(len(html) for html in pages.values())
+
+
+def test_pack_store_releases_its_map_on_close(tmp_path: Path) -> None:
+    with PackStore(tmp_path) as store:
+        store.write(_entry("https://wiki.test/Ana", "<p>Ana</p>"), "<p>Ana</p>")
+        assert store.read("https://wiki.test/Ana") == "<p>Ana</p>"
+        assert store._mmap is not None
+    assert store._mmap is None
+
+
+def test_pack_store_keeps_history_and_skips_duplicates(tmp_path: Path) -> None:
+    store = PackStore(tmp_path)
+    url = "https://wiki.test/Ana"
+    store.write(_entry(url, "<p>v1</p>"), "<p>v1</p>")
+    size_after_first = store.pack_path.stat().st_size
+    store.write(_entry(url, "<p>v1</p>", fetched_at=2.0), "<p>v1</p>")
+    assert store.pack_path.stat().st_size == size_after_first
+    assert store.entry(url).fetched_at == 2.0
+
+    store.write(_entry(url, "<p>v2</p>", fetched_at=3.0), "<p>v2</p>")
+    assert store.read(url) == "<p>v2</p>"
+    assert [store.read_version(version) for version in store.history(url)] == ["<p>v1</p>", "<p>v2</p>"]
+
+
+def test_pack_index_can_be_rebuilt_from_the_pack(tmp_path: Path) -> None:
+    store = PackStore(tmp_path)
+    for version in ("v1", "v2"):
+        html = f"<p>{version}</p>"
+        store.write(_entry("https://wiki.test/Ana", html), html)
+    store.write(_entry("https://wiki.test/Mei", "<p>mei</p>"), "<p>mei</p>")
+    store.index_path.unlink()
+
+    rebuilt = PackStore(tmp_path)
+    rebuilt.rebuild_index()
+    assert rebuilt.read("https://wiki.test/Ana") == "<p>v2</p>"
+    assert rebuilt.read("https://wiki.test/Mei") == "<p>mei</p>"
+    assert len(rebuilt.history("https://wiki.test/Ana")) == 2
+
+
+def test_page_cache_reads_through_pack_backend(tmp_path: Path) -> None:
+    writer = PageCache(tmp_path, backend="pack")
+    writer.store("https://wiki.test/Ana", "<p>Ana</p>")
+
+    reader = PageCache(tmp_path, backend="pack")
+    assert reader.read("https://wiki.test/Ana") == "<p>Ana</p>"
+    assert reader.stats.hits == 1
+
+
+def test_pack_store_rewrites_a_page_stored_with_another_trim_mode(tmp_path: Path) -> None:
+    url = "https://wiki.test/Ana"
+    page = '<html><nav>menu</nav><div class="mw-parser-output"><p>Ana</p></div></html>'
+
+    PageCache(tmp_path, backend="pack", trim=True).store(url, page)
+    untrimmed = PageCache(tmp_path, backend="pack")
+    untrimmed.store(url, page)
+    assert untrimmed.entry(url).trim_version is None
+    assert untrimmed.read_raw(url) == page
+
+    trimmed = PageCache(tmp_path, backend="pack", trim=True)
+    trimmed.store(url, page)
+    assert trimmed.entry(url).trim_version is not None
+    assert "menu" not in trimmed.read(url)
+    assert len(trimmed.backend.history(url)) == 3
+
+
+def test_directory_store_lists_urls_with_plus_and_space(tmp_path: Path) -> None:
+    urls = ["https://wiki.test/C++", "https://wiki.test/Soldier: 76", "https://wiki.test/a%2Bb"]
+    store = DirectoryStore(tmp_path)
+    for url in urls:
+        (tmp_path / f"{cache_key(url)}.html").write_text("<p></p>", encoding="utf-8")
+    # Pages cached before cache_key switched from quote_plus spell spaces as "+".
+    (tmp_path / "https%3A%2F%2Fwiki.test%2FSome+Hero.html").write_text("<p></p>", encoding="utf-8")
+
+    assert store.urls() == sorted([*urls, "https://wiki.test/Some Hero"])
+
+
+def test_directory_store_reads_leave_the_index_alone(tmp_path: Path) -> None:
+    url = "https://wiki.test/Some Hero"
+    (tmp_path / "https%3A%2F%2Fwiki.test%2FSome+Hero.html").write_text("<p>legacy</p>", encoding="utf-8")
+
+    assert DirectoryStore(tmp_path).read(url) == "<p>legacy</p>"
+    assert not (tmp_path / "index.json").exists()
+
+
+def test_directory_stores_can_write_one_index_at_once(tmp_path: Path) -> None:
+    # Each stage opens its own store on the shared cache.
+    stores = [DirectoryStore(tmp_path) for _ in range(4)]
+    urls = [f"https://wiki.test/Hero {number}" for number in range(40)]
+
+    def write(number: int) -> None:
+        stores[number % len(stores)].write(_entry(urls[number], "<p></p>"), "<p></p>")
+
+    with ThreadPoolExecutor(max_workers=len(stores)) as pool:
+        list(pool.map(write, range(len(urls))))
+
+    assert DirectoryStore(tmp_path).urls() == sorted(urls)
+    assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from functools import cache
+from pathlib import Path
+
+import pytest
+
+from herokit.extractors import (
+    PARSER_BACKENDS,
+    extract_shields,
+    extract_stats,
+    extract_weapons,
+    parse_html,
+    read_ability_rows,
+)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "hero-pages"
+PAGES = sorted(CACHE_DIR.glob("*.html"))
+
+
+def _extract_all(html: str, backend: str) -> dict[str, object]:
+    soup = parse_html(html, backend)
+    return {
+        "health": extract_stats(soup),
+        "weapons": extract_weapons(soup),
+        "shields": extract_shields(soup),
+        "ability_rows": list(read_ability_rows(soup)),
+    }
+
+
+@cache
+def _reference(page: Path) -> dict[str, object]:
+    return _extract_all(page.read_text(encoding="utf-8"), "html.parser")
+
+
+@pytest.mark.parametrize("backend", [backend for backend in PARSER_BACKENDS if backend != "html.parser"])
+def test_backends_match_html_parser_on_cached_pages(backend: str) -> None:
+    if backend.endswith("lxml"):
+        pytest.importorskip("lxml")
+    if not PAGES:
+        pytest.skip("no cached hero pages")
+
+    for page in PAGES:
+        assert _extract_all(page.read_text(encoding="utf-8"), backend) == _reference(page), page.name
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        parse_html("<p></p>", "html5")
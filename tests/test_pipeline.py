@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from herokit.pipeline import Pipeline, Stage
+
+COPY = "import sys; open(sys.argv[2], 'w').write(open(sys.argv[1]).read().upper())"
+
+
+def _pipeline(tmp_path: Path) -> Pipeline:
+    return Pipeline(
+        [
+            Stage("upper", ("-c", COPY, "in.txt", "mid.txt"), inputs=(Path("in.txt"),), outputs=(Path("mid.txt"),)),
+            Stage("again", ("-c", COPY, "mid.txt", "out.txt"), inputs=(Path("mid.txt"),), outputs=(Path("out.txt"),)),
+            Stage("other", ("-c", COPY, "in.txt", "side.txt"), inputs=(Path("in.txt"),), outputs=(Path("side.txt"),)),
+        ],
+        root=tmp_path,
+    )
+
+
+def _statuses(results: dict) -> dict[str, str]:
+    return {name: result.status for name, result in results.items()}
+
+
+def test_second_run_skips_unchanged_stages(tmp_path: Path) -> None:
+    (tmp_path / "in.txt").write_text("hero")
+    pipeline = _pipeline(tmp_path)
+
+    assert _statuses(pipeline.run()) == {"upper": "ran", "again": "ran", "other": "ran"}
+    assert (tmp_path / "out.txt").read_text() == "HERO"
+    assert set(_statuses(pipeline.run()).values()) == {"skipped"}
+
+    (tmp_path / "out.txt").unlink()
+    assert _statuses(pipeline.run(["again"])) == {"upper": "skipped", "again": "ran"}
+
+
+def test_changed_input_reruns_dependents_only_when_needed(tmp_path: Path) -> None:
+    (tmp_path / "in.txt").write_text("hero")
+    pipeline = _pipeline(tmp_path)
+    pipeline.run()
+
+    (tmp_path / "in.txt").write_text("HERO")
+    statuses = _statuses(pipeline.run())
+
+    # mid.txt comes out identical, so the stage reading it stays current.
+    assert statuses == {"upper": "ran", "again": "skipped", "other": "ran"}
+
+
+def test_ignored_metadata_in_an_input_directory_does_not_make_a_stage_stale(tmp_path: Path) -> None:
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "ana.html").write_text("ana")
+    touch = "import sys, time; open('pages/index.json', 'w').write(str(time.time())); open('out.txt', 'w').write('ok')"
+    stage = Stage("extract", ("-c", touch), inputs=(Path("pages"),), outputs=(Path("out.txt"),), ignore=("*.json",))
+    pipeline = Pipeline([stage], root=tmp_path)
+
+    assert _statuses(pipeline.run()) == {"extract": "ran"}
+    assert _statuses(pipeline.run()) == {"extract": "skipped"}
+
+    (tmp_path / "pages" / "ana.html").write_text("ana v2")
+    assert _statuses(pipeline.run()) == {"extract": "ran"}
+
+
+def test_stage_with_max_age_reruns_once_its_last_run_is_too_old(tmp_path: Path) -> None:
+    stage = Stage("fetch", ("-c", "open('out.txt', 'w').write('ok')"), outputs=(Path("out.txt"),), max_age=3600)
+    pipeline = Pipeline([stage], root=tmp_path)
+
+    assert _statuses(pipeline.run()) == {"fetch": "ran"}
+    assert _statuses(pipeline.run()) == {"fetch": "skipped"}
+
+    state = json.loads(pipeline.state_path.read_text())
+    state["ran_at"]["fetch"] -= 7200
+    pipeline.state_path.write_text(json.dumps(state))
+    assert _statuses(pipeline.run()) == {"fetch": "ran"}
+
+
+def test_failed_stage_blocks_its_dependents(tmp_path: Path) -> None:
+    statuses = _statuses(_pipeline(tmp_path).run())
+
+    assert statuses["upper"] == "failed"
+    assert statuses["again"] == "blocked"
+    assert statuses["other"] == "failed"
+
+
+def test_dry_run_reports_without_running(tmp_path: Path) -> None:
+    (tmp_path / "in.txt").write_text("hero")
+
+    statuses = _statuses(_pipeline(tmp_path).run(dry_run=True))
+
+    assert set(statuses.values()) == {"stale"}
+    assert not (tmp_path / "mid.txt").exists()
+
+
+def test_cycles_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline(
+            [
+                Stage("a", ("-c", ""), inputs=(Path("b"),), outputs=(Path("a"),)),
+                Stage("b", ("-c", ""), inputs=(Path("a"),), outputs=(Path("b"),)),
+            ],
+            root=tmp_path,
+        )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from herokit.engine import extract_pages
+from herokit.extractors import Extractor, extract_shields
+from herokit.fetch import Outcome
+from herokit.results import ResultCache
+
+PAGE = '<div class="mw-parser-output"><div data-source="shields"><div class="pi-data-value">150</div></div></div>'
+
+
+def _refuse(soup: object) -> None:
+    raise AssertionError("page should not have been parsed")
+
+
+def _run(cache: ResultCache, extractor: Extractor) -> object:
+    [outcome] = extract_pages([Outcome(item="hero", value=PAGE)], [extractor], results=cache)
+    return outcome.value
+
+
+def test_unchanged_page_reuses_stored_result(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path)
+    first = _run(cache, Extractor("shields", 1, extract_shields))
+    again = _run(cache, Extractor("shields", 1, _refuse))
+
+    assert again.errors == {}
+    assert again.values == first.values
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_version_bump_runs_extractor_again(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path)
+    _run(cache, Extractor("shields", 1, extract_shields))
+    bumped = _run(cache, Extractor("shields", 2, _refuse))
+
+    assert isinstance(bumped.errors["shields"], AssertionError)
+    assert not (tmp_path / "shields-v2").exists()
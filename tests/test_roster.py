@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from herokit.roster import Hero, RosterDiff, diff_rosters, read_roster_diff, write_roster_diff
+
+ANA = Hero("Support", "Ana", "https://overwatch.fandom.com/wiki/Ana")
+MERCY = Hero("Support", "Mercy", "https://overwatch.fandom.com/wiki/Mercy")
+ORISA = Hero("Tank", "Orisa", "https://overwatch.fandom.com/wiki/Orisa")
+WUYANG = Hero("Support", "Wuyang", "https://overwatch.fandom.com/wiki/Wuyang")
+
+
+def test_diff_reports_each_kind_of_change() -> None:
+    old = [ANA, Hero("Support", "Angela", MERCY.url), ORISA, Hero("Damage", "Bastion", "/wiki/Bastion")]
+    new = [Hero("Damage", "Ana", ANA.url), MERCY, ORISA, WUYANG]
+
+    diff = diff_rosters(old, new)
+
+    assert diff.added == [WUYANG]
+    assert diff.removed == [Hero("Damage", "Bastion", "/wiki/Bastion")]
+    assert diff.renamed == [(Hero("Support", "Angela", MERCY.url), MERCY)]
+    assert diff.role_changed == [(ANA, Hero("Damage", "Ana", ANA.url))]
+    # A role change alone keeps the hero's page, so only new and renamed heroes are scraped again.
+    assert diff.rescrape == [WUYANG, MERCY]
+    assert [hero.name for hero in diff.dropped] == ["Bastion", "Angela"]
+
+
+def test_moved_page_counts_as_rename_and_order_is_ignored() -> None:
+    moved = Hero("Tank", "Orisa", "https://overwatch.fandom.com/wiki/Orisa_(hero)")
+
+    assert diff_rosters([ANA, ORISA], [ORISA, ANA]).empty
+    assert diff_rosters([ANA, ORISA], [ANA, moved]).renamed == [(ORISA, moved)]
+
+
+def test_renamed_hero_that_changed_role_reports_both() -> None:
+    renamed = Hero("Damage", "Angela", MERCY.url)
+    moved = Hero("Damage", "Orisa", "https://overwatch.fandom.com/wiki/Orisa_(hero)")
+
+    diff = diff_rosters([MERCY, ORISA], [renamed, moved])
+
+    assert diff.renamed == [(ORISA, moved), (MERCY, renamed)]
+    assert diff.role_changed == diff.renamed
+    assert "* Angela: Support -> Damage" in diff.describe()
+
+
+def test_diff_round_trips_through_json(tmp_path: Path) -> None:
+    diff = RosterDiff(added=[WUYANG], removed=[ORISA], renamed=[(ANA, MERCY)], role_changed=[(MERCY, ANA)])
+    path = tmp_path / "changes.json"
+
+    write_roster_diff(diff, path)
+
+    assert read_roster_diff(path) == diff
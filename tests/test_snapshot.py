@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from herokit.models import HeroStats, Weapon, load_hero_stats
+from herokit.snapshot import HeroSnapshot, load_fresh_heroes, source_digest, write_snapshot
+
+
+def hero(name: str, health: float, ammo: float | None) -> HeroStats:
+    weapon = Weapon("Peacekeeper", "", 70.0, None, 2.0, 140.0, ammo, 1.5, True)
+    return HeroStats("Damage", name, f"/{name.lower()}", health, 0.0, 0.0, weapon)
+
+
+def test_snapshot_round_trips_heroes_while_sources_are_unchanged(tmp_path: Path) -> None:
+    source = tmp_path / "health.csv"
+    source.write_text("role,name,health,armor\nDamage,Cassidy,225,\n", encoding="utf-8")
+    heroes = [hero("Cassidy", 225.0, 6.0), hero("Sojourn", 250.0, None)]
+    path = tmp_path / "heroes.bin"
+    write_snapshot(path, heroes, source_digest([source]))
+
+    assert load_fresh_heroes(path, [source]) == heroes
+    with HeroSnapshot(path) as snapshot:
+        assert list(snapshot.column("health")) == [225.0, 250.0]
+
+    source.write_text("role,name,health,armor\nDamage,Cassidy,250,\n", encoding="utf-8")
+    assert load_fresh_heroes(path, [source]) is None
+
+
+def test_shields_are_stored_and_tracked_as_a_source(tmp_path: Path) -> None:
+    health = tmp_path / "health.csv"
+    health.write_text("role,name,health,armor\nDamage,Echo,150,\n", encoding="utf-8")
+    shields = tmp_path / "shields.csv"
+    shields.write_text("role,name,shields\nDamage,Echo,75\n", encoding="utf-8")
+    weapons = tmp_path / "weapons.json"
+    weapons.write_text('[{"name": "Echo", "weapons": [{"name": "Tri-Shot", "damage": {"damage": "17"}}]}]', encoding="utf-8")
+    sources = [health, shields, weapons]
+    path = tmp_path / "heroes.bin"
+    write_snapshot(path, load_hero_stats(health, weapons, shields_csv=shields), source_digest(sources))
+
+    with HeroSnapshot(path) as snapshot:
+        assert list(snapshot.column("shields")) == [75.0]
+
+    shields.write_text("role,name,shields\nDamage,Echo,100\n", encoding="utf-8")
+    assert load_fresh_heroes(path, sources) is None
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path: Path) -> None:
+    path = tmp_path / "heroes.bin"
+    path.write_bytes(b"role,name,url\n" * 10)
+
+    with pytest.raises(ValueError, match="not a format"):
+        HeroSnapshot(path)
+    assert load_fresh_heroes(path, []) is None
+    assert load_fresh_heroes(tmp_path / "missing.bin", []) is None
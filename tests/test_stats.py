@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from herokit.stats import normalize_weapon, parse_damage_segments, parse_fire_rate, primary_weapon, weapon_stats
+
+DVA_CANNONS = {
+    "name": "Fusion Cannons",
+    "damage": {"damage": "2 – 0.6 (per projectile) 22 - 6.6 (per volley)"},
+    "falloff_range": "10 - 20 meters",
+    "headshot": "✓ (x2)",
+    "rate_of_fire": "6.67 volleys/s",
+    "shots_per_volley": "11",
+    "ammo": "∞",
+    "reload_time": None,
+    "additional_details": ["Damage per second: 146 while firing"],
+    "keywords": ["critical", "hitscan"],
+}
+
+
+def test_damage_segments_keep_ranges_and_qualifiers() -> None:
+    assert parse_damage_segments(DVA_CANNONS["damage"]["damage"]) == [
+        {"max": 2.0, "min": 0.6, "qualifier": "per projectile"},
+        {"max": 22.0, "min": 6.6, "qualifier": "per volley"},
+    ]
+    assert parse_damage_segments("95 per second (at 0%) 190 per second (100% Energy)") == [
+        {"max": 95.0, "min": 95.0, "qualifier": "per second, at 0%"},
+        {"max": 190.0, "min": 190.0, "qualifier": "per second, 100% Energy"},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("6.67 volleys/s", 6.67),
+        ("1 shot per 0.5 seconds", 2.0),
+        ("0.5 second recovery", 2.0),
+        ("0.67 shots/s (max charge) 3.33 shots/s (min charge)", 3.33),
+        (None, 0.0),
+    ],
+)
+def test_fire_rate_is_trigger_pulls_per_second(text: str, expected: float) -> None:
+    assert parse_fire_rate(text) == pytest.approx(expected)
+
+
+def test_normalize_weapon() -> None:
+    stats = normalize_weapon(DVA_CANNONS)
+
+    assert stats["damage_per_projectile"] == 2.0
+    assert stats["projectiles_per_shot"] == 11.0
+    assert stats["shots_per_second"] == 6.67
+    assert stats["dps"] == pytest.approx(146.74)
+    assert stats["listed_dps"] == 146.0
+    assert stats["ammo"] is None
+    assert stats["headshot_multiplier"] == 2.0
+    assert stats["critical"] is True
+    assert stats["falloff_meters"] == {"start": 10.0, "end": 20.0}
+
+
+def test_beam_damage_counts_as_one_shot_per_second() -> None:
+    stats = normalize_weapon({"damage": {"damage": "70 per second"}, "rate_of_fire": None})
+
+    assert stats["shots_per_second"] == 1.0
+    assert stats["dps"] == 70.0
+
+
+def test_weapon_stats_prefers_stored_numbers() -> None:
+    stored = {**DVA_CANNONS, "stats": {**normalize_weapon(DVA_CANNONS), "dps": 1.0}}
+
+    assert weapon_stats(stored)["dps"] == 1.0
+    assert weapon_stats(DVA_CANNONS)["dps"] == pytest.approx(146.74)
+
+
+def test_primary_weapon_skips_weapons_without_damage() -> None:
+    assert primary_weapon([{"name": "Heal"}, DVA_CANNONS]) is DVA_CANNONS
+    assert primary_weapon([]) is None
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import requests
+
+from herokit.models import Hero
+from herokit.replay import replay_scrape
+from herokit.roster import HEROES_PATH, extract_heroes
+from herokit.stubwiki import StubBehavior, StubWiki
+
+HEROES = [
+    Hero(role="Tank", name="D.Va", url="https://overwatch.fandom.com/wiki/D.Va"),
+    Hero(role="Support", name="Ana", url="https://overwatch.fandom.com/wiki/Ana"),
+]
+PAGES = {hero.url: f"<html><body><h1>{hero.name}</h1></body></html>" for hero in HEROES}
+
+
+def test_navbox_round_trips_through_extract_heroes() -> None:
+    with StubWiki(PAGES, HEROES) as wiki:
+        response = requests.get(wiki.base_url + HEROES_PATH, timeout=5)
+        heroes = extract_heroes(response.text, wiki.base_url)
+
+    assert [(hero.role, hero.name) for hero in heroes] == [("Tank", "D.Va"), ("Support", "Ana")]
+    assert [hero.url for hero in heroes] == [wiki.url_for(hero.url) for hero in HEROES]
+
+
+def test_stub_answers_conditional_requests_with_304() -> None:
+    with StubWiki(PAGES, HEROES) as wiki:
+        url = wiki.url_for(HEROES[1].url)
+        first = requests.get(url, timeout=5)
+        again = requests.get(url, headers={"If-None-Match": first.headers["ETag"]}, timeout=5)
+        missing = requests.get(wiki.base_url + "/wiki/Nobody", timeout=5)
+
+    assert first.status_code == 200
+    assert "<h1>Ana</h1>" in first.text
+    assert again.status_code == 304
+    assert missing.status_code == 404
+    assert (wiki.stats.ok, wiki.stats.not_modified, wiki.stats.not_found) == (1, 1, 1)
+
+
+def test_replay_scrape_revalidates_against_the_stub(tmp_path: Path) -> None:
+    with StubWiki(PAGES, HEROES) as wiki:
+        cold, warm, revalidate = replay_scrape(wiki, tmp_path, passes=("cold", "warm", "revalidate"))
+
+    assert (cold.pages, cold.failures, cold.server.ok) == (2, 0, 3)
+    assert cold.cache.misses == 2
+    assert (warm.cache.hits, warm.server.requests) == (2, 1)
+    assert (revalidate.cache.revalidated, revalidate.server.not_modified) == (2, 2)
+
+
+def test_replay_scrape_counts_stub_errors_as_failures(tmp_path: Path) -> None:
+    with StubWiki(PAGES, HEROES) as wiki:
+        (cold,) = replay_scrape(wiki, tmp_path, passes=("cold",))
+        wiki.behavior = StubBehavior(error_rate=1.0)
+        (failing,) = replay_scrape(wiki, tmp_path, passes=("revalidate",))
+
+    assert cold.failures == 0
+    # The roster fetch fails too, so the pass has nothing else to request.
+    assert (failing.pages, failing.failures, failing.server.errors) == (0, 1, 1)
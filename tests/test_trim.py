@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from herokit.cache import PageCache
+from herokit.trim import TRIM_VERSION, trim_html
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "hero-pages"
+PAGE = """
+<html><head><title>Ana | Overwatch Wiki</title><script>var ads = 1;</script></head>
+<body><nav>site navigation</nav>
+<div class="mw-parser-output">
+<aside><div class="pi-data-label">Health</div><div class="pi-data-value">250</div></aside>
+<script>tracking()</script><!-- comment -->
+<h2><span class="mw-headline" id="Abilities">Abilities</span></h2>
+<div class="ability-details"><div class="ability-box"><div class="header">Biotic Rifle</div></div></div>
+<table class="navbox"><tr><td>Heroes</td></tr></table>
+</div>
+<footer>footer links</footer></body></html>
+"""
+
+
+def test_trim_keeps_only_the_article_body() -> None:
+    trimmed = trim_html(PAGE)
+
+    assert "Biotic Rifle" in trimmed and "pi-data-label" in trimmed
+    for dropped in ("site navigation", "footer links", "tracking()", "var ads", "comment", "navbox"):
+        assert dropped not in trimmed
+    assert "<title>Ana | Overwatch Wiki</title>" in trimmed
+
+
+def test_trim_preserves_infobox_and_abilities_on_cached_pages() -> None:
+    page = CACHE_DIR / "https%3A%2F%2Foverwatch.fandom.com%2Fwiki%2FZenyatta.html"
+    html = page.read_text(encoding="utf-8")
+    trimmed = trim_html(html)
+    before = BeautifulSoup(html, "html.parser")
+    after = BeautifulSoup(trimmed, "html.parser")
+
+    assert len(trimmed) < len(html) * 0.75
+    for selector in ("[data-source]", ".pi-data-label", ".pi-data-value", ".ability-details"):
+        assert [node.get_text(" ", strip=True) for node in before.select(f".mw-parser-output {selector}")] == [
+            node.get_text(" ", strip=True) for node in after.select(selector)
+        ]
+
+
+def test_trimmed_store_records_version_and_keeps_raw(tmp_path: Path) -> None:
+    url = "https://wiki.test/Ana"
+    PageCache(tmp_path, trim=True, keep_raw=True).store(url, PAGE)
+
+    cache = PageCache(tmp_path)
+    assert cache.entry(url).trim_version == TRIM_VERSION
+    assert "footer links" not in cache.read(url)
+    assert cache.read_raw(url) == PAGE
+
+    PageCache(tmp_path / "plain", trim=True).store(url, PAGE)
+    assert PageCache(tmp_path / "plain").read_raw(url) is None
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import pytest
+
+from herokit.duel import A_WINS
+from herokit.events import simulate_event_duel
+from herokit.models import HeroStats, Weapon
+
+np = pytest.importorskip("numpy")
+from herokit.ttk import DetailArrays, time_to_kill, ttk_matrix  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def details() -> DetailArrays:
+    return DetailArrays.from_csv(ROOT / "data-hero-details.csv")
+
+
+def test_matches_steven_fight_v2() -> None:
+    # Ana vs a 400 HP / 300 armor Reinhardt: 10 bullets, one reload.
+    assert float(time_to_kill(75, 1, 1.25, 1.5, 5, True, 400, 0, 300)) == pytest.approx(9.5)
+
+
+def test_reload_correction_and_armor_mitigation() -> None:
+    # 10 bullets from a 5-round clip reload once; 11 reload twice.
+    assert float(time_to_kill(10, 1, 1, 2, 5, True, 100, 0, 0)) == pytest.approx(10 + 2)
+    assert float(time_to_kill(10, 1, 1, 2, 5, True, 101, 0, 0)) == pytest.approx(11 + 4)
+    # Non-piercing armor: 10 damage is halved to 5, 20 damage loses a flat 7.
+    assert float(time_to_kill(10, 1, 1, 0, math.inf, False, 0, 0, 50)) == pytest.approx(10)
+    assert float(time_to_kill(20, 1, 1, 0, math.inf, False, 0, 0, 52)) == pytest.approx(4)
+    assert math.isinf(float(time_to_kill(0, 1, 1, 0, math.inf, True, 100, 0, 0)))
+
+
+def test_matrix_matches_the_scalar_formula(details: DetailArrays) -> None:
+    matrix = ttk_matrix(details)
+
+    assert matrix.shape == (len(details), len(details))
+    for a in range(len(details)):
+        for d in range(len(details)):
+            expected = time_to_kill(
+                details.damage[a],
+                details.bullets_per_shot[a],
+                details.fire_rate[a],
+                details.reload_time[a],
+                details.ammo[a],
+                details.armor_piercing[a],
+                details.health[d],
+                details.shields[d],
+                details.armor[d],
+            )
+            assert matrix[a, d] == expected
+
+
+def test_matrix_agrees_with_the_event_simulator(details: DetailArrays) -> None:
+    # The simulator under the closed form's assumptions: no crits or role passives, and a
+    # defender that never shoots back. Every weapon in the CSV pierces armor, so the
+    # dummy's armor is just more health. The simulator's first shot lands at t=0 where
+    # the closed form counts a full shot interval for it.
+    assert details.armor_piercing.all()
+    matrix = ttk_matrix(details)
+    unarmed = Weapon("", "", None, None, 0.0, 0.0, None, None, False)
+
+    for a in range(len(details)):
+        weapon = Weapon(
+            name="",
+            effect_type="Hitscan",
+            damage_per_projectile=float(details.damage[a]),
+            projectiles_per_shot=float(details.bullets_per_shot[a]),
+            shots_per_second=float(details.fire_rate[a]),
+            dps=0.0,
+            ammo=None if math.isinf(details.ammo[a]) else float(details.ammo[a]),
+            reload_seconds=float(details.reload_time[a]),
+            critical=False,
+        )
+        attacker = HeroStats("", details.names[a], "", 1.0, 0.0, 0.0, weapon)
+        for d in range(len(details)):
+            pool = float(details.health[d] + details.shields[d] + details.armor[d])
+            dummy = HeroStats("", details.names[d], "", pool, 0.0, 0.0, unarmed)
+            duel = simulate_event_duel(attacker, dummy, max_seconds=120)
+
+            assert duel.outcome == A_WINS
+            assert duel.seconds + 1 / weapon.shots_per_second == pytest.approx(matrix[a, d]), (
+                details.names[a],
+                details.names[d],
+            )